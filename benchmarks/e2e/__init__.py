@@ -0,0 +1 @@
+# 종단간(e2e) 벤치마크 - 로컬 Postgres/S3 호환 스토리지/스텁 Agent 서버로 실제 HTTP 부하를 겁니다
@@ -0,0 +1,404 @@
+"""
+종단간(e2e) HTTP 벤치마크
+
+로컬 Postgres, S3 호환 스토리지(MinIO), 스텁 Agent 서버를 띄우고 데이터를 만든 뒤
+uvicorn으로 실행한 앱에 시나리오별로 고정 동시성 부하를 걸어 처리량과 p50/p95/p99를 측정합니다.
+결과는 저장된 기준값(benchmarks/e2e/baseline.json)과 비교하며, 허용 범위를 넘으면 종료 코드 1을 반환합니다.
+
+사용법:
+    python -m benchmarks.e2e.run --compose                   # docker compose로 의존성 실행 + 데이터 생성 + 측정
+    python -m benchmarks.e2e.run --skip-seed --scenarios history   # 이미 만든 데이터로 history 시나리오만
+    python -m benchmarks.e2e.run --save-baseline             # 결과를 기준값으로 저장
+
+연결 대상은 환경변수로 바꿀 수 있습니다 (기본값은 docker-compose.yml과 같음):
+DB_HOST/DB_PORT/DB_NAME/DB_USER/DB_PASSWORD, S3_ENDPOINT_URL, S3_BUCKET_NAME, AWS_ACCESS_KEY_ID/AWS_SECRET_ACCESS_KEY
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import httpx
+
+E2E_DIR = Path(__file__).resolve().parent
+REPO_ROOT = E2E_DIR.parent.parent
+BASELINE_PATH = E2E_DIR / "baseline.json"
+
+# docker-compose.yml의 로컬 의존성 (이미 설정된 환경변수가 우선)
+BENCH_ENV = {
+    "ENVIRONMENT": "development",
+    "SECRETS_PROVIDER": "env",
+    "DB_HOST": "localhost",
+    "DB_PORT": "5433",
+    "DB_NAME": "journal_bench",
+    "DB_USER": "postgres",
+    "DB_PASSWORD": "password",
+    "S3_ENDPOINT_URL": "http://localhost:9000",
+    "S3_BUCKET_NAME": "journal-bench",
+    "AWS_ACCESS_KEY_ID": "minioadmin",
+    "AWS_SECRET_ACCESS_KEY": "minioadmin",
+    "AWS_REGION": "ap-northeast-2",
+    # 측정 대상은 앱 자체 - 트레이스 전송 비용은 제외
+    "TRACING_ENABLED": "false",
+    # 부하 생성기는 소수 사용자로 한도를 훨씬 넘게 보내므로 속도 제한은 끔
+    "RATE_LIMIT_ENABLED": "false",
+    # 포화 부하에서 요약/검색이 503으로 거절되면 처리량을 잴 수 없으므로 load shedding도 끔
+    "LOAD_SHED_ENABLED": "false",
+    # 요청별 SQL 수를 응답 헤더로 받아 시나리오별 쿼리 수 회귀도 확인
+    "QUERY_STATS_HEADERS": "true",
+    # 기준값은 조회 캐시를 켠 상태로 측정 (기본값은 none - 부하 생성기는 쓰기 후 다른 워커의 값을 확인하지 않음)
+    "HISTORY_CACHE_BACKEND": "memory",
+}
+
+USER_PREFIX = "bench-user-"
+SEARCH_TERMS = ["운동", "회의", "여행", "카페", "울적", "국밥", "소설"]
+SEMANTIC_QUERIES = ["헬스장에서 운동한 날", "회의가 길어서 힘들었던 날", "여행 계획을 세운 날", "기분이 울적했던 날", "야근한 날"]
+
+
+def bench_env(agent_port: int) -> dict:
+    env = {**BENCH_ENV, **os.environ}
+    env.setdefault("AGENT_API_URL", f"http://127.0.0.1:{agent_port}")
+    env["PYTHONPATH"] = str(REPO_ROOT)
+    return env
+
+
+def run_module(module: str, args: List[str], env: dict):
+    subprocess.run([sys.executable, "-m", module, *args], cwd=REPO_ROOT, env=env, check=True)
+
+
+def wait_ready(base_url: str, workers: int = 1, timeout: float = 60.0):
+    """
+    GET /journal/health/ready가 200이 될 때까지 대기 (warm-up 완료)
+    워커가 여럿이면 요청이 아무 워커에나 가므로 연속으로 여러 번 200이 나와야 준비된 것으로 봄
+    """
+    deadline = time.monotonic() + timeout
+    last_error = None
+    ready_in_a_row = 0
+    while time.monotonic() < deadline:
+        try:
+            # 매번 새 연결 (keep-alive 연결은 한 워커에 붙어 있음)
+            response = httpx.get(f"{base_url}/journal/health/ready", timeout=2.0)
+            if response.status_code == 200:
+                ready_in_a_row += 1
+                if ready_in_a_row >= workers * 4:
+                    return
+                continue
+            last_error = response.text
+        except httpx.HTTPError as e:
+            last_error = str(e)
+        ready_in_a_row = 0
+        time.sleep(0.5)
+    raise RuntimeError(f"앱이 준비되지 않았습니다: {last_error}")
+
+
+class Fixtures:
+    """시나리오가 쓰는 사용자/기록 ID (앱 API로 조회해 DB에 직접 연결하지 않음)"""
+
+    def __init__(self, users: List[str], history: Dict[str, List[dict]]):
+        self.users = users
+        self.history = history
+        self.history_ids = [row["id"] for rows in history.values() for row in rows]
+        self.s3_history_ids = [row["id"] for rows in history.values() for row in rows if row.get("s3_key")]
+
+    @classmethod
+    async def load(cls, client: httpx.AsyncClient, users: int) -> "Fixtures":
+        ids = [f"{USER_PREFIX}{i:03d}" for i in range(users)]
+        history = {}
+        for user_id in ids:
+            response = await client.get("/journal/history", params={"user_id": user_id, "fields": "summary", "limit": 400})
+            response.raise_for_status()
+            history[user_id] = response.json()
+        fixtures = cls(ids, history)
+        if not fixtures.history_ids:
+            raise RuntimeError("벤치마크 데이터가 없습니다 - --skip-seed 없이 실행하세요")
+        return fixtures
+
+
+# 시나리오: (이름, 요청 생성 함수) - 함수는 (client, rng, fixtures)를 받아 응답 코루틴을 반환
+# 읽기 → 쓰기 → AI 순서로 실행 (쓰기가 읽기 결과에 영향을 덜 주도록)
+def _history_list(client, rng, fx):
+    return client.get("/journal/history", params={"user_id": rng.choice(fx.users), "limit": 30})
+
+
+def _history_list_summary(client, rng, fx):
+    return client.get("/journal/history", params={"user_id": rng.choice(fx.users), "fields": "summary", "limit": 100})
+
+
+def _history_search(client, rng, fx):
+    return client.get("/journal/history/search", params={"user_id": rng.choice(fx.users), "q": rng.choice(SEARCH_TERMS), "limit": 20, "preview": 100})
+
+
+def _history_semantic_search(client, rng, fx):
+    return client.get("/journal/history/search/semantic", params={"user_id": rng.choice(fx.users), "q": rng.choice(SEMANTIC_QUERIES), "limit": 10, "preview": 100})
+
+
+def _history_calendar(client, rng, fx):
+    day = date.today() - timedelta(days=rng.randint(0, 365 * 3))
+    return client.get("/journal/history/calendar", params={"user_id": rng.choice(fx.users), "year": day.year, "month": day.month})
+
+
+def _history_on_this_day(client, rng, fx):
+    day = date.today() - timedelta(days=rng.randint(0, 365))
+    return client.get("/journal/history/on-this-day", params={"user_id": rng.choice(fx.users), "date": day.isoformat(), "preview": 100})
+
+
+def _history_get(client, rng, fx):
+    return client.get(f"/journal/history/{rng.choice(fx.history_ids)}")
+
+
+def _history_s3_content(client, rng, fx):
+    return client.get(f"/journal/history/{rng.choice(fx.s3_history_ids)}/s3-content")
+
+
+def _history_create(client, rng, fx):
+    # 최근 1년 안의 날짜를 덮어씀 (같은 날 1건 - 저장 시 upsert 경로)
+    day = date.today() - timedelta(days=rng.randint(1, 365))
+    return client.post("/journal/history", json={
+        "user_id": rng.choice(fx.users),
+        "content": "벤치마크로 다시 저장한 일기입니다. 오늘도 무난한 하루였다.",
+        "record_date": day.isoformat(),
+        "tags": ["벤치마크"],
+    })
+
+
+def _messages_list(client, rng, fx):
+    return client.get("/journal/messages", params={"user_id": rng.choice(fx.users), "limit": 50})
+
+
+def _messages_create(client, rng, fx):
+    return client.post("/journal/messages", json={"user_id": rng.choice(fx.users), "content": "벤치마크 메시지 - 점심 먹고 산책함"})
+
+
+def _summary(client, rng, fx):
+    return client.get(f"/journal/summary/{rng.choice(fx.users)}")
+
+
+def _process(client, rng, fx):
+    return client.post("/journal/process", json={"user_id": rng.choice(fx.users), "content": "오늘 저녁은 친구랑 파스타 먹었어"})
+
+
+SCENARIOS: Dict[str, Callable] = {
+    "messages.list": _messages_list,
+    "history.list": _history_list,
+    "history.list_summary": _history_list_summary,
+    "history.search": _history_search,
+    "history.semantic_search": _history_semantic_search,
+    "history.calendar": _history_calendar,
+    "history.on_this_day": _history_on_this_day,
+    "history.get": _history_get,
+    "history.s3_content": _history_s3_content,
+    "messages.create": _messages_create,
+    "history.create": _history_create,
+    "summary.get": _summary,
+    "process": _process,
+}
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """nearest-rank 백분위수"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(p / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+async def run_scenario(client: httpx.AsyncClient, fixtures: Fixtures, name: str, concurrency: int, duration: float, warmup: float, seed: int) -> dict:
+    """concurrency개 워커가 쉬지 않고 요청을 보냄 (닫힌 루프). warm-up 구간의 요청은 집계하지 않습니다."""
+    make_request = SCENARIOS[name]
+    latencies: List[float] = []
+    errors: Dict[str, int] = {}
+    max_queries = 0
+    start = time.perf_counter()
+    measure_from = start + warmup
+    stop_at = measure_from + duration
+
+    async def worker(index: int):
+        nonlocal max_queries
+        rng = random.Random(seed * 1009 + index)
+        while True:
+            sent = time.perf_counter()
+            if sent >= stop_at:
+                return
+            try:
+                response = await make_request(client, rng, fixtures)
+                status = str(response.status_code) if response.status_code >= 400 else None
+                max_queries = max(max_queries, int(response.headers.get("x-db-query-count", 0)))
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            if sent < measure_from:
+                continue
+            latencies.append(time.perf_counter() - sent)
+            if status:
+                errors[status] = errors.get(status, 0) + 1
+
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "throughput": round(len(latencies) / duration, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "max_queries": max_queries,
+        "errors": errors,
+    }
+
+
+def compare(results: Dict[str, dict], baseline: dict, tolerance: float) -> List[str]:
+    """기준값 대비 처리량이 tolerance 넘게 떨어지거나 p95가 tolerance 넘게 늘어났거나 요청당 SQL 수가 늘어난 시나리오"""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get("scenarios", {}).get(name)
+        if not base:
+            continue
+        if result["throughput"] < base["throughput"] * (1 - tolerance):
+            regressions.append(f"{name}: 처리량 {base['throughput']} → {result['throughput']} req/s")
+        if result["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {base['p95_ms']} → {result['p95_ms']} ms")
+        if result["max_queries"] > base.get("max_queries", result["max_queries"]):
+            regressions.append(f"{name}: 요청당 최대 SQL {base['max_queries']} → {result['max_queries']}개")
+        if sum(result["errors"].values()) > sum(base.get("errors", {}).values()):
+            regressions.append(f"{name}: 오류 {result['errors']}")
+    return regressions
+
+
+def print_report(results: Dict[str, dict], baseline: Optional[dict]):
+    base_scenarios = (baseline or {}).get("scenarios", {})
+    print(f"{'scenario':<25}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'sql':>6}{'errors':>8}{'vs baseline':>14}")
+    for name, result in results.items():
+        base = base_scenarios.get(name)
+        relative = f"{result['throughput'] / base['throughput']:>8.2f}x tput" if base and base["throughput"] else ""
+        print(
+            f"{name:<25}{result['throughput']:>9.1f}{result['p50_ms']:>9.1f}{result['p95_ms']:>9.1f}"
+            f"{result['p99_ms']:>9.1f}{result['max_queries']:>6}{sum(result['errors'].values()):>8}  {relative}"
+        )
+        if result["errors"]:
+            print(f"{'':<25}오류: {result['errors']}")
+
+
+async def drive(base_url: str, args, selected: List[str]) -> Dict[str, dict]:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120.0) as client:
+        fixtures = await Fixtures.load(client, args.users)
+        results = {}
+        for name in selected:
+            print(f"  {name} ...", flush=True)
+            results[name] = await run_scenario(client, fixtures, name, args.concurrency, args.duration, args.warmup, args.seed)
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="e2e HTTP 벤치마크")
+    parser.add_argument("--compose", action="store_true", help="docker compose로 Postgres/MinIO 실행")
+    parser.add_argument("--skip-seed", action="store_true", help="데이터 생성 생략 (이미 만든 데이터 사용)")
+    parser.add_argument("--scenarios", default="", help="실행할 시나리오 (쉼표로 구분, 접두어 가능 - 예: history,summary.get)")
+    parser.add_argument("--concurrency", type=int, default=16, help="동시 요청 수 (기본값: 16)")
+    parser.add_argument("--duration", type=float, default=15.0, help="시나리오별 측정 시간 초 (기본값: 15)")
+    parser.add_argument("--warmup", type=float, default=2.0, help="시나리오별 warm-up 시간 초 (기본값: 2)")
+    parser.add_argument("--port", type=int, default=8765, help="앱 포트 (기본값: 8765)")
+    parser.add_argument("--workers", type=int, default=0, help="gunicorn 워커 수 (기본값: 0 - uvicorn 단일 프로세스)")
+    parser.add_argument("--agent-port", type=int, default=8100, help="스텁 Agent 서버 포트 (기본값: 8100)")
+    parser.add_argument("--agent-latency", default="lognormal:300,0.5", help="스텁 /agent 지연 분포 (stub_agent.py 참고)")
+    parser.add_argument("--summarize-latency", default="lognormal:1500,0.4", help="스텁 /agent/summarize 지연 분포")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH), help="기준값 파일")
+    parser.add_argument("--save-baseline", action="store_true", help="결과를 기준값 파일로 저장")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="회귀 판정 허용 비율 (기본값: 0.2)")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    # 데이터 생성 옵션 (benchmarks.e2e.seed로 전달)
+    parser.add_argument("--users", type=int, default=20, help="사용자 수 (기본값: 20)")
+    parser.add_argument("--messages", type=int, default=3000, help="사용자별 메시지 수 (기본값: 3000)")
+    parser.add_argument("--message-days", type=int, default=30, help="메시지를 분산할 최근 일수 (기본값: 30)")
+    parser.add_argument("--years", type=int, default=5, help="사용자별 히스토리 기간 (기본값: 5년)")
+    parser.add_argument("--s3-days", type=int, default=30, help="S3 객체를 만들 최근 일수 (기본값: 30)")
+    parser.add_argument("--seed", type=int, default=42, help="난수 시드 (기본값: 42)")
+    args = parser.parse_args()
+
+    prefixes = [p.strip() for p in args.scenarios.split(",") if p.strip()]
+    selected = [name for name in SCENARIOS if not prefixes or any(name == p or name.startswith(p + ".") for p in prefixes)]
+    if not selected:
+        parser.error(f"알 수 없는 시나리오: {args.scenarios} (사용 가능: {', '.join(SCENARIOS)})")
+
+    env = bench_env(args.agent_port)
+    if args.compose:
+        subprocess.run(["docker", "compose", "-f", str(E2E_DIR / "docker-compose.yml"), "up", "-d", "--wait"], check=True)
+
+    processes = []
+    try:
+        processes.append(subprocess.Popen(
+            [sys.executable, "-m", "benchmarks.e2e.stub_agent", "--port", str(args.agent_port),
+             "--latency", args.agent_latency, "--summarize-latency", args.summarize_latency],
+            cwd=REPO_ROOT, env=env,
+        ))
+        run_module("scripts.init_db", [], env)
+        if not args.skip_seed:
+            print("데이터 생성 중 ...", flush=True)
+            run_module("benchmarks.e2e.seed", [
+                "--users", str(args.users), "--messages", str(args.messages), "--message-days", str(args.message_days),
+                "--years", str(args.years), "--s3-days", str(args.s3_days), "--seed", str(args.seed),
+            ], env)
+
+        if args.workers:
+            # 프로덕션 진입점 (gunicorn.conf.py, preload + 워커별 풀)
+            server = [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "main:app"]
+            server_env = {**env, "PORT": str(args.port), "WEB_CONCURRENCY": str(args.workers)}
+            if args.workers > 1 and server_env["HISTORY_CACHE_BACKEND"] == "memory":
+                # 워커별 memory 캐시는 gunicorn.conf.py가 거부하므로 여러 워커에서는 캐시 없이 측정
+                server_env["HISTORY_CACHE_BACKEND"] = "none"
+        else:
+            server = [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(args.port),
+                      "--log-level", "warning", "--no-access-log"]
+            server_env = env
+        processes.append(subprocess.Popen(server, cwd=REPO_ROOT, env=server_env))
+        base_url = f"http://127.0.0.1:{args.port}"
+        wait_ready(base_url, max(1, args.workers))
+
+        print(f"동시성 {args.concurrency}, 워커 {args.workers or 1}, 시나리오별 {args.duration:g}s (warm-up {args.warmup:g}s)")
+        results = asyncio.run(drive(base_url, args, selected))
+    finally:
+        for process in reversed(processes):
+            process.terminate()
+            process.wait(timeout=10)
+
+    baseline_path = Path(args.baseline)
+    baseline = json.loads(baseline_path.read_text()) if baseline_path.exists() else None
+    print_report(results, baseline)
+
+    report = {
+        "settings": {
+            "concurrency": args.concurrency, "workers": args.workers, "duration": args.duration, "users": args.users,
+            "messages": args.messages, "years": args.years, "agent_latency": args.agent_latency,
+            "summarize_latency": args.summarize_latency,
+        },
+        "scenarios": results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, ensure_ascii=False, indent=2) + "\n")
+    if args.save_baseline:
+        if baseline:
+            # 일부 시나리오만 실행했으면 나머지 기준값은 유지
+            report["scenarios"] = {**baseline.get("scenarios", {}), **results}
+        baseline_path.write_text(json.dumps(report, ensure_ascii=False, indent=2) + "\n")
+        print(f"기준값 저장: {baseline_path}")
+        return
+
+    if baseline:
+        if baseline.get("settings") != report["settings"]:
+            print(f"주의: 기준값과 설정이 다릅니다 ({baseline.get('settings')})")
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"기준값 대비 회귀 ({args.tolerance:.0%} 초과):")
+            for line in regressions:
+                print(f"  - {line}")
+            sys.exit(1)
+        print(f"기준값 대비 회귀 없음 (허용 {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+e2e 벤치마크 데이터 생성
+
+사용법 (DB_*/S3_* 환경변수의 DB와 버킷에 씁니다 - 벤치마크 전용 DB를 쓰세요):
+    python -m benchmarks.e2e.seed --users 20 --messages 3000 --years 5
+
+같은 --seed면 같은 데이터가 만들어집니다 (사용자 ID: bench-user-000, bench-user-001, ...).
+- history: 사용자마다 최근 --years년 동안 거의 매일 1건 (한국어 일기 문장, 태그 0~3개)
+- messages: 사용자마다 --messages건을 최근 --message-days일에 분산 (오늘 메시지 포함 - /summary용)
+- S3: 최근 --s3-days일치 history를 텍스트 객체로 저장 (/history/{id}/s3-content용)
+- history_embeddings: 모든 history의 임베딩 (/history/search/semantic용, EMBEDDING_PROVIDER 방식)
+이미 있는 벤치마크 사용자의 데이터는 먼저 지웁니다.
+"""
+import argparse
+import logging
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import delete, insert, select, update
+
+from database import SessionLocal
+from models.history import History
+from models.message import Message
+from services.history_bulk import upsert_history_rows
+from services.s3 import s3_service
+from services.semantic_search import backfill_embeddings
+
+logger = logging.getLogger(__name__)
+
+KST = timezone(timedelta(hours=9))
+USER_PREFIX = "bench-user-"
+BATCH_SIZE = 5000
+
+TAGS = ["회사", "운동", "가족", "친구", "여행", "독서", "공부", "개발", "요리", "산책", "영화", "음악", "건강", "카페", "주말"]
+OPENINGS = [
+    "오늘은 아침부터 비가 내렸다.", "출근길 지하철이 유난히 붐볐다.", "알람을 못 듣고 늦잠을 잤다.",
+    "오랜만에 일찍 일어나 산책을 했다.", "날씨가 맑아서 기분이 좋았다.", "하루 종일 머리가 조금 아팠다.",
+]
+MIDDLES = [
+    "점심에는 동료들과 새로 생긴 국밥집에 갔다.", "오후 회의가 길어져서 정신이 없었다.",
+    "퇴근 후 헬스장에서 한 시간 정도 운동을 했다.", "친구와 통화하면서 요즘 고민을 털어놓았다.",
+    "읽던 소설을 드디어 다 읽었다.", "프로젝트 마감이 다가와서 야근을 했다.",
+    "엄마가 보내 준 반찬으로 저녁을 차려 먹었다.", "카페에 앉아 밀린 공부를 했다.",
+    "주말에 갈 여행 계획을 세웠다.", "새로 배운 요리를 만들어 봤는데 생각보다 맛있었다.",
+]
+ENDINGS = [
+    "내일은 조금 더 여유로운 하루였으면 좋겠다.", "피곤하지만 보람 있는 하루였다.",
+    "괜히 마음이 울적한 날이었다.", "별일 없이 무난하게 지나갔다.", "일찍 자야겠다.",
+]
+MESSAGES = [
+    "점심 뭐 먹었더라", "회의 끝나고 너무 피곤함", "운동 30분 완료", "커피 두 잔째", "퇴근하고 싶다",
+    "오늘 하늘 진짜 예쁘다", "책 50쪽 읽음", "친구랑 저녁 약속", "비 와서 우산 샀다", "내일 발표 준비해야 함",
+]
+
+
+def user_ids(users: int):
+    return [f"{USER_PREFIX}{i:03d}" for i in range(users)]
+
+
+def diary_text(rng: random.Random) -> str:
+    sentences = [rng.choice(OPENINGS)] + rng.sample(MIDDLES, rng.randint(2, 5)) + [rng.choice(ENDINGS)]
+    return " ".join(sentences)
+
+
+def clear_users(users: list):
+    db = SessionLocal()
+    try:
+        db.execute(delete(History).where(History.user_id.in_(users)))
+        db.execute(delete(Message).where(Message.user_id.in_(users)))
+        db.commit()
+    finally:
+        db.close()
+
+
+def seed_history(rng: random.Random, user_id: str, years: int, today: date) -> int:
+    rows = []
+    day = today - timedelta(days=365 * years)
+    while day <= today:
+        if rng.random() < 0.85:  # 가끔 쓰지 않은 날
+            rows.append({
+                "user_id": user_id,
+                "content": diary_text(rng),
+                "record_date": day,
+                "tags": rng.sample(TAGS, rng.randint(0, 3)) or None,
+                "s3_key": None,
+                "text_url": None,
+            })
+        day += timedelta(days=1)
+
+    db = SessionLocal()
+    try:
+        for offset in range(0, len(rows), BATCH_SIZE):
+            upsert_history_rows(db, rows[offset:offset + BATCH_SIZE])
+        db.commit()
+    finally:
+        db.close()
+    return len(rows)
+
+
+def seed_messages(rng: random.Random, user_id: str, count: int, days: int, now: datetime) -> int:
+    # 오늘 메시지를 최소 10건 넣어 GET /summary/{user_id}가 404가 되지 않도록 함
+    today_start = now.astimezone(KST).replace(hour=0, minute=0, second=0, microsecond=0)
+    today_count = min(count, max(10, count // days))
+    rows = []
+    for i in range(count):
+        if i < today_count:
+            created_at = today_start + (now - today_start) * rng.random()
+        else:
+            created_at = now - timedelta(seconds=rng.uniform(0, days * 86400))
+        rows.append({
+            "user_id": user_id,
+            "content": rng.choice(MESSAGES) if rng.random() < 0.7 else diary_text(rng),
+            "created_at": created_at,
+        })
+
+    db = SessionLocal()
+    try:
+        for offset in range(0, len(rows), BATCH_SIZE):
+            db.execute(insert(Message), rows[offset:offset + BATCH_SIZE])
+        db.commit()
+    finally:
+        db.close()
+    return len(rows)
+
+
+def seed_s3(user_id: str, days: int, today: date) -> int:
+    db = SessionLocal()
+    try:
+        records = db.execute(
+            select(History.id, History.content, History.record_date, History.tags)
+            .where(History.user_id == user_id, History.record_date > today - timedelta(days=days))
+        ).all()
+        for record in records:
+            text_url = s3_service.save_history_to_s3(user_id, record.content, record.record_date, record.tags)
+            db.execute(
+                update(History).where(History.id == record.id)
+                .values(s3_key=s3_service.generate_s3_key(user_id, record.record_date), text_url=text_url)
+            )
+        db.commit()
+    finally:
+        db.close()
+    return len(records)
+
+
+def seed(users: int = 20, messages: int = 3000, message_days: int = 30, years: int = 5, s3_days: int = 30, seed: int = 42, workers: int = 8) -> dict:
+    """벤치마크 데이터를 만들고 건수를 반환합니다."""
+    ids = user_ids(users)
+    now = datetime.now(timezone.utc)
+    today = now.astimezone(KST).date()
+    clear_users(ids)
+
+    def seed_user(index: int):
+        # 사용자마다 독립적인 난수열 (스레드 실행 순서와 무관하게 같은 데이터)
+        rng = random.Random(seed * 100003 + index)
+        user_id = ids[index]
+        history = seed_history(rng, user_id, years, today)
+        # Core upsert는 Session 이벤트로 임베딩이 계산되지 않으므로 직접 계산
+        backfill_embeddings([user_id])
+        message_count = seed_messages(rng, user_id, messages, message_days, now)
+        s3_objects = seed_s3(user_id, s3_days, today) if s3_days else 0
+        return history, message_count, s3_objects
+
+    totals = {"users": users, "history": 0, "messages": 0, "s3_objects": 0}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for history, message_count, s3_objects in executor.map(seed_user, range(users)):
+            totals["history"] += history
+            totals["messages"] += message_count
+            totals["s3_objects"] += s3_objects
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="e2e 벤치마크 데이터 생성")
+    parser.add_argument("--users", type=int, default=20, help="사용자 수 (기본값: 20)")
+    parser.add_argument("--messages", type=int, default=3000, help="사용자별 메시지 수 (기본값: 3000)")
+    parser.add_argument("--message-days", type=int, default=30, help="메시지를 분산할 최근 일수 (기본값: 30)")
+    parser.add_argument("--years", type=int, default=5, help="사용자별 히스토리 기간 (기본값: 5년)")
+    parser.add_argument("--s3-days", type=int, default=30, help="S3 객체를 만들 최근 일수 (기본값: 30, 0이면 생략)")
+    parser.add_argument("--seed", type=int, default=42, help="난수 시드 (기본값: 42)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    start = time.perf_counter()
+    totals = seed(args.users, args.messages, args.message_days, args.years, args.s3_days, args.seed)
+    print(
+        f"사용자 {totals['users']}명, history {totals['history']:,}건, messages {totals['messages']:,}건, "
+        f"S3 객체 {totals['s3_objects']:,}개 ({time.perf_counter() - start:.1f}s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+e2e 벤치마크용 스텁 Agent API 서버
+
+사용법:
+    python -m benchmarks.e2e.stub_agent --port 8100 --latency lognormal:800,0.4 --answer-ratio 0.3
+
+실제 Agent API와 같은 경로/응답 형식을 흉내 내며, 응답 전에 지정한 분포로 지연합니다.
+- POST /agent: {"type": "data" | "answer", "content", "message"} (answer 비율은 --answer-ratio)
+- POST /agent/summarize: {"success": true, "summary"}
+
+지연 분포 (단위 ms):
+- fixed:MS
+- uniform:LO,HI
+- normal:MEAN,STD (0 미만은 0)
+- lognormal:MEDIAN,SIGMA (LLM 응답처럼 꼬리가 긴 분포)
+"""
+import argparse
+import json
+import logging
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+def parse_latency(spec: str) -> Callable[[], float]:
+    """지연 분포 문자열을 초 단위 지연을 뽑는 함수로 변환합니다."""
+    kind, _, params = spec.partition(":")
+    try:
+        values = [float(v) for v in params.split(",")] if params else []
+        if kind == "fixed":
+            (ms,) = values
+            return lambda: ms / 1000
+        if kind == "uniform":
+            lo, hi = values
+            return lambda: random.uniform(lo, hi) / 1000
+        if kind == "normal":
+            mean, std = values
+            return lambda: max(0.0, random.gauss(mean, std)) / 1000
+        if kind == "lognormal":
+            median, sigma = values
+            mu = math.log(median)
+            return lambda: random.lognormvariate(mu, sigma) / 1000
+    except ValueError:
+        pass
+    raise ValueError(f"지원하지 않는 지연 분포: {spec} (fixed:MS | uniform:LO,HI | normal:MEAN,STD | lognormal:MEDIAN,SIGMA)")
+
+
+class StubAgentHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    # serve()에서 설정
+    latency: Callable[[], float] = staticmethod(lambda: 0.0)
+    summarize_latency: Callable[[], float] = staticmethod(lambda: 0.0)
+    answer_ratio = 0.3
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send(400, {"error": "invalid json"})
+            return
+
+        if self.path == "/agent":
+            time.sleep(self.latency())
+            if payload.get("request_type") == "question" or random.random() < self.answer_ratio:
+                body = {"type": "answer", "content": f"'{payload.get('content', '')[:20]}'에 대한 답변입니다.", "message": "답변이 생성되었습니다."}
+            else:
+                body = {"type": "data", "content": "", "message": "데이터로 판단되었습니다."}
+            self._send(200, body)
+        elif self.path == "/agent/summarize":
+            time.sleep(self.summarize_latency())
+            content = payload.get("content", "")
+            self._send(200, {"success": True, "summary": f"오늘은 {content.count(chr(10) * 2) + 1}개의 기록을 남겼습니다. {content[:80]}"})
+        else:
+            self._send(404, {"error": "not found"})
+
+    def _send(self, status: int, body: dict):
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass  # 요청마다 로그를 남기면 지연 측정이 흔들림
+
+
+def serve(host: str, port: int, latency: str, summarize_latency: str, answer_ratio: float) -> ThreadingHTTPServer:
+    """백그라운드 스레드에서 스텁 서버를 시작하고 서버 객체를 반환합니다 (종료는 shutdown())."""
+    StubAgentHandler.latency = staticmethod(parse_latency(latency))
+    StubAgentHandler.summarize_latency = staticmethod(parse_latency(summarize_latency))
+    StubAgentHandler.answer_ratio = answer_ratio
+    server = ThreadingHTTPServer((host, port), StubAgentHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="stub-agent", daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="스텁 Agent API 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", default="lognormal:300,0.5", help="/agent 지연 분포 (기본값: lognormal:300,0.5)")
+    parser.add_argument("--summarize-latency", default="lognormal:1500,0.4", help="/agent/summarize 지연 분포 (기본값: lognormal:1500,0.4)")
+    parser.add_argument("--answer-ratio", type=float, default=0.3, help="/agent가 answer를 돌려주는 비율 (기본값: 0.3)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    server = serve(args.host, args.port, args.latency, args.summarize_latency, args.answer_ratio)
+    logger.info(f"스텁 Agent API 서버 시작: http://{args.host}:{args.port} (지연 {args.latency}, 요약 지연 {args.summarize_latency})")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+/history/export, /history/import NDJSON 처리량 벤치마크
+
+사용법 (DB_* 환경변수의 DB에 벤치마크용 사용자 데이터를 쓰고 마지막에 삭제합니다):
+    python -m benchmarks.history_export_import --rows 1000000
+
+import는 앱을 인프로세스(TestClient)로 띄워 엔드포인트 경로 전체(파싱, 검증, 배치 upsert)를 측정합니다.
+export는 TestClient가 응답 본문을 모두 버퍼링하므로, 응답 생성기(iter_history_ndjson)를 직접 소비해
+서버 측 처리량과 메모리 사용량을 측정합니다.
+"""
+import argparse
+import json
+import resource
+import time
+from datetime import date, timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy import delete
+
+from database import SessionLocal
+from main import app
+from models.history import History
+from services.history_bulk import iter_history_ndjson
+
+BENCH_USER = "bench-export-user"
+
+
+def generate_body(rows: int, chunk_rows: int = 5000):
+    start = date(1900, 1, 1)
+    content = "오늘은 회사에서 회의가 많았고 저녁에는 운동을 했다. " * 8
+    for offset in range(0, rows, chunk_rows):
+        lines = []
+        for i in range(offset, min(offset + chunk_rows, rows)):
+            lines.append(json.dumps({
+                "user_id": BENCH_USER,
+                "content": content,
+                "record_date": (start + timedelta(days=i)).isoformat(),
+                "tags": ["회사", "운동"],
+            }, ensure_ascii=False))
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def max_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="히스토리 NDJSON export/import 벤치마크")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="행 수 (기본값: 1,000,000)")
+    parser.add_argument("--keep", action="store_true", help="벤치마크 데이터를 삭제하지 않음")
+    args = parser.parse_args()
+
+    client = TestClient(app)
+
+    start = time.perf_counter()
+    response = client.post(f"/journal/history/import?user_id={BENCH_USER}", content=generate_body(args.rows))
+    response.raise_for_status()
+    import_s = time.perf_counter() - start
+    print(f"import: {args.rows:,} rows in {import_s:.1f}s ({args.rows / import_s:,.0f} rows/s), max RSS {max_rss_mb():.0f} MB")
+
+    rss_before = max_rss_mb()
+    start = time.perf_counter()
+    exported = 0
+    exported_bytes = 0
+    for chunk in iter_history_ndjson(BENCH_USER):
+        exported += chunk.count(b"\n")
+        exported_bytes += len(chunk)
+    export_s = time.perf_counter() - start
+    print(
+        f"export: {exported:,} rows / {exported_bytes / 1e6:.0f} MB in {export_s:.1f}s "
+        f"({exported / export_s:,.0f} rows/s), max RSS {rss_before:.0f} -> {max_rss_mb():.0f} MB"
+    )
+
+    if not args.keep:
+        db = SessionLocal()
+        db.execute(delete(History).where(History.user_id == BENCH_USER))
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
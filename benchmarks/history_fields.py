@@ -0,0 +1,85 @@
+"""
+GET /history 목록의 fields/preview 파라미터 응답 크기 및 지연 시간 벤치마크
+
+사용법 (DB_* 환경변수의 DB에 벤치마크용 사용자 데이터를 쓰고 마지막에 삭제합니다):
+    python -m benchmarks.history_fields --rows 365 --requests 200
+
+앱을 인프로세스(TestClient)로 띄워 SQL 조회 + 직렬화 비용만 측정합니다 (네트워크 전송 시간 제외).
+"""
+import argparse
+import statistics
+import time
+from datetime import date, timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy import delete
+
+from database import SessionLocal
+from main import app
+from models.history import History
+from services.history_bulk import upsert_history_rows
+
+BENCH_USER = "bench-fields-user"
+
+VARIANTS = [
+    ("full", ""),
+    ("fields=summary", "&fields=summary"),
+    ("preview=80", "&fields=summary&preview=80"),
+]
+
+
+def seed(rows: int, content_chars: int):
+    content = ("오늘은 회사에서 회의가 많았고 저녁에는 운동을 했다. " * (content_chars // 28 + 1))[:content_chars]
+    start = date(2025, 1, 1)
+    db = SessionLocal()
+    try:
+        upsert_history_rows(db, [
+            {
+                "user_id": BENCH_USER,
+                "content": content,
+                "record_date": start + timedelta(days=i),
+                "tags": ["회사", "운동"],
+                "s3_key": None,
+                "text_url": None,
+            }
+            for i in range(rows)
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="히스토리 목록 sparse fieldset 벤치마크")
+    parser.add_argument("--rows", type=int, default=365, help="사용자 기록 수 (기본값: 365)")
+    parser.add_argument("--content-chars", type=int, default=1500, help="기록 본문 글자 수 (기본값: 1500)")
+    parser.add_argument("--requests", type=int, default=200, help="변형별 요청 수 (기본값: 200)")
+    args = parser.parse_args()
+
+    seed(args.rows, args.content_chars)
+    client = TestClient(app)
+
+    try:
+        print(f"{'variant':<16}{'bytes':>10}{'p50 ms':>9}{'p95 ms':>9}")
+        for name, params in VARIANTS:
+            url = f"/journal/history?user_id={BENCH_USER}&limit={args.rows}{params}"
+            client.get(url).raise_for_status()  # 워밍업
+            timings = []
+            size = 0
+            for _ in range(args.requests):
+                start = time.perf_counter()
+                response = client.get(url)
+                timings.append((time.perf_counter() - start) * 1000)
+                size = len(response.content)
+            timings.sort()
+            p95 = timings[int(len(timings) * 0.95) - 1]
+            print(f"{name:<16}{size:>10,}{statistics.median(timings):>9.2f}{p95:>9.2f}")
+    finally:
+        db = SessionLocal()
+        db.execute(delete(History).where(History.user_id == BENCH_USER))
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
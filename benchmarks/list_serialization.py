@@ -0,0 +1,155 @@
+"""
+목록 엔드포인트 응답 직렬화 마이크로 벤치마크: 기존 경로 vs 빠른 경로 (orjson)
+
+사용법 (DB_* 환경변수의 DB에 벤치마크용 데이터를 쓰고 마지막에 삭제합니다):
+    python -m benchmarks.list_serialization --rows 100 --iterations 300
+
+엔드포인트별로 두 경로를 같은 데이터로 비교합니다.
+- 기존: ORM 객체 조회 → response_model 검증(from_attributes) → JSON 호환 dict → json.dumps
+  (GET /messages는 MessageResponse를 직접 만든 뒤 다시 검증하는 이중 검증 포함)
+- 빠른 경로: Core select 튜플 → dict → orjson.dumps
+
+"serialize"는 DB 조회를 제외한 변환/직렬화 시간, "total"은 조회 포함 시간입니다.
+"""
+import argparse
+import json
+import statistics
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import List
+
+import orjson
+from pydantic import TypeAdapter
+from sqlalchemy import delete, insert, select
+
+from database import SessionLocal
+from models.history import History
+from models.message import Message
+from schemas.history import HistoryResponse
+from schemas.message import MessageResponse
+from services.fast_json import ORJSON_OPTIONS, rows_to_dicts
+from services.history_bulk import upsert_history_rows
+
+BENCH_USER = "bench-serialize-user"
+CONTENT = "오늘은 회사에서 회의가 많았고 저녁에는 운동을 했다. 내일은 조금 더 일찍 일어나야지. " * 12
+
+HISTORY_COLUMNS = (History.id, History.user_id, History.content, History.record_date, History.tags, History.s3_key, History.text_url)
+MESSAGE_COLUMNS = (Message.id, Message.user_id, Message.content, Message.created_at)
+
+
+def seed(db, rows: int):
+    upsert_history_rows(db, [
+        {
+            "user_id": BENCH_USER,
+            "content": CONTENT,
+            "record_date": date(2025, 1, 1) + timedelta(days=i),
+            "tags": ["회사", "운동"],
+            "s3_key": None,
+            "text_url": f"https://bucket.s3.ap-northeast-2.amazonaws.com/{BENCH_USER}/history/{i}.txt",
+        }
+        for i in range(rows)
+    ])
+    now = datetime.now(timezone.utc)
+    db.execute(insert(Message), [
+        {"user_id": BENCH_USER, "content": CONTENT, "created_at": now - timedelta(seconds=i)}
+        for i in range(rows)
+    ])
+    db.commit()
+
+
+def fastapi_dumps(adapter: TypeAdapter, value) -> bytes:
+    """FastAPI의 response_model 처리와 같은 순서 (검증 → JSON 호환 dict → JSONResponse의 json.dumps)"""
+    validated = adapter.validate_python(value, from_attributes=True)
+    content = adapter.dump_python(validated, mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def history_current(db, rows: int):
+    return db.query(History).filter(History.user_id == BENCH_USER).order_by(History.record_date.desc()).limit(rows).all()
+
+
+def history_fast(db, rows: int):
+    return rows_to_dicts(db.execute(
+        select(*HISTORY_COLUMNS).where(History.user_id == BENCH_USER).order_by(History.record_date.desc()).limit(rows)
+    ))
+
+
+def messages_current(db, rows: int):
+    return db.query(Message).filter(Message.user_id == BENCH_USER).order_by(Message.created_at.asc()).limit(rows).all()
+
+
+def messages_fast(db, rows: int):
+    return rows_to_dicts(db.execute(
+        select(*MESSAGE_COLUMNS).where(Message.user_id == BENCH_USER).order_by(Message.created_at.asc()).limit(rows)
+    ))
+
+
+def measure(fn, iterations: int) -> float:
+    fn()  # 워밍업
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="목록 응답 직렬화 벤치마크")
+    parser.add_argument("--rows", type=int, default=100, help="페이지 크기 (기본값: 100)")
+    parser.add_argument("--iterations", type=int, default=300, help="반복 횟수 (기본값: 300)")
+    args = parser.parse_args()
+
+    history_adapter = TypeAdapter(List[HistoryResponse])
+    message_adapter = TypeAdapter(List[MessageResponse])
+
+    def message_objects(messages):
+        # 기존 GET /messages: UUID를 문자열로 바꿔 MessageResponse를 직접 생성 (이후 FastAPI가 다시 검증)
+        return [
+            MessageResponse(id=str(m.id), user_id=m.user_id, content=m.content, created_at=m.created_at)
+            for m in messages
+        ]
+
+    db = SessionLocal()
+    try:
+        seed(db, args.rows)
+
+        history_objects = history_current(db, args.rows)
+        history_rows = history_fast(db, args.rows)
+        messages = messages_current(db, args.rows)
+        message_rows = messages_fast(db, args.rows)
+
+        cases = [
+            (
+                "GET /history",
+                lambda: fastapi_dumps(history_adapter, history_objects),
+                lambda: orjson.dumps(history_rows, option=ORJSON_OPTIONS),
+                lambda: (db.expunge_all(), fastapi_dumps(history_adapter, history_current(db, args.rows))),
+                lambda: orjson.dumps(history_fast(db, args.rows), option=ORJSON_OPTIONS),
+            ),
+            (
+                "GET /messages",
+                lambda: fastapi_dumps(message_adapter, message_objects(messages)),
+                lambda: orjson.dumps(message_rows, option=ORJSON_OPTIONS),
+                lambda: (db.expunge_all(), fastapi_dumps(message_adapter, message_objects(messages_current(db, args.rows)))),
+                lambda: orjson.dumps(messages_fast(db, args.rows), option=ORJSON_OPTIONS),
+            ),
+        ]
+
+        print(f"{args.rows} rows/page, median of {args.iterations} iterations (ms)")
+        print(f"{'endpoint':<15}{'stage':<11}{'current':>9}{'fast':>9}{'speedup':>9}")
+        for name, current_serialize, fast_serialize, current_total, fast_total in cases:
+            for stage, current, fast in (("serialize", current_serialize, fast_serialize), ("total", current_total, fast_total)):
+                current_ms = measure(current, args.iterations)
+                fast_ms = measure(fast, args.iterations)
+                print(f"{name:<15}{stage:<11}{current_ms:>9.2f}{fast_ms:>9.2f}{current_ms / fast_ms:>8.1f}x")
+    finally:
+        db.rollback()
+        db.execute(delete(History).where(History.user_id == BENCH_USER))
+        db.execute(delete(Message).where(Message.user_id == BENCH_USER))
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
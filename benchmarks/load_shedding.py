@@ -0,0 +1,141 @@
+"""
+load shedding 동작 확인 벤치마크 (Agent API가 느려진 상황 재현)
+
+사용법:
+    python -m benchmarks.load_shedding --concurrency 150 --agent-latency 1.0 --duration 10
+
+uvicorn으로 띄운 작은 앱에 느린 동기 핸들러(/journal/process, Agent API 대기를 sleep으로 흉내)를
+동시에 계속 보내 스레드풀을 포화시키고, 그동안 요약(/journal/summary, 우선순위 낮음)과
+/journal/health, /journal/health/ready를 주기적으로 호출해 응답 코드와 지연을 LoadSheddingMiddleware
+유무로 비교합니다. 미들웨어가 있으면 요약은 스레드풀 대기열에 쌓이지 않고 바로 503을 받아야 합니다.
+"""
+import argparse
+import asyncio
+import threading
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+
+import anyio.to_thread
+import httpx
+import uvicorn
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+from middleware.load_shedding import LoadSheddingMiddleware
+from services.load_shedding import LoadMonitor
+
+THREADPOOL_SIZE = 40
+
+
+def build_app(with_shedding: bool, agent_latency: float) -> FastAPI:
+    monitor = LoadMonitor(
+        max_loop_lag_ms=250, max_in_flight=100, max_threadpool_queue=20,
+        cooldown_seconds=2, sample_interval_ms=100,
+    )
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+        if with_shedding:
+            monitor.start()
+        yield
+        monitor.stop()
+
+    app = FastAPI(lifespan=lifespan)
+
+    @app.post("/journal/process")
+    def process():
+        time.sleep(agent_latency)
+        return {"status": "ok"}
+
+    @app.get("/journal/summary/{user_id}")
+    def summary(user_id: str):
+        time.sleep(0.05)
+        return {"user_id": user_id}
+
+    @app.get("/journal/health")
+    async def health():
+        return {"status": "healthy"}
+
+    @app.get("/journal/health/ready")
+    async def ready():
+        return JSONResponse(status_code=503 if monitor.shedding else 200, content=monitor.status())
+
+    if with_shedding:
+        app.add_middleware(LoadSheddingMiddleware, monitor=monitor)
+    return app
+
+
+def start_server(app: FastAPI, port: int) -> uvicorn.Server:
+    server = uvicorn.Server(uvicorn.Config(app, port=port, log_level="warning", limit_concurrency=None))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def percentile(values, p: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))] * 1000
+
+
+async def load(port: int, concurrency: int, duration: float) -> dict:
+    base = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + duration
+    results = {"summary": [], "health": [], "ready": []}
+    limits = httpx.Limits(max_connections=concurrency + 10)
+
+    async with httpx.AsyncClient(base_url=base, timeout=60, limits=limits) as client:
+        async def flood():
+            while time.monotonic() < deadline:
+                await client.post("/journal/process")
+
+        async def probe(name: str, path: str):
+            while time.monotonic() < deadline:
+                start = time.perf_counter()
+                response = await client.get(path)
+                results[name].append((response.status_code, time.perf_counter() - start))
+                await asyncio.sleep(0.05)
+
+        await asyncio.gather(
+            *(flood() for _ in range(concurrency)),
+            probe("summary", "/journal/summary/bench-user"),
+            probe("health", "/journal/health"),
+            probe("ready", "/journal/health/ready"),
+        )
+    return results
+
+
+def report(label: str, results: dict):
+    print(label)
+    for name, samples in results.items():
+        codes = Counter(code for code, _ in samples)
+        latencies = [elapsed for _, elapsed in samples]
+        code_text = ", ".join(f"{code}: {count}" for code, count in sorted(codes.items()))
+        print(
+            f"  {name:<8}{len(samples):>6}건  p50 {percentile(latencies, 0.5):>8.1f}ms  "
+            f"p95 {percentile(latencies, 0.95):>8.1f}ms  ({code_text})"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="load shedding 동작 확인")
+    parser.add_argument("--concurrency", type=int, default=150, help="느린 요청 동시 수 (기본값: 150)")
+    parser.add_argument("--agent-latency", type=float, default=1.0, help="느린 요청 처리 시간 초 (기본값: 1.0)")
+    parser.add_argument("--duration", type=float, default=10.0, help="측정 시간 초 (기본값: 10)")
+    parser.add_argument("--port", type=int, default=8765, help="서버 포트 (기본값: 8765)")
+    args = parser.parse_args()
+
+    for index, with_shedding in enumerate((False, True)):
+        port = args.port + index
+        server = start_server(build_app(with_shedding, args.agent_latency), port)
+        results = asyncio.run(load(port, args.concurrency, args.duration))
+        server.should_exit = True
+        report("load shedding " + ("켬" if with_shedding else "끔"), results)
+
+
+if __name__ == "__main__":
+    main()
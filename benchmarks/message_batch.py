@@ -0,0 +1,64 @@
+"""
+POST /messages (건별) vs POST /messages/batch 처리량 벤치마크
+
+사용법 (DB_* 환경변수의 DB에 벤치마크용 메시지를 쓰고 마지막에 삭제합니다):
+    python -m benchmarks.message_batch --messages 2000 --batch-size 500
+
+앱을 인프로세스(TestClient)로 띄워 측정하므로 네트워크 왕복 비용은 포함되지 않습니다.
+실제 모바일 클라이언트에서는 요청당 RTT가 더해져 차이가 더 커집니다.
+"""
+import argparse
+import time
+
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, event
+
+from database import SessionLocal, engine
+from main import app
+from models.message import Message
+
+BENCH_USER = "bench-batch-user"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="메시지 일괄 저장 벤치마크")
+    parser.add_argument("--messages", type=int, default=2000, help="저장할 메시지 수 (기본값: 2000)")
+    parser.add_argument("--batch-size", type=int, default=500, help="배치 크기 (기본값: 500)")
+    args = parser.parse_args()
+
+    client = TestClient(app)
+    payloads = [{"user_id": BENCH_USER, "content": f"오늘 {i}번째 메모: 점심은 김치찌개"} for i in range(args.messages)]
+
+    statements = {"count": 0}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count_statements(*_):
+        statements["count"] += 1
+
+    start = time.perf_counter()
+    for payload in payloads:
+        client.post("/journal/messages", json=payload).raise_for_status()
+    single_s = time.perf_counter() - start
+    single_statements = statements["count"]
+
+    statements["count"] = 0
+    start = time.perf_counter()
+    for offset in range(0, args.messages, args.batch_size):
+        chunk = payloads[offset:offset + args.batch_size]
+        client.post("/journal/messages/batch", json={"messages": chunk}).raise_for_status()
+    batch_s = time.perf_counter() - start
+    batch_statements = statements["count"]
+
+    requests = -(-args.messages // args.batch_size)
+    print(f"{'mode':<8}{'requests':>10}{'SQL stmts':>11}{'seconds':>9}{'msgs/s':>10}")
+    print(f"{'single':<8}{args.messages:>10}{single_statements:>11}{single_s:>9.2f}{args.messages / single_s:>10,.0f}")
+    print(f"{'batch':<8}{requests:>10}{batch_statements:>11}{batch_s:>9.2f}{args.messages / batch_s:>10,.0f}")
+
+    db = SessionLocal()
+    db.execute(delete(Message).where(Message.user_id == BENCH_USER))
+    db.commit()
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
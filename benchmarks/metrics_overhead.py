@@ -0,0 +1,110 @@
+"""
+Prometheus 메트릭 계측 오버헤드 마이크로 벤치마크
+
+사용법 (pool 항목은 DB_* 환경변수의 DB에 연결만 합니다):
+    python -m benchmarks.metrics_overhead --iterations 20000
+
+- http: 라우트 하나짜리 FastAPI 앱을 ASGI로 직접 호출 (네트워크 제외), MetricsMiddleware 유무 비교
+- s3: @observe_s3로 감싼 빈 메서드 vs 원래 메서드 (S3 호출 자체는 수십 ms라 호출당 추가 비용만 확인)
+- pool: QueuePool vs InstrumentedQueuePool 체크아웃/반납 (engine.connect() → close())
+"""
+import argparse
+import asyncio
+import time
+
+from fastapi import FastAPI
+from sqlalchemy import create_engine, event
+
+from database import DATABASE_URL, _connect_with_current_credentials
+from middleware.metrics import MetricsMiddleware
+from services.metrics import InstrumentedQueuePool, observe_s3
+
+
+def build_app(with_metrics: bool):
+    app = FastAPI()
+
+    @app.get("/journal/items/{item_id}")
+    async def item(item_id: int):
+        return {"id": item_id}
+
+    if with_metrics:
+        app.add_middleware(MetricsMiddleware)
+    return app
+
+
+async def call(app, path: str, query_string: str = ""):
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": query_string.encode(),
+        "root_path": "", "headers": [], "client": ("127.0.0.1", 1), "server": ("testserver", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+def bench_http(iterations: int, with_metrics: bool) -> float:
+    app = build_app(with_metrics)
+
+    async def run():
+        for i in range(200):  # 워밍업 (미들웨어 스택 생성)
+            await call(app, f"/journal/items/{i}")
+        start = time.perf_counter()
+        for i in range(iterations):
+            await call(app, f"/journal/items/{i}")
+        return (time.perf_counter() - start) / iterations * 1e6
+
+    return asyncio.run(run())
+
+
+def bench_s3(iterations: int, instrumented: bool) -> float:
+    def get_history_from_s3(s3_key):
+        return s3_key
+
+    fn = observe_s3(get_history_from_s3) if instrumented else get_history_from_s3
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn("key")
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def bench_pool(iterations: int, instrumented: bool) -> float:
+    kwargs = {"poolclass": InstrumentedQueuePool} if instrumented else {}
+    engine = create_engine(DATABASE_URL, pool_size=10, max_overflow=20, **kwargs)
+    # 앱 engine과 같은 방식으로 인증 정보 주입
+    event.listen(engine, "do_connect", _connect_with_current_credentials)
+    try:
+        engine.connect().close()  # 워밍업 (첫 연결 생성)
+        start = time.perf_counter()
+        for _ in range(iterations):
+            engine.connect().close()
+        return (time.perf_counter() - start) / iterations * 1e6
+    finally:
+        engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="메트릭 계측 오버헤드")
+    parser.add_argument("--iterations", type=int, default=20000, help="반복 횟수 (기본값: 20000)")
+    parser.add_argument("--skip-pool", action="store_true", help="DB 없이 실행 (pool 항목 생략)")
+    args = parser.parse_args()
+
+    cases = [("http", bench_http), ("s3", bench_s3)]
+    if not args.skip_pool:
+        cases.append(("pool", bench_pool))
+
+    print(f"{args.iterations} iterations (us/op)")
+    print(f"{'case':<8}{'plain':>10}{'metrics':>10}{'overhead':>10}")
+    for name, bench in cases:
+        plain = bench(args.iterations, False)
+        instrumented = bench(args.iterations, True)
+        print(f"{name:<8}{plain:>10.2f}{instrumented:>10.2f}{instrumented - plain:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
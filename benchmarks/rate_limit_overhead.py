@@ -0,0 +1,67 @@
+"""
+속도 제한 미들웨어 오버헤드 마이크로 벤치마크 (허용되는 요청 기준)
+
+사용법:
+    python -m benchmarks.rate_limit_overhead --iterations 20000
+
+라우트 하나짜리 FastAPI 앱을 ASGI로 직접 호출해 (네트워크 제외) RateLimitMiddleware 유무를 비교합니다.
+user_id 쿼리로 사용자를 구분하며, 한도에 걸리지 않도록 큰 한도로 memory 백엔드를 씁니다.
+"""
+import argparse
+import asyncio
+import time
+
+from fastapi import FastAPI
+
+from benchmarks.metrics_overhead import call
+from middleware.rate_limit import RateLimitMiddleware
+from services.rate_limit import MemoryRateLimitBackend, RateLimitPolicy
+
+
+def build_app(with_rate_limit: bool):
+    app = FastAPI()
+
+    @app.get("/journal/items/{item_id}")
+    async def item(item_id: int):
+        return {"id": item_id}
+
+    if with_rate_limit:
+        # 한도에 걸리지 않도록 충분히 큰 한도
+        app.add_middleware(
+            RateLimitMiddleware,
+            backend=MemoryRateLimitBackend(100000),
+            default_policy=RateLimitPolicy("default", 10 ** 9, 1),
+        )
+    return app
+
+
+def bench(iterations: int, users: int, with_rate_limit: bool) -> float:
+    app = build_app(with_rate_limit)
+    paths = [f"/journal/items/{i}" for i in range(users)]
+
+    async def run():
+        for i in range(200):  # 워밍업 (미들웨어 스택 생성)
+            await call(app, paths[i % users], f"user_id=bench-{i % users}")
+        start = time.perf_counter()
+        for i in range(iterations):
+            await call(app, paths[i % users], f"user_id=bench-{i % users}")
+        return (time.perf_counter() - start) / iterations * 1e6
+
+    return asyncio.run(run())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="속도 제한 미들웨어 오버헤드")
+    parser.add_argument("--iterations", type=int, default=20000, help="반복 횟수 (기본값: 20000)")
+    parser.add_argument("--users", type=int, default=1000, help="사용자 수 (버킷 수, 기본값: 1000)")
+    args = parser.parse_args()
+
+    plain = bench(args.iterations, args.users, False)
+    limited = bench(args.iterations, args.users, True)
+    print(f"{args.iterations} iterations, {args.users} users (us/request)")
+    print(f"{'plain':>10}{'limited':>10}{'overhead':>10}")
+    print(f"{plain:>10.2f}{limited:>10.2f}{limited - plain:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
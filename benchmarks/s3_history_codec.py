@@ -0,0 +1,91 @@
+"""
+S3 히스토리 저장 포맷별 크기 / CPU 비교 벤치마크
+
+사용법:
+    python -m benchmarks.s3_history_codec
+    python -m benchmarks.s3_history_codec --samples 500 --chars 2000
+
+한국어 일기 형태의 텍스트를 생성해 포맷(평문, gzip, zstd)과 압축 레벨별로
+평균 객체 크기, 압축률, 인코딩/디코딩 시간을 출력합니다.
+"""
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+from services.history_codec import decode_history, encode_history, zstandard
+
+SENTENCES = [
+    "오늘은 아침 일찍 일어나서 공원을 한 바퀴 산책했다.",
+    "회사에서 분기 계획 회의가 길어져서 점심을 늦게 먹었다.",
+    "퇴근길에 친구를 만나 오랜만에 떡볶이를 먹으며 수다를 떨었다.",
+    "비가 와서 기분이 조금 가라앉았지만 따뜻한 차를 마시니 괜찮아졌다.",
+    "새로 시작한 책이 생각보다 재미있어서 자기 전에 한 챕터를 더 읽었다.",
+    "운동을 빼먹지 않으려고 저녁에 헬스장에 가서 삼십 분 정도 뛰었다.",
+    "엄마와 통화하면서 주말에 집에 내려가기로 약속했다.",
+    "프로젝트 배포가 무사히 끝나서 팀원들과 작은 축하를 했다.",
+]
+TAGS = ["일상", "회사", "운동", "가족", "친구", "독서", "여행", "감정"]
+
+
+def make_samples(count: int, chars: int, seed: int = 42) -> list:
+    rng = random.Random(seed)
+    start = date(2024, 1, 1)
+    samples = []
+    for i in range(count):
+        text = ""
+        while len(text) < chars:
+            text += rng.choice(SENTENCES) + " "
+        samples.append({
+            "user_id": f"user_{i % 50:03d}",
+            "content": text[:chars],
+            "record_date": start + timedelta(days=i),
+            "tags": rng.sample(TAGS, rng.randint(0, 3)) or None,
+        })
+    return samples
+
+
+def bench(samples: list, fmt: str, level) -> dict:
+    start = time.perf_counter()
+    bodies = [encode_history(fmt=fmt, level=level, **s) for s in samples]
+    encode_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for body in bodies:
+        decode_history(body)
+    decode_s = time.perf_counter() - start
+
+    return {
+        "size": sum(len(b) for b in bodies) / len(bodies),
+        "encode_us": encode_s / len(bodies) * 1e6,
+        "decode_us": decode_s / len(bodies) * 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="S3 히스토리 포맷 벤치마크")
+    parser.add_argument("--samples", type=int, default=1000, help="샘플 수 (기본값: 1000)")
+    parser.add_argument("--chars", type=int, default=800, help="일기 본문 글자 수 (기본값: 800)")
+    args = parser.parse_args()
+
+    samples = make_samples(args.samples, args.chars)
+
+    cases = [("text", None), ("gzip", 1), ("gzip", 6), ("gzip", 9)]
+    if zstandard is not None:
+        cases += [("zstd", 1), ("zstd", 3), ("zstd", 9), ("zstd", 19)]
+    else:
+        print("zstandard 미설치 - zstd 케이스는 건너뜁니다")
+
+    baseline = None
+    print(f"{'format':<8}{'level':>6}{'avg bytes':>12}{'ratio':>9}{'encode µs':>12}{'decode µs':>12}")
+    for fmt, level in cases:
+        result = bench(samples, fmt, level)
+        baseline = baseline or result["size"]
+        print(
+            f"{fmt:<8}{str(level or '-'):>6}{result['size']:>12.0f}{result['size'] / baseline:>9.1%}"
+            f"{result['encode_us']:>12.1f}{result['decode_us']:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
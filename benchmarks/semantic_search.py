@@ -0,0 +1,98 @@
+"""
+의미 검색 벤치마크 (사용자 1명, 기록 10,000건)
+
+사용법:
+    python -m benchmarks.semantic_search --entries 10000 --queries 200
+
+DB 없이 e2e 데이터 생성기와 같은 한국어 일기 문장으로 임베딩(EMBEDDING_PROVIDER=hash)을 계산해
+- 임베딩 계산 속도, 저장 크기 (float16), 저장 형식에서 인덱스를 만드는 시간 (지연 로딩 비용)
+- 전체 비교(FlatIndex)와 근사 검색(IVFIndex, probes별)의 검색 지연과 recall@10 (전체 비교 결과 기준)
+을 측정합니다. 검색 지연에는 검색어 임베딩 시간이 포함됩니다.
+"""
+import argparse
+import os
+import random
+import time
+
+import numpy as np
+
+from benchmarks.e2e.seed import diary_text
+from services.embeddings import HashingEmbedder, from_blobs, to_blob
+from services.vector_index import FlatIndex, IVFIndex
+
+QUERIES = [
+    "헬스장에서 운동한 날", "회의가 길어서 힘들었던 날", "여행 계획을 세운 날", "기분이 울적했던 날",
+    "야근한 날", "소설을 다 읽은 날", "국밥 먹은 날", "늦잠 잔 날", "비 오는 날 출근", "엄마 반찬",
+]
+
+
+def timed(fn, repeat: int):
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        latencies.append(time.perf_counter() - start)
+    return result, sorted(latencies)
+
+
+def percentile(sorted_values, p: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p))] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="의미 검색 벤치마크")
+    parser.add_argument("--entries", type=int, default=10000, help="사용자 기록 수 (기본값: 10000)")
+    parser.add_argument("--queries", type=int, default=200, help="검색 횟수 (기본값: 200)")
+    parser.add_argument("--dim", type=int, default=256, help="임베딩 차원 (기본값: 256)")
+    parser.add_argument("--probes", default="4,8,16", help="IVF probes (쉼표로 구분, 기본값: 4,8,16)")
+    parser.add_argument("--k", type=int, default=10, help="검색 결과 수 (기본값: 10)")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    texts = [diary_text(rng) for _ in range(args.entries)]
+    embedder = HashingEmbedder(args.dim)
+
+    start = time.perf_counter()
+    vectors = embedder.embed(texts)
+    embed_seconds = time.perf_counter() - start
+    blobs = [to_blob(vector) for vector in vectors]
+    ids = np.arange(1, args.entries + 1, dtype=np.int64)
+
+    print(f"기록 {args.entries:,}건, 차원 {args.dim}, CPU {os.cpu_count()}개")
+    print(f"  임베딩 계산        {embed_seconds * 1000:>9.1f}ms ({embed_seconds / args.entries * 1e6:.0f}us/건)")
+    print(f"  저장 크기          {sum(len(blob) for blob in blobs) / 1024:>9.1f}KB ({len(blobs[0])}B/건, float16)")
+
+    stored, load_times = timed(lambda: from_blobs(blobs, args.dim), 5)
+    print(f"  저장 형식 → 행렬    {percentile(load_times, 0.5):>9.2f}ms")
+
+    flat, build_times = timed(lambda: FlatIndex(ids, stored), 1)
+    print(f"  FlatIndex 생성     {build_times[0] * 1000:>9.2f}ms, 메모리 {flat.nbytes / 1024:.0f}KB")
+
+    query_texts = [QUERIES[i % len(QUERIES)] + f" {i}" for i in range(args.queries)]
+
+    def run(index):
+        results = []
+        latencies = []
+        for text in query_texts:
+            start = time.perf_counter()
+            results.append(index.search(embedder.embed([text])[0], args.k))
+            latencies.append(time.perf_counter() - start)
+        return results, sorted(latencies)
+
+    exact, flat_latencies = run(flat)
+    print(f"{'index':<18}{'build ms':>10}{'p50 ms':>9}{'p95 ms':>9}{'recall@' + str(args.k):>11}")
+    print(f"{'flat':<18}{build_times[0] * 1000:>10.1f}{percentile(flat_latencies, 0.5):>9.2f}{percentile(flat_latencies, 0.95):>9.2f}{1.0:>11.3f}")
+
+    for probes in [int(p) for p in args.probes.split(",")]:
+        start = time.perf_counter()
+        ivf = IVFIndex(ids, stored, probes)
+        build_ms = (time.perf_counter() - start) * 1000
+        approx, latencies = run(ivf)
+        recall = np.mean([
+            len({i for i, _ in a} & {i for i, _ in e}) / max(1, len(e)) for a, e in zip(approx, exact)
+        ])
+        print(f"{f'ivf probes={probes}':<18}{build_ms:>10.1f}{percentile(latencies, 0.5):>9.2f}{percentile(latencies, 0.95):>9.2f}{recall:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+앱 시작 비용 프로파일: main import 시간(모듈별) + warm-up 단계별 시간
+
+사용법:
+    python -m benchmarks.startup_profile --top 25
+    python -m benchmarks.startup_profile --warmup   # warm-up 단계도 실행 (DB/S3 접속 필요)
+
+- import: 새 인터프리터에서 `python -X importtime -c "import main"`을 실행해
+  모듈별 누적 시간(cumulative)과 최상위 패키지별 합계(self 합)를 보여줍니다.
+  pod가 요청을 받기 시작할 때까지(liveness) 걸리는 시간의 대부분입니다.
+- warm-up: lifespan에서 백그라운드로 실행하는 단계(트레이싱, 시크릿, DB 연결, S3 클라이언트)를
+  같은 순서로 실행해 readiness까지 걸리는 시간을 단계별로 보여줍니다.
+"""
+import argparse
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+
+def profile_import(top: int):
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        capture_output=True, text=True
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        print(result.stderr[-2000:])
+        raise SystemExit("main import 실패")
+
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append((name.strip(), int(self_us), int(cumulative_us)))
+
+    by_package = defaultdict(int)
+    for name, self_us, _ in modules:
+        by_package[name.split(".")[0]] += self_us
+
+    print(f"import main: {wall_ms:.0f}ms (인터프리터 시작 포함), 모듈 {len(modules)}개")
+    print(f"\n상위 {top}개 모듈 (cumulative)")
+    print(f"{'cumulative':>12}{'self':>10}  module")
+    for name, self_us, cumulative_us in sorted(modules, key=lambda m: -m[2])[:top]:
+        print(f"{cumulative_us / 1000:>10.1f}ms{self_us / 1000:>8.1f}ms  {name}")
+
+    print(f"\n상위 {top}개 최상위 패키지 (self 합계)")
+    for package, self_us in sorted(by_package.items(), key=lambda p: -p[1])[:top]:
+        print(f"{self_us / 1000:>10.1f}ms  {package}")
+
+
+def profile_warmup():
+    import main  # noqa: F401 - warm-up 단계 등록
+    from services.startup import warmup
+
+    ok = warmup.run()
+    print(f"\nwarm-up: {'완료' if ok else '실패 - ' + str(warmup.error)}")
+    for name, ms in warmup.timings.items():
+        print(f"{ms:>10.1f}ms  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="앱 시작 비용 프로파일")
+    parser.add_argument("--top", type=int, default=20, help="출력할 모듈/패키지 수 (기본값: 20)")
+    parser.add_argument("--warmup", action="store_true", help="warm-up 단계도 실행")
+    args = parser.parse_args()
+
+    profile_import(args.top)
+    if args.warmup:
+        profile_warmup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+트레이싱 모드별 요청 처리량 벤치마크
+
+사용법 (DB_* 환경변수의 DB에 연결, 조회만 합니다):
+    python -m benchmarks.tracing_modes --requests 3000
+
+모드마다 새 프로세스에서 앱을 띄워 (OpenTelemetry 전역 설정이 프로세스 단위이므로)
+GET /journal/messages를 ASGI로 직접 호출합니다 (네트워크 제외, 순차 요청).
+스팬은 TRACE_EXPORTER=none으로 버리므로 exporter 네트워크 비용은 빠지고
+스팬 생성/처리(BatchSpanProcessor 대기열 포함) 비용만 비교합니다.
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+MODES = [
+    ("off", {"TRACING_ENABLED": "false"}),
+    ("always_on + query spans", {"TRACE_SAMPLER": "always_on", "TRACE_DB_SPANS": "query"}),
+    ("always_on + asgi spans", {"TRACE_SAMPLER": "always_on", "TRACE_DB_SPANS": "query", "TRACE_ASGI_INTERNAL_SPANS": "true"}),
+    ("always_on + aggregate", {"TRACE_SAMPLER": "always_on", "TRACE_DB_SPANS": "aggregate"}),
+    ("ratio 0.1 + query spans", {"TRACE_SAMPLER": "ratio", "TRACE_SAMPLE_RATIO": "0.1", "TRACE_DB_SPANS": "query"}),
+    ("ratio 0.1 + aggregate", {"TRACE_SAMPLER": "ratio", "TRACE_SAMPLE_RATIO": "0.1", "TRACE_DB_SPANS": "aggregate"}),
+    ("ratio 0.1 + keep errors", {"TRACE_SAMPLER": "ratio", "TRACE_SAMPLE_RATIO": "0.1", "TRACE_DB_SPANS": "aggregate", "TRACE_KEEP_ERRORS_AND_SLOW": "true"}),
+    ("rate_limited 10/s", {"TRACE_SAMPLER": "rate_limited", "TRACE_RATE_LIMIT_PER_SECOND": "10", "TRACE_DB_SPANS": "aggregate"}),
+]
+
+
+def worker(requests: int):
+    import httpx
+
+    import main
+    from services.startup import warmup
+
+    if not warmup.run():
+        raise SystemExit(f"warm-up 실패: {warmup.error}")
+
+    async def run():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for _ in range(200):  # 워밍업
+                await client.get("/journal/messages", params={"user_id": "bench-tracing-user"})
+            start = time.perf_counter()
+            for _ in range(requests):
+                response = await client.get("/journal/messages", params={"user_id": "bench-tracing-user"})
+                response.raise_for_status()
+            return time.perf_counter() - start
+
+    elapsed = asyncio.run(run())
+    print(f"{requests / elapsed:.1f} {elapsed / requests * 1000:.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="트레이싱 모드별 처리량")
+    parser.add_argument("--requests", type=int, default=3000, help="모드별 요청 수 (기본값: 3000)")
+    parser.add_argument("--rounds", type=int, default=3, help="모드별 반복 실행 횟수 (기본값: 3)")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.requests)
+        return
+
+    print(f"GET /journal/messages x {args.requests} (순차, ASGI 직접 호출), {args.rounds}회 중 최고값")
+    best = {}
+    # 모드를 번갈아 여러 번 실행해 시점별 부하 차이를 줄임
+    for _ in range(args.rounds):
+        for name, overrides in MODES:
+            env = {**os.environ, "TRACE_EXPORTER": "none", "METRICS_ENABLED": "false", **overrides}
+            env.setdefault("S3_BUCKET_NAME", "bench-bucket")
+            result = subprocess.run(
+                [sys.executable, "-m", "benchmarks.tracing_modes", "--worker", "--requests", str(args.requests)],
+                env=env, capture_output=True, text=True
+            )
+            if result.returncode != 0:
+                print(f"{name} 실패\n{result.stderr[-1500:]}")
+                continue
+            throughput = float(result.stdout.split()[-2])
+            best[name] = max(best.get(name, 0.0), throughput)
+
+    print(f"{'mode':<28}{'req/s':>10}{'ms/req':>10}{'vs off':>9}")
+    baseline = best.get(MODES[0][0])
+    for name, _ in MODES:
+        if name not in best:
+            continue
+        throughput = best[name]
+        relative = f"{throughput / baseline:>8.2f}x" if baseline else ""
+        print(f"{name:<28}{throughput:>10.1f}{1000 / throughput:>10.3f}{relative}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+gunicorn 워커 수별 처리량 벤치마크
+
+사용법 (benchmarks.e2e와 같은 로컬 의존성/데이터 사용 - 먼저 python -m benchmarks.e2e.run --compose로 데이터 생성):
+    python -m benchmarks.worker_scaling --workers 1,2,4 --concurrency 32
+
+워커 수마다 gunicorn(gunicorn.conf.py, preload)으로 앱을 새로 띄워 e2e 시나리오를 실행하고
+시나리오별 처리량과 p95를 워커 1개 대비로 비교합니다. CPU를 쓰는 읽기 경로(직렬화, 검색)가 대상이며
+워커 수가 CPU 코어 수를 넘으면 처리량이 늘지 않습니다.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+DEFAULT_SCENARIOS = "history.list,history.search,history.get,messages.list"
+
+
+def run_e2e(workers: int, args) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, "result.json")
+        subprocess.run([
+            sys.executable, "-m", "benchmarks.e2e.run", "--skip-seed",
+            "--workers", str(workers), "--scenarios", args.scenarios,
+            "--concurrency", str(args.concurrency), "--duration", str(args.duration),
+            # 기준값 비교 없이 결과만 (없는 파일을 기준값으로 지정)
+            "--users", str(args.users), "--baseline", os.path.join(tmp, "none.json"), "--output", output,
+        ], check=True, stdout=subprocess.DEVNULL)
+        with open(output) as f:
+            return json.load(f)["scenarios"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="워커 수별 처리량")
+    parser.add_argument("--workers", default="1,2,4", help="비교할 워커 수 (쉼표로 구분, 기본값: 1,2,4)")
+    parser.add_argument("--scenarios", default=DEFAULT_SCENARIOS, help=f"e2e 시나리오 (기본값: {DEFAULT_SCENARIOS})")
+    parser.add_argument("--concurrency", type=int, default=32, help="동시 요청 수 (기본값: 32)")
+    parser.add_argument("--duration", type=float, default=15.0, help="시나리오별 측정 시간 초 (기본값: 15)")
+    parser.add_argument("--users", type=int, default=20, help="seed 사용자 수 (기본값: 20)")
+    args = parser.parse_args()
+
+    counts = [int(n) for n in args.workers.split(",")]
+    results = {}
+    for workers in counts:
+        print(f"워커 {workers}개 ...", flush=True)
+        results[workers] = run_e2e(workers, args)
+
+    print(f"CPU {os.cpu_count()}개, 동시성 {args.concurrency}")
+    print(f"{'scenario':<25}{'workers':>8}{'req/s':>9}{'p95 ms':>9}{f'vs {counts[0]}':>8}")
+    for name in results[counts[0]]:
+        base = results[counts[0]][name]["throughput"]
+        for workers in counts:
+            result = results[workers][name]
+            print(f"{name:<25}{workers:>8}{result['throughput']:>9.1f}{result['p95_ms']:>9.1f}{result['throughput'] / base:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
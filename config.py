@@ -1,70 +1,184 @@
 import os
-import json
-import boto3
-from botocore.exceptions import ClientError
-import logging
-
-logger = logging.getLogger(__name__)
-
-def get_secret(secret_name, region_name="ap-northeast-2"):
-    """AWS Secrets Manager에서 시크릿 가져오기"""
-    
-    # 로컬 개발 환경에서는 환경변수 사용
-    env = os.getenv("ENVIRONMENT", "development")
-    logger.info(f"Environment: {env}")
-    
-    if env == "development":
-        logger.info("Development mode - using environment variables")
-        return None
-    
-    logger.info(f"Production mode - fetching secret: {secret_name}")
-    
-    try:
-        session = boto3.session.Session()
-        client = session.client(
-            service_name='secretsmanager',
-            region_name=region_name
-        )
-        
-        get_secret_value_response = client.get_secret_value(SecretId=secret_name)
-        secret = get_secret_value_response['SecretString']
-        logger.info(f"Successfully retrieved secret: {secret_name}")
-        return json.loads(secret)
-    except ClientError as e:
-        logger.error(f"Error retrieving secret {secret_name}: {e}")
-        return None
-    except Exception as e:
-        logger.error(f"Unexpected error retrieving secret {secret_name}: {e}")
-        return None
+
+ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
+
+# 시크릿 제공자: "aws"(Secrets Manager) | "file"(로컬 JSON 파일, 테스트용) | "env"(환경변수만 사용)
+# 기본값은 development면 env, 그 외에는 aws
+SECRETS_PROVIDER = os.getenv("SECRETS_PROVIDER", "env" if ENVIRONMENT == "development" else "aws").lower()
+SECRETS_FILE = os.getenv("SECRETS_FILE", "secrets.local.json")
+# 조회한 시크릿을 메모리에 두는 시간과 백그라운드 갱신 주기 (갱신 주기 < TTL이면 요청 경로에서 조회하지 않음)
+SECRETS_CACHE_TTL_SECONDS = int(os.getenv("SECRETS_CACHE_TTL_SECONDS", "300"))
+SECRETS_REFRESH_INTERVAL_SECONDS = int(os.getenv("SECRETS_REFRESH_INTERVAL_SECONDS", "240"))
 
 # Database 설정
-db_secret = get_secret("one-rds-credentials")
-if db_secret:
-    DB_HOST = db_secret.get("host")
-    DB_PORT = db_secret.get("port")
-    DB_NAME = db_secret.get("dbname")
-    DB_USER = db_secret.get("username")
-    DB_PASSWORD = db_secret.get("password")
-    logger.info(f"Using database from Secrets Manager: {DB_HOST}:{DB_PORT}/{DB_NAME}")
-else:
-    # 환경변수에서 가져오기 (로컬 개발용)
-    DB_HOST = os.getenv("DB_HOST", "localhost")
-    DB_PORT = os.getenv("DB_PORT", "5432")
-    DB_NAME = os.getenv("DB_NAME", "journal_db")
-    DB_USER = os.getenv("DB_USER", "postgres")
-    DB_PASSWORD = os.getenv("DB_PASSWORD", "password")
-    logger.warning(f"Failed to get database config from Secrets Manager, using environment variables: {DB_HOST}:{DB_PORT}/{DB_NAME}")
-    
-    # Production 환경에서 localhost를 사용하는 경우 경고
-    if os.getenv("ENVIRONMENT") == "production" and DB_HOST == "localhost":
-        logger.error("CRITICAL: Production environment is using localhost for database connection!")
+# DB 인증 정보 시크릿 이름 - 시크릿 값(host/port/dbname/username/password)이 있으면 아래 환경변수보다 우선하며,
+# import 시점이 아니라 첫 DB 연결 시점에 조회합니다 (database.py)
+DB_SECRET_NAME = os.getenv("DB_SECRET_NAME", "one-rds-credentials")
+# 환경변수에서 가져오기 (로컬 개발용)
+DB_HOST = os.getenv("DB_HOST", "localhost")
+DB_PORT = os.getenv("DB_PORT", "5432")
+DB_NAME = os.getenv("DB_NAME", "journal_db")
+DB_USER = os.getenv("DB_USER", "postgres")
+DB_PASSWORD = os.getenv("DB_PASSWORD", "password")
+
+# 프로세스/풀 설정
+# 워커 프로세스 수 (gunicorn.conf.py) - DB 풀은 아래 파드 전체 값을 워커 수로 나눠 씀
+WEB_CONCURRENCY = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+# 동기 핸들러/의존성을 실행하는 스레드풀 크기 (워커마다, anyio 기본값 40)
+THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", "40"))
 
 # Agent API 설정
 AGENT_API_URL = os.getenv("AGENT_API_URL", "http://agent-api-service:8000")
 
+# 메시지 일괄 저장(/messages/batch) 최대 건수
+MESSAGE_BATCH_MAX_SIZE = int(os.getenv("MESSAGE_BATCH_MAX_SIZE", "500"))
+
+# Idempotency-Key 설정
+IDEMPOTENCY_PATHS = os.getenv(
+    "IDEMPOTENCY_PATHS",
+    "/journal/messages,/journal/messages/batch,/journal/history,/journal/process"
+).split(",")
+IDEMPOTENCY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+# processing 상태로 이 시간 이상 남은 키는 워커 장애로 보고 재처리 허용 (Agent API 타임아웃 60초보다 길게)
+IDEMPOTENCY_LOCK_TIMEOUT_SECONDS = int(os.getenv("IDEMPOTENCY_LOCK_TIMEOUT_SECONDS", "120"))
+
+# 요청 속도 제한 (사용자별 토큰 버킷)
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "True").lower() == "true"
+# "memory"(파드별) | "redis"(레플리카 간 공유, REDIS_URL 사용)
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory").lower()
+# "요청 수/초": 버킷 크기가 요청 수이고 그 시간 동안 같은 수만큼 다시 채워짐
+# AI 경로(Agent API 호출)는 경로별로, 나머지 CRUD는 사용자당 하나의 버킷
+RATE_LIMIT_AI = os.getenv("RATE_LIMIT_AI", "10/60")
+# AI 경로는 사용자 버킷과 함께 클라이언트 IP별 버킷도 적용 (user_id는 클라이언트가 보내는 값이라 바꿔 가며 우회 가능)
+RATE_LIMIT_AI_IP = os.getenv("RATE_LIMIT_AI_IP", "60/60")
+RATE_LIMIT_AI_PATHS = os.getenv("RATE_LIMIT_AI_PATHS", "/journal/process,/journal/summary").split(",")
+RATE_LIMIT_DEFAULT = os.getenv("RATE_LIMIT_DEFAULT", "300/60")
+RATE_LIMIT_EXEMPT_PATHS = os.getenv("RATE_LIMIT_EXEMPT_PATHS", "/journal/health,/journal/metrics").split(",")
+# 클라이언트 IP는 X-Forwarded-For의 뒤에서 N번째 값 (신뢰하는 프록시 수, ALB만 있으면 1, 0이면 헤더 무시)
+# 앞쪽 값은 클라이언트가 보낸 헤더 그대로라 바꿔 가며 보내면 IP별 한도를 우회할 수 있음
+TRUSTED_PROXY_HOPS = int(os.getenv("TRUSTED_PROXY_HOPS", "1"))
+# memory 백엔드가 보관하는 최대 버킷 수 (넘으면 가장 오래 안 쓴 버킷부터 버림)
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+
+# 과부하 시 요청 차단 (load shedding, 워커 프로세스별 판단)
+LOAD_SHED_ENABLED = os.getenv("LOAD_SHED_ENABLED", "True").lower() == "true"
+# 아래 값 중 하나라도 넘으면 과부하 - 우선순위가 낮은 경로를 503으로 거절
+LOAD_SHED_LOOP_LAG_MS = float(os.getenv("LOAD_SHED_LOOP_LAG_MS", "250"))
+LOAD_SHED_MAX_IN_FLIGHT = int(os.getenv("LOAD_SHED_MAX_IN_FLIGHT", "100"))
+# 스레드풀(THREADPOOL_SIZE)이 가득 차서 스레드를 기다리는 작업 수
+LOAD_SHED_MAX_THREADPOOL_QUEUE = int(os.getenv("LOAD_SHED_MAX_THREADPOOL_QUEUE", "20"))
+# 우선순위가 낮은 경로 (요약, 검색) - 그 외 요청과 /journal/health, 경로 아래 /check/는 항상 처리
+LOAD_SHED_LOW_PRIORITY_PATHS = os.getenv(
+    "LOAD_SHED_LOW_PRIORITY_PATHS", "/journal/summary,/journal/history/search,/journal/history/tags"
+).split(",")
+# 지표가 기준 아래로 내려간 뒤 이 시간 동안 유지되어야 과부하 해제 (readiness 깜빡임 방지)
+LOAD_SHED_COOLDOWN_SECONDS = float(os.getenv("LOAD_SHED_COOLDOWN_SECONDS", "5"))
+LOAD_SHED_SAMPLE_INTERVAL_MS = float(os.getenv("LOAD_SHED_SAMPLE_INTERVAL_MS", "100"))
+# 과부하 중 /journal/health/ready를 503으로 응답 (로드밸런서가 다른 파드로 보내도록)
+LOAD_SHED_READINESS = os.getenv("LOAD_SHED_READINESS", "True").lower() == "true"
+
+# 변경 피드(/sync) 설정
+SYNC_PAGE_SIZE = int(os.getenv("SYNC_PAGE_SIZE", "500"))
+# 이 시간 안의 변경은 다음 동기화에서 한 번 더 보냄 (늦게 커밋된 트랜잭션 누락 방지)
+SYNC_SAFETY_WINDOW_SECONDS = int(os.getenv("SYNC_SAFETY_WINDOW_SECONDS", "30"))
+# 삭제 표시(tombstone) 보관 기간 - 이보다 오래된 토큰은 전체 동기화 필요 (410)
+SYNC_TOMBSTONE_RETENTION_DAYS = int(os.getenv("SYNC_TOMBSTONE_RETENTION_DAYS", "90"))
+
+# 히스토리 목록 content 미리보기(preview) 최대 글자 수
+HISTORY_PREVIEW_MAX_LENGTH = int(os.getenv("HISTORY_PREVIEW_MAX_LENGTH", "500"))
+
+# 메시지 파티션/보관 설정
+# 배포(scripts.init_db)와 매일 보관 작업(scripts.archive_messages) 때 이번 달부터 N개월 뒤까지 월 파티션을 미리 생성
+MESSAGE_PARTITION_MONTHS_AHEAD = int(os.getenv("MESSAGE_PARTITION_MONTHS_AHEAD", "2"))
+# 요약(History)이 저장된 날의 메시지를 이 기간 후 보관소로 이동 (삭제 표시 보관 기간 이상이어야 함)
+MESSAGE_ARCHIVE_AFTER_DAYS = int(os.getenv("MESSAGE_ARCHIVE_AFTER_DAYS", "90"))
+# 보관소 로컬 디렉토리 (비어 있으면 S3에 보관)
+MESSAGE_ARCHIVE_DIR = os.getenv("MESSAGE_ARCHIVE_DIR", "")
+
+# 요약 저장(POST /history) 후 그날의 메시지를 history.raw_messages로 압축할지 여부
+MESSAGE_COMPACTION_ON_SAVE = os.getenv("MESSAGE_COMPACTION_ON_SAVE", "False").lower() == "true"
+
+# History 단건 조회 캐시 설정: "memory"(프로세스 로컬 LRU) | "redis"(레플리카 공유) | "none"
+# memory는 다른 프로세스의 쓰기를 무효화하지 못하므로 (수정 후 다른 파드에서 이전 값/304) 단일 프로세스에서만 사용
+HISTORY_CACHE_BACKEND = os.getenv("HISTORY_CACHE_BACKEND", "none").lower()
+HISTORY_CACHE_TTL_SECONDS = int(os.getenv("HISTORY_CACHE_TTL_SECONDS", "60"))
+HISTORY_CACHE_MAX_ENTRIES = int(os.getenv("HISTORY_CACHE_MAX_ENTRIES", "10000"))
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+# 이 날의 기록(/history/on-this-day) 캐시 유지 시간 - 키에 사용자 버전이 들어가 쓰기 후 오래된 값은 쓰이지 않음
+ON_THIS_DAY_CACHE_TTL_SECONDS = int(os.getenv("ON_THIS_DAY_CACHE_TTL_SECONDS", "86400"))
+
+# 의미 검색(/history/search/semantic) 설정
+# 임베딩 계산 방식: "hash"(로컬 글자 n-gram 해싱) | "agent"(Agent API) | "none"(끔)
+EMBEDDING_PROVIDER = os.getenv("EMBEDDING_PROVIDER", "hash").lower()
+EMBEDDING_DIM = int(os.getenv("EMBEDDING_DIM", "256"))
+# EMBEDDING_PROVIDER=agent일 때 호출하는 경로 ({"texts": [...]} → {"embeddings": [[...], ...]})
+EMBEDDING_AGENT_PATH = os.getenv("EMBEDDING_AGENT_PATH", "/embeddings")
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "256"))
+# 메모리에 올려 두는 사용자 인덱스의 전체 벡터 수 상한 (검색 속도 때문에 메모리에서는 float32, 벡터당 EMBEDDING_DIM * 4바이트)
+VECTOR_INDEX_MAX_VECTORS = int(os.getenv("VECTOR_INDEX_MAX_VECTORS", "50000"))
+# 다른 워커/레플리카의 쓰기가 반영되기까지 최대 지연 (같은 프로세스의 쓰기는 바로 반영)
+VECTOR_INDEX_TTL_SECONDS = int(os.getenv("VECTOR_INDEX_TTL_SECONDS", "300"))
+# 기록이 이 수 이상인 사용자는 근사 검색(IVF), 미만이면 전체 비교
+VECTOR_INDEX_ANN_MIN_SIZE = int(os.getenv("VECTOR_INDEX_ANN_MIN_SIZE", "20000"))
+# 근사 검색 시 비교할 클러스터 수 (클수록 정확하고 느림)
+VECTOR_INDEX_ANN_PROBES = int(os.getenv("VECTOR_INDEX_ANN_PROBES", "8"))
+
+# Prometheus 메트릭 수집 (/journal/metrics) 여부
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "True").lower() == "true"
+
+# 트레이싱 설정
+# false면 OpenTelemetry를 설치/계측하지 않음 (no-op)
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "True").lower() == "true"
+# 샘플러 (모두 parent-based): "always_on" | "ratio" | "rate_limited"
+TRACE_SAMPLER = os.getenv("TRACE_SAMPLER", "always_on").lower()
+TRACE_SAMPLE_RATIO = float(os.getenv("TRACE_SAMPLE_RATIO", "0.1"))
+TRACE_RATE_LIMIT_PER_SECOND = float(os.getenv("TRACE_RATE_LIMIT_PER_SECOND", "10"))
+# 샘플링되지 않은 요청도 오류(5xx 등)이거나 이 시간보다 느리면 내보냄 (ratio/rate_limited에서만)
+TRACE_KEEP_ERRORS_AND_SLOW = os.getenv("TRACE_KEEP_ERRORS_AND_SLOW", "False").lower() == "true"
+TRACE_SLOW_THRESHOLD_MS = float(os.getenv("TRACE_SLOW_THRESHOLD_MS", "1000"))
+# DB 스팬: "query"(쿼리마다 스팬) | "aggregate"(요청 스팬에 쿼리 수/시간 속성만) | "off"
+TRACE_DB_SPANS = os.getenv("TRACE_DB_SPANS", "query").lower()
+# 스팬 exporter: "otlp" | "none"(버림 - 로컬/벤치마크용)
+TRACE_EXPORTER = os.getenv("TRACE_EXPORTER", "otlp").lower()
+# 트레이스를 만들지 않을 경로 (정규식, 콤마 구분 - 헬스체크/메트릭 스크레이프)
+TRACE_EXCLUDED_URLS = os.getenv("TRACE_EXCLUDED_URLS", "/journal/health,/journal/metrics")
+# ASGI receive/send 내부 스팬 (요청마다 2~3개 추가) 생성 여부
+TRACE_ASGI_INTERNAL_SPANS = os.getenv("TRACE_ASGI_INTERNAL_SPANS", "False").lower() == "true"
+OTEL_EXPORTER_OTLP_INSECURE = os.getenv("OTEL_EXPORTER_OTLP_INSECURE", "True").lower() == "true"
+# BatchSpanProcessor 대기열/배치 크기 (OpenTelemetry 표준 환경변수, 기본값도 SDK와 같음)
+OTEL_BSP_MAX_QUEUE_SIZE = int(os.getenv("OTEL_BSP_MAX_QUEUE_SIZE", "2048"))
+OTEL_BSP_MAX_EXPORT_BATCH_SIZE = int(os.getenv("OTEL_BSP_MAX_EXPORT_BATCH_SIZE", "512"))
+OTEL_BSP_SCHEDULE_DELAY = float(os.getenv("OTEL_BSP_SCHEDULE_DELAY", "5000"))
+OTEL_BSP_EXPORT_TIMEOUT = float(os.getenv("OTEL_BSP_EXPORT_TIMEOUT", "30000"))
+
+# 요청 프로파일링 설정
+# X-Profile-Token 헤더가 이 값과 같으면 그 요청을 프로파일링 (비어 있으면 헤더/관리자 엔드포인트 비활성화)
+PROFILING_TOKEN = os.getenv("PROFILING_TOKEN", "")
+# PROFILING_PATHS로 시작하는 요청 중 이 비율을 자동으로 프로파일링 (0이면 사용 안 함)
+PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", "0"))
+PROFILING_PATHS = os.getenv("PROFILING_PATHS", "/journal/process,/journal/history").split(",")
+PROFILING_INTERVAL_MS = float(os.getenv("PROFILING_INTERVAL_MS", "5"))
+# 최근 프로파일 보관 개수 (링 버퍼)
+PROFILING_BUFFER_SIZE = int(os.getenv("PROFILING_BUFFER_SIZE", "50"))
+
+# 요청별 SQL 수/시간 집계 설정
+QUERY_STATS_ENABLED = os.getenv("QUERY_STATS_ENABLED", "True").lower() == "true"
+# 이 시간보다 오래 걸린 SQL은 문장과 바인드 파라미터 형태(값 제외)를 경고 로그로 남김 (0이면 끔)
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+# 요청 하나가 이보다 많은 SQL을 실행하면 경고 로그 (0이면 끔)
+QUERY_COUNT_WARN_THRESHOLD = int(os.getenv("QUERY_COUNT_WARN_THRESHOLD", "20"))
+# 응답 헤더 X-DB-Query-Count, X-DB-Query-Time-Ms 추가 (기본값: DEBUG)
+QUERY_STATS_HEADERS = os.getenv("QUERY_STATS_HEADERS", os.getenv("DEBUG", "False")).lower() == "true"
+
 # 기타 설정
 AWS_REGION = os.getenv("AWS_REGION", "ap-northeast-2")
 S3_BUCKET_NAME = os.getenv("S3_BUCKET_NAME")
+# S3 호환 스토리지 주소 (MinIO 등 로컬 대체용, 비어 있으면 AWS S3)
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL") or None
+# S3 히스토리 텍스트 저장 포맷: "text"(기존 평문) | "gzip" | "zstd"
+S3_HISTORY_FORMAT = os.getenv("S3_HISTORY_FORMAT", "text").lower()
+S3_HISTORY_COMPRESSION_LEVEL = int(os.getenv("S3_HISTORY_COMPRESSION_LEVEL")) if os.getenv("S3_HISTORY_COMPRESSION_LEVEL") else None
 ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", "*").split(",")
-DEBUG = os.getenv("DEBUG", "False").lower() == "true"
-ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
\ No newline at end of file
+DEBUG = os.getenv("DEBUG", "False").lower() == "true"
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
@@ -10,28 +10,101 @@ logger = logging.getLogger(__name__)
 load_dotenv()
 
 # config.py에서 설정 가져오기
-from config import DB_HOST, DB_PORT, DB_NAME, DB_USER, DB_PASSWORD
+from config import (
+    DB_HOST, DB_PORT, DB_NAME, DB_USER, DB_PASSWORD, DB_SECRET_NAME, ENVIRONMENT,
+    DB_MAX_OVERFLOW, DB_POOL_SIZE, QUERY_STATS_ENABLED, SLOW_QUERY_THRESHOLD_MS, WEB_CONCURRENCY,
+)
+from services.metrics import POOL_CLASS
+from services.query_stats import install_query_stats
+from services.secrets import secrets_cache
+
+def get_db_credentials(force_refresh: bool = False) -> dict:
+    """
+    DB 연결 정보 (psycopg2 connect 인자 형식)
+
+    시크릿(DB_SECRET_NAME)이 있으면 시크릿 값을, 없으면 환경변수 값을 사용합니다.
+    시크릿은 SecretsCache의 TTL 캐시에서 읽으므로 연결마다 Secrets Manager를 호출하지 않습니다.
+    """
+    db_secret = secrets_cache.get(DB_SECRET_NAME, force_refresh=force_refresh)
+    if db_secret:
+        return {
+            "host": db_secret.get("host"),
+            "port": db_secret.get("port"),
+            "dbname": db_secret.get("dbname"),
+            "user": db_secret.get("username"),
+            "password": db_secret.get("password"),
+        }
 
-def get_database_url():
     # 필수 환경변수 체크
     if not all([DB_USER, DB_PASSWORD]):
         raise ValueError(
             "데이터베이스 인증 정보가 필요합니다. "
             "DB_USER, DB_PASSWORD 환경변수를 설정하거나 AWS Secrets Manager를 사용하세요."
         )
-    
-    return f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+    # Production 환경에서 localhost를 사용하는 경우 경고
+    if ENVIRONMENT == "production" and DB_HOST == "localhost":
+        logger.error("CRITICAL: Production environment is using localhost for database connection!")
+    return {"host": DB_HOST, "port": DB_PORT, "dbname": DB_NAME, "user": DB_USER, "password": DB_PASSWORD}
+
+def get_database_url():
+    # 인증 정보는 연결할 때마다 get_db_credentials()로 넣으므로 URL에는 넣지 않음
+    return f"postgresql://{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
 DATABASE_URL = get_database_url()
 
+# DB_POOL_SIZE/DB_MAX_OVERFLOW는 파드 전체 값 - 워커 프로세스마다 풀이 따로 있으므로 나눠 씀
+POOL_SIZE = max(1, DB_POOL_SIZE // WEB_CONCURRENCY)
+MAX_OVERFLOW = max(0, DB_MAX_OVERFLOW // WEB_CONCURRENCY)
+
 engine = create_engine(
     DATABASE_URL,
-    pool_size=10,
-    max_overflow=20,
+    poolclass=POOL_CLASS,  # 체크아웃 대기 시간 메트릭 (METRICS_ENABLED=false면 기본 QueuePool)
+    pool_size=POOL_SIZE,
+    max_overflow=MAX_OVERFLOW,
     pool_pre_ping=True  # 연결 전에 ping으로 확인
 )
 
-logger.info(f"Database engine created for: {DB_HOST}:{DB_PORT}/{DB_NAME}")
+def _is_auth_failure(exc: Exception) -> bool:
+    message = str(exc)
+    return "password authentication failed" in message or "PAM authentication failed" in message
+
+@event.listens_for(engine, "do_connect")
+def _connect_with_current_credentials(dialect, conn_rec, cargs, cparams):
+    """
+    새 연결마다 캐시된 최신 인증 정보를 넣습니다.
+    인증에 실패하면 시크릿을 강제로 다시 읽어 한 번 재시도합니다 (교체 직후 TTL 안의 오래된 비밀번호).
+    """
+    cparams.update(get_db_credentials())
+    try:
+        return dialect.connect(*cargs, **cparams)
+    except dialect.loaded_dbapi.OperationalError as e:
+        if not _is_auth_failure(e):
+            raise
+        credentials = get_db_credentials(force_refresh=True)
+        if all(cparams.get(key) == value for key, value in credentials.items()):
+            raise
+        logger.warning("DB 인증 실패 - 새로 조회한 인증 정보로 다시 연결합니다")
+        cparams.update(credentials)
+        return dialect.connect(*cargs, **cparams)
+
+def _drain_pool_on_rotation(name, previous, current):
+    """
+    DB 시크릿이 바뀌면 커넥션 풀을 교체합니다.
+    쉬고 있는 연결은 바로 닫고, 사용 중인 연결은 반납될 때 닫히므로 진행 중인 요청은 끊기지 않습니다.
+    engine 객체는 그대로라 engine/SessionLocal을 import한 모듈은 새 풀을 그대로 사용합니다.
+    """
+    if name != DB_SECRET_NAME:
+        return
+    logger.info("DB 인증 정보 변경 - 커넥션 풀을 교체합니다")
+    engine.dispose()
+
+secrets_cache.on_change(_drain_pool_on_rotation)
+
+# 요청별 SQL 수/시간 집계 + 느린 쿼리 로그 (스크립트/배치 작업 포함)
+if QUERY_STATS_ENABLED:
+    install_query_stats(engine, slow_query_threshold_ms=SLOW_QUERY_THRESHOLD_MS)
+
+logger.info(f"Database engine created for: {DB_HOST}:{DB_PORT}/{DB_NAME} (secret: {DB_SECRET_NAME}, pool: {POOL_SIZE}+{MAX_OVERFLOW})")
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
@@ -42,4 +115,4 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
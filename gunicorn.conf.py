@@ -0,0 +1,95 @@
+"""
+gunicorn 설정 - 프로덕션 멀티 프로세스 실행
+
+    gunicorn -c gunicorn.conf.py main:app
+
+- WEB_CONCURRENCY개 uvicorn 워커 (기본 1). CPU 코어(파드 CPU limit)만큼 두면 Python 작업이 코어를 나눠 씀
+- preload_app: 마스터에서 앱을 한 번 import하고 fork (import 비용 1회, copy-on-write로 메모리 공유)
+  앱은 import 시점에 DB/S3에 연결하지 않으며 warm-up은 워커마다 lifespan에서 실행됩니다.
+- DB 풀 크기(DB_POOL_SIZE/DB_MAX_OVERFLOW)는 파드 전체 값이며 database.py가 워커 수로 나눔
+- 스레드풀 크기는 워커마다 THREADPOOL_SIZE
+- Prometheus 메트릭은 PROMETHEUS_MULTIPROC_DIR 파일에 모아 /journal/metrics에서 모든 워커 값을 합침
+- 프로세스 메모리에 두는 상태는 워커끼리 공유되지 않음 (check_process_local_state 참고)
+"""
+import os
+import shutil
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+# Agent API 호출이 최대 60초 걸리므로 그보다 길게 (요청 처리 중 워커가 죽지 않도록)
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "90"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = 75  # ALB idle timeout(60초)보다 길게
+accesslog = None
+
+# 멀티 프로세스 메트릭 - prometheus_client를 import하기 전(앱 preload 전)에 설정해야 함
+if workers > 1:
+    os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/journal-prometheus")
+    shutil.rmtree(os.environ["PROMETHEUS_MULTIPROC_DIR"], ignore_errors=True)  # 이전 실행의 값 제거
+    os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"], exist_ok=True)
+
+
+def check_process_local_state(workers: int):
+    """
+    워커가 여럿일 때 프로세스 메모리에 두는 상태를 확인합니다.
+
+    - 히스토리 조회 캐시(memory): 다른 워커의 쓰기를 무효화하지 못해 이전 값/잘못된 304를 반환 - 시작 실패
+    - 속도 제한(memory): 워커마다 버킷이 따로 있어 실제 한도가 워커 수배 - 경고
+    - 의미 검색 벡터 인덱스: 다른 워커의 쓰기는 VECTOR_INDEX_TTL_SECONDS 후 반영 - 경고
+    - 프로파일 링 버퍼: /admin/profiles/{id}는 그 요청을 처리한 워커에서만 조회됨 - 경고
+
+    Returns:
+        list: 경고 메시지 목록
+    """
+    if workers <= 1:
+        return []
+    from config import (
+        EMBEDDING_PROVIDER,
+        HISTORY_CACHE_BACKEND,
+        PROFILING_SAMPLE_RATE,
+        PROFILING_TOKEN,
+        RATE_LIMIT_BACKEND,
+        RATE_LIMIT_ENABLED,
+        VECTOR_INDEX_TTL_SECONDS,
+    )
+
+    if HISTORY_CACHE_BACKEND == "memory":
+        raise RuntimeError(
+            f"WEB_CONCURRENCY={workers}에서는 HISTORY_CACHE_BACKEND=memory를 쓸 수 없습니다 "
+            "(다른 워커의 쓰기를 무효화하지 못함) - redis 또는 none을 사용하세요"
+        )
+    warnings = []
+    if RATE_LIMIT_ENABLED and RATE_LIMIT_BACKEND == "memory":
+        warnings.append(f"RATE_LIMIT_BACKEND=memory - 워커마다 버킷이 따로 있어 실제 한도는 설정값의 {workers}배입니다 (redis 권장)")
+    if EMBEDDING_PROVIDER != "none":
+        warnings.append(f"의미 검색 벡터 인덱스는 워커별 - 다른 워커의 쓰기는 최대 {VECTOR_INDEX_TTL_SECONDS}초 후 검색에 반영됩니다")
+    if PROFILING_TOKEN or PROFILING_SAMPLE_RATE > 0:
+        warnings.append("프로파일 링 버퍼는 워커별 - /admin/profiles는 요청을 처리한 워커의 결과만 보여 줍니다")
+    return warnings
+
+
+# 설정 파일을 읽을 때 확인 (잘못된 조합이면 워커를 띄우기 전에 실패)
+_process_local_warnings = check_process_local_state(workers)
+
+
+def when_ready(server):
+    for message in _process_local_warnings:
+        server.log.warning(message)
+
+
+def post_fork(server, worker):
+    # 마스터에서 import한 객체 중 연결을 가진 것은 워커마다 새로 만듦
+    from database import engine
+    from services.s3 import s3_service
+
+    engine.dispose(close=False)  # 부모의 연결은 닫지 않고 버림 (같은 소켓을 두 프로세스가 쓰지 않도록)
+    s3_service.reset_client()
+
+
+def child_exit(server, worker):
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -1,34 +1,102 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 import os
+import anyio.to_thread
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 
-from database import Base, engine
-from routers import messages, history, summary, agent
+from database import engine, get_db_credentials
+from routers import messages, history, summary, agent, sync, admin
 from tracing import setup_tracing
+from middleware.idempotency import IdempotencyMiddleware
+from middleware.load_shedding import LoadSheddingMiddleware
+from middleware.metrics import MetricsMiddleware
+from middleware.profiling import ProfilingMiddleware
+from middleware.query_stats import QueryStatsMiddleware
+from middleware.rate_limit import RateLimitMiddleware
+from services.load_shedding import load_monitor
+from services.metrics import register_pool_metrics, render_metrics
+from services.s3 import s3_service
+from services.secrets import secrets_cache
+from services.startup import warmup
+from sqlalchemy import text
+from config import (
+    LOAD_SHED_ENABLED,
+    LOAD_SHED_READINESS,
+    METRICS_ENABLED,
+    PROFILING_SAMPLE_RATE,
+    PROFILING_TOKEN,
+    THREADPOOL_SIZE,
+    QUERY_COUNT_WARN_THRESHOLD,
+    QUERY_STATS_ENABLED,
+    QUERY_STATS_HEADERS,
+    RATE_LIMIT_ENABLED,
+    TRACE_ASGI_INTERNAL_SPANS,
+    TRACE_DB_SPANS,
+    TRACE_EXCLUDED_URLS,
+    TRACING_ENABLED,
+)
 from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
 from opentelemetry.instrumentation.httpx import HTTPXClientInstrumentor
 from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
 
-# 테이블 생성
-Base.metadata.create_all(bind=engine)
+# 테이블/파티션 생성은 시작 경로에서 하지 않음 - 배포 시 python -m scripts.init_db 실행
 
-@asynccontextmanager
-async def lifespan(app: FastAPI):
-    # 시작 시 OpenTelemetry 설정
+def _setup_tracing():
+    # 시작 시 OpenTelemetry 설정 (TRACING_ENABLED=false면 계측 없음)
     setup_tracing("journal-api")
+    if not TRACING_ENABLED:
+        return
     HTTPXClientInstrumentor().instrument()
-    SQLAlchemyInstrumentor().instrument(engine=engine)
+    if TRACE_DB_SPANS == "query":
+        SQLAlchemyInstrumentor().instrument(engine=engine)
+
+def _connect_database():
+    # 커넥션 풀에 첫 연결을 만들어 둠 (첫 요청이 연결 비용을 내지 않도록)
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+# warm-up 단계 (등록 순서대로 실행, 모두 끝나면 /journal/health/ready가 200)
+warmup.add_step("tracing", _setup_tracing)
+warmup.add_step("secrets", get_db_credentials)
+warmup.add_step("database", _connect_database)
+warmup.add_step("s3_client", lambda: s3_service.s3_client)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 동기 핸들러/의존성이 도는 스레드풀 크기 (워커 프로세스마다)
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    # 무거운 초기화는 서버가 요청을 받기 시작한 뒤 백그라운드에서 실행 (liveness와 readiness 분리)
+    warmup_task = asyncio.create_task(warmup.run_until_ready())
+    # DB 시크릿 백그라운드 갱신 (비밀번호 교체 시 커넥션 풀 교체)
+    secrets_cache.start_background_refresh()
+    # 이벤트 루프 지연/스레드풀 대기 샘플링 (과부하 판단)
+    if LOAD_SHED_ENABLED:
+        load_monitor.start()
     yield
     # 종료 시 정리 작업 (필요시)
+    warmup_task.cancel()
+    load_monitor.stop()
+    secrets_cache.stop_background_refresh()
 
 app = FastAPI(lifespan=lifespan)
 
+# Idempotency-Key 지원 (CORS보다 먼저 등록해야 재전송 응답에도 CORS 헤더가 붙음)
+app.add_middleware(IdempotencyMiddleware)
+
+# 사용자별 속도 제한 (CORS 안쪽 - 429 응답에도 CORS 헤더가 붙음)
+if RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware)
+
+# 과부하 시 우선순위 낮은 요청(요약, 검색)을 503으로 거절 (속도 제한보다 먼저 - 본문을 읽기 전에 거절)
+if LOAD_SHED_ENABLED:
+    app.add_middleware(LoadSheddingMiddleware)
+
 # CORS 설정
 allowed_origins = os.getenv("ALLOWED_ORIGINS", "*").split(",")
 app.add_middleware(
@@ -37,8 +105,31 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[
+        "ETag", "X-Profile-Id", "X-DB-Query-Count", "X-DB-Query-Time-Ms",
+        "RateLimit-Limit", "RateLimit-Remaining", "RateLimit-Reset", "RateLimit-Policy", "Retry-After",
+    ],
 )
 
+# 요청별 SQL 수/시간 집계 (engine 이벤트는 database.py에서 설치)
+# TRACE_DB_SPANS=aggregate면 쿼리별 DB 스팬 대신 요청 스팬에 쿼리 수/시간만 기록
+if QUERY_STATS_ENABLED:
+    app.add_middleware(
+        QueryStatsMiddleware,
+        record_span=TRACING_ENABLED and TRACE_DB_SPANS == "aggregate",
+        expose_headers=QUERY_STATS_HEADERS,
+        warn_threshold=QUERY_COUNT_WARN_THRESHOLD,
+    )
+
+# 요청 프로파일링 (토큰 또는 샘플 비율이 설정된 경우에만 등록)
+if PROFILING_TOKEN or PROFILING_SAMPLE_RATE > 0:
+    app.add_middleware(ProfilingMiddleware)
+
+# Prometheus 메트릭 (가장 바깥 미들웨어 - CORS/Idempotency 처리 시간까지 포함)
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    register_pool_metrics(engine)
+
 # 전역 예외 핸들러 - 500 에러에도 CORS 헤더 포함
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -69,6 +160,30 @@ async def not_found_handler(request: Request, exc: Exception):
 async def health_check():
     return {"status": "healthy", "service": "journal-api"}
 
+# liveness: 프로세스가 요청을 처리할 수 있으면 항상 200 (warm-up 중에도 재시작하지 않도록)
+@app.get("/journal/health/live")
+async def liveness_check():
+    return {"status": "alive", "service": "journal-api"}
+
+# readiness: warm-up(트레이싱, 시크릿, DB 연결, S3 클라이언트)이 끝나야 200, 그 전에는 503
+# 과부하(load shedding) 중에도 503 - 로드밸런서가 이 파드로 새 요청을 보내지 않도록
+@app.get("/journal/health/ready")
+async def readiness_check():
+    status = warmup.status()
+    ready = warmup.ready
+    if LOAD_SHED_ENABLED:
+        status["load"] = load_monitor.status()
+        if LOAD_SHED_READINESS and load_monitor.shedding:
+            ready = False
+            status["status"] = "shedding"
+    return JSONResponse(status_code=200 if ready else 503, content={**status, "service": "journal-api"})
+
+# Prometheus 스크레이프 엔드포인트
+@app.get("/journal/metrics", include_in_schema=False)
+async def metrics():
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
 @app.get("/journal")
 async def root():
     return {"message": "Journal API is running", "docs": "/journal/docs"}
@@ -78,6 +193,13 @@ app.include_router(messages.router, prefix="/journal")
 app.include_router(history.router, prefix="/journal")
 app.include_router(summary.router, prefix="/journal")
 app.include_router(agent.router, prefix="/journal")
+app.include_router(sync.router, prefix="/journal")
+app.include_router(admin.router, prefix="/journal")
 
-# FastAPI 자동 계측 (모든 HTTP 요청 트레이싱)
-FastAPIInstrumentor.instrument_app(app)
\ No newline at end of file
+# FastAPI 자동 계측 (모든 HTTP 요청 트레이싱 - 헬스체크/메트릭 경로 제외)
+if TRACING_ENABLED:
+    FastAPIInstrumentor.instrument_app(
+        app,
+        excluded_urls=TRACE_EXCLUDED_URLS,
+        exclude_spans=None if TRACE_ASGI_INTERNAL_SPANS else ["receive", "send"],
+    )
\ No newline at end of file
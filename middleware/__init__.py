@@ -0,0 +1 @@
+# middleware 패키지
\ No newline at end of file
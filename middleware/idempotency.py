@@ -0,0 +1,161 @@
+import hashlib
+import json
+import logging
+
+from starlette.concurrency import run_in_threadpool
+
+from config import IDEMPOTENCY_PATHS
+from middleware.rate_limit import client_ip
+from services.idempotency import CLAIMED, IN_PROGRESS, MISMATCH, REPLAY, idempotency_store
+
+logger = logging.getLogger(__name__)
+
+HEADER_NAME = b"idempotency-key"
+MAX_KEY_LENGTH = 255
+# 저장하지 않는 응답 헤더 (재전송 시 다시 계산하거나 연결/시각마다 다른 값)
+UNSTORED_HEADERS = {b"content-type", b"content-length", b"transfer-encoding", b"connection", b"date", b"server"}
+
+
+class IdempotencyMiddleware:
+    """
+    Idempotency-Key 헤더를 지원하는 ASGI 미들웨어
+
+    - IDEMPOTENCY_PATHS의 POST 요청에 Idempotency-Key 헤더가 있을 때만 동작합니다 (없으면 그대로 통과).
+    - 키는 요청자(본문의 user_id, 없으면 클라이언트 IP)별로 구분하므로 다른 사용자가 같은 키를 써도 섞이지 않습니다.
+    - 같은 키 + 같은 본문: 저장된 응답을 그대로 반환 (핸들러, Agent API, S3 호출 없음)
+    - 같은 키 + 다른 본문: 422
+    - 같은 키의 요청이 처리 중: 409 (Retry-After 포함)
+    - 5xx 응답이나 예외는 저장하지 않고 키를 해제하므로 재시도하면 다시 처리됩니다.
+    """
+
+    def __init__(self, app, paths=None):
+        self.app = app
+        self.paths = set(paths if paths is not None else IDEMPOTENCY_PATHS)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        key = dict(scope["headers"]).get(HEADER_NAME)
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+
+        key = key.decode("latin-1").strip()
+        if not key or len(key) > MAX_KEY_LENGTH:
+            await _send_json(send, 400, {"detail": "Idempotency-Key 형식이 올바르지 않습니다"})
+            return
+
+        # 본문을 모두 읽어 해시 계산 후 하위 앱에 다시 전달
+        body = b""
+        more_body = True
+        while more_body:
+            message = await receive()
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+        # 요청자 식별값은 길이가 정해지지 않으므로 해시로 넣음 (scope 컬럼 255자)
+        caller = hashlib.sha256(_caller_identity(scope, body).encode("utf-8")).hexdigest()[:32]
+        key_scope = f"{scope['method']} {scope['path']} {caller}"
+        digest = hashlib.sha256()
+        digest.update(scope.get("query_string", b""))
+        digest.update(b"\n")
+        digest.update(body)
+        request_hash = digest.hexdigest()
+
+        result, record = await run_in_threadpool(idempotency_store.claim, key, key_scope, request_hash)
+
+        if result == REPLAY:
+            await _send_raw(
+                send, record.status_code, record.content_type, record.response_body.encode("utf-8"),
+                replayed=True, extra_headers=record.response_headers
+            )
+            return
+        if result == MISMATCH:
+            await _send_json(send, 422, {"detail": "같은 Idempotency-Key가 다른 요청에 사용되었습니다"})
+            return
+        if result == IN_PROGRESS:
+            await _send_json(send, 409, {"detail": "같은 Idempotency-Key 요청이 처리 중입니다"}, retry_after=True)
+            return
+        assert result == CLAIMED
+
+        body_sent = False
+
+        async def replay_receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        response = {"status": 500, "content_type": None, "headers": [], "body": b""}
+
+        async def capture_send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                for name, value in message.get("headers", []):
+                    if name.lower() == b"content-type":
+                        response["content_type"] = value.decode("latin-1")
+                    elif name.lower() not in UNSTORED_HEADERS:
+                        response["headers"].append([name.decode("latin-1"), value.decode("latin-1")])
+            elif message["type"] == "http.response.body":
+                response["body"] += message.get("body", b"")
+            await send(message)
+
+        try:
+            await self.app(scope, replay_receive, capture_send)
+        except Exception:
+            await run_in_threadpool(idempotency_store.release, key, key_scope)
+            raise
+
+        try:
+            if response["status"] >= 500:
+                await run_in_threadpool(idempotency_store.release, key, key_scope)
+            else:
+                await run_in_threadpool(
+                    idempotency_store.complete,
+                    key, key_scope, response["status"], response["content_type"], response["body"], response["headers"]
+                )
+        except Exception as e:
+            # 응답은 이미 전송됨 - 저장 실패는 로그만 남김 (processing 상태는 잠금 타임아웃 후 인계됨)
+            logger.error(f"Idempotency 응답 저장 실패: {key_scope} - {e}")
+
+
+def _caller_identity(scope, body: bytes) -> str:
+    """
+    Idempotency-Key를 구분할 요청자 - 본문의 user_id (/messages/batch는 모든 메시지가 같은 사용자일 때),
+    없으면 클라이언트 IP
+    """
+    try:
+        data = json.loads(body) if body else None
+    except ValueError:
+        data = None
+    if isinstance(data, dict):
+        if data.get("user_id"):
+            return f"user:{data['user_id']}"
+        items = data.get("messages")
+        if isinstance(items, list) and items:
+            user_ids = {item.get("user_id") for item in items if isinstance(item, dict)}
+            if len(user_ids) == 1 and None not in user_ids:
+                return f"user:{user_ids.pop()}"
+    return f"ip:{client_ip(scope)}"
+
+
+async def _send_raw(send, status: int, content_type, body: bytes, replayed: bool = False, retry_after: bool = False, extra_headers=None):
+    headers = [(b"content-length", str(len(body)).encode())]
+    if content_type:
+        headers.append((b"content-type", content_type.encode("latin-1")))
+    for name, value in extra_headers or ():
+        headers.append((name.encode("latin-1"), value.encode("latin-1")))
+    if replayed:
+        headers.append((b"idempotent-replayed", b"true"))
+    if retry_after:
+        headers.append((b"retry-after", b"1"))
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _send_json(send, status: int, content: dict, retry_after: bool = False):
+    body = json.dumps(content, ensure_ascii=False).encode("utf-8")
+    await _send_raw(send, status, "application/json", body, retry_after=retry_after)
@@ -0,0 +1,66 @@
+import json
+import math
+
+from config import LOAD_SHED_LOW_PRIORITY_PATHS
+from services.load_shedding import load_monitor
+from services.metrics import SHED_REQUESTS
+
+# 과부하와 관계없이 항상 처리하고 처리 중 요청 수에도 넣지 않는 경로
+ALWAYS_ADMIT_PATHS = ("/journal/health", "/journal/metrics")
+
+
+class LoadSheddingMiddleware:
+    """
+    과부하 시 우선순위가 낮은 요청을 거절하는 ASGI 미들웨어
+
+    - 처리 중인 요청 수를 LoadMonitor에 반영하고, 과부하(shedding) 상태이거나 처리 중 요청 수가
+      기준에 도달하면 LOAD_SHED_LOW_PRIORITY_PATHS(요약, 검색) 요청을 핸들러 실행 전에 503 + Retry-After로 거절
+    - /journal/health, 메트릭과 그 외 요청(메시지/히스토리 저장 등 가벼운 쓰기, 조회)은 항상 처리
+    - 낮은 우선순위 경로 아래의 존재 확인(/summary/check/{user_id})은 가벼운 조회이므로 항상 처리
+    """
+
+    def __init__(self, app, monitor=None):
+        self.app = app
+        self.monitor = monitor or load_monitor
+        self.low_priority_paths = tuple(path for path in LOAD_SHED_LOW_PRIORITY_PATHS if path)
+        self.retry_after = str(max(1, math.ceil(self.monitor.cooldown_seconds))).encode()
+
+    async def __call__(self, scope, receive, send):
+        path = scope.get("path", "")
+        if scope["type"] != "http" or path.startswith(ALWAYS_ADMIT_PATHS):
+            await self.app(scope, receive, send)
+            return
+
+        monitor = self.monitor
+        if scope["method"] != "OPTIONS" and self._is_low_priority(path):
+            if monitor.shedding:
+                await self._reject(send, monitor.reason)
+                return
+            if monitor.max_in_flight and monitor.in_flight >= monitor.max_in_flight:
+                await self._reject(send, "in_flight")
+                return
+
+        monitor.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            monitor.in_flight -= 1
+
+    def _is_low_priority(self, path: str) -> bool:
+        prefix = next((prefix for prefix in self.low_priority_paths if path.startswith(prefix)), None)
+        # 요약 존재 확인(/summary/check/{user_id})은 캐시된 조회로 Agent API를 부르지 않음 (속도 제한과 같은 기준)
+        return prefix is not None and not path.startswith(prefix + "/check/")
+
+    async def _reject(self, send, reason):
+        SHED_REQUESTS.labels(reason or "in_flight").inc()
+        body = json.dumps({"detail": "서버가 혼잡합니다. 잠시 후 다시 시도하세요"}, ensure_ascii=False).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"retry-after", self.retry_after),
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
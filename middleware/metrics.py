@@ -0,0 +1,56 @@
+import time
+
+from services.metrics import (
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS,
+    HTTP_REQUESTS_IN_PROGRESS,
+    UNMATCHED_ROUTE,
+)
+
+
+class MetricsMiddleware:
+    """
+    라우트별 요청 수/처리 시간을 기록하는 ASGI 미들웨어
+
+    - route 라벨은 실제 경로가 아니라 라우트 템플릿(/journal/history/{history_id})이라 라벨 수가 라우트 수로 제한됩니다.
+    - 매칭되지 않은 경로(404)는 "unmatched" 하나로 모읍니다.
+    - 처리 시간은 응답 본문 전송이 끝날 때까지 (스트리밍 응답 포함)
+    """
+
+    def __init__(self, app):
+        self.app = app
+        # labels() 조회(잠금 + dict)를 요청마다 하지 않도록 라벨 조합별 child를 보관 (라우트 수로 제한됨)
+        self._durations = {}
+        self._counters = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_PROGRESS.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_REQUESTS_IN_PROGRESS.dec()
+            # 라우터가 매칭한 라우트를 scope에 남김 (FastAPI APIRoute)
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or UNMATCHED_ROUTE
+            method = scope["method"]
+            duration = self._durations.get((method, route_path))
+            if duration is None:
+                duration = self._durations[(method, route_path)] = HTTP_REQUEST_DURATION.labels(method, route_path)
+            duration.observe(time.perf_counter() - start)
+            counter = self._counters.get((method, route_path, status_code))
+            if counter is None:
+                counter = self._counters[(method, route_path, status_code)] = HTTP_REQUESTS.labels(method, route_path, str(status_code))
+            counter.inc()
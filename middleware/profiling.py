@@ -0,0 +1,58 @@
+import hmac
+import random
+
+from config import PROFILING_PATHS, PROFILING_SAMPLE_RATE, PROFILING_TOKEN
+from services.profiler import request_profiler
+
+HEADER_NAME = b"x-profile-token"
+
+
+class ProfilingMiddleware:
+    """
+    요청 단위 샘플링 프로파일링 ASGI 미들웨어
+
+    - X-Profile-Token 헤더가 PROFILING_TOKEN과 같으면 그 요청을 프로파일링합니다.
+    - PROFILING_SAMPLE_RATE > 0이면 PROFILING_PATHS로 시작하는 요청 중 그 비율을 프로파일링합니다.
+    - 프로파일링한 요청의 응답에는 X-Profile-Id 헤더가 붙습니다 (/journal/admin/profiles/{id}로 조회).
+    대상이 아닌 요청은 헤더 조회 한 번 외에 추가 작업이 없습니다.
+    """
+
+    def __init__(self, app, token: str = PROFILING_TOKEN, sample_rate: float = PROFILING_SAMPLE_RATE, paths=None):
+        self.app = app
+        self.token = token.encode() if token else None
+        self.sample_rate = sample_rate
+        self.paths = tuple(paths if paths is not None else PROFILING_PATHS)
+
+    def _reason(self, scope):
+        if self.token is not None:
+            for name, value in scope["headers"]:
+                if name == HEADER_NAME:
+                    return "header" if hmac.compare_digest(value, self.token) else None
+        if self.sample_rate > 0 and scope["path"].startswith(self.paths) and random.random() < self.sample_rate:
+            return "sampled"
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        reason = self._reason(scope)
+        if reason is None:
+            await self.app(scope, receive, send)
+            return
+
+        session = request_profiler.start(scope["method"], scope["path"], reason)
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [(b"x-profile-id", session.id.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_profiler.stop(session, status_code)
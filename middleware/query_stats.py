@@ -0,0 +1,68 @@
+import logging
+
+from opentelemetry import trace
+
+from services.query_stats import begin_query_stats, current_query_stats, end_query_stats
+
+logger = logging.getLogger(__name__)
+
+
+def _record_on_span(stats):
+    span = trace.get_current_span()
+    if stats is not None and span.is_recording():
+        span.set_attribute("db.query_count", stats.count)
+        span.set_attribute("db.query_time_ms", round(stats.total_seconds * 1000, 2))
+
+
+class QueryStatsMiddleware:
+    """
+    요청별 SQL 수/시간을 집계하는 ASGI 미들웨어
+
+    - record_span: 서버 스팬에 db.query_count, db.query_time_ms 속성 추가 (TRACE_DB_SPANS=aggregate)
+      OpenTelemetry ASGI 미들웨어는 마지막 응답 본문을 보낼 때 서버 스팬을 끝내므로 그 직전에 기록합니다
+      (스트리밍 응답은 본문 전송 중 실행한 쿼리까지 포함).
+    - expose_headers: 응답 헤더 X-DB-Query-Count, X-DB-Query-Time-Ms (응답 시작까지 실행한 쿼리)
+    - warn_threshold: 요청 하나의 쿼리 수가 이 값을 넘으면 라우트와 함께 경고 로그 (0이면 끔)
+    """
+
+    def __init__(self, app, record_span: bool = False, expose_headers: bool = False, warn_threshold: int = 0):
+        self.app = app
+        self.record_span = record_span
+        self.expose_headers = expose_headers
+        self.warn_threshold = warn_threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        recorded = False
+
+        async def send_wrapper(message):
+            nonlocal recorded
+            if message["type"] == "http.response.start" and self.expose_headers:
+                stats = current_query_stats()
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-db-query-count", str(stats.count).encode()),
+                    (b"x-db-query-time-ms", f"{stats.total_seconds * 1000:.2f}".encode()),
+                ]
+            elif message["type"] == "http.response.body" and not message.get("more_body", False):
+                if self.record_span:
+                    _record_on_span(current_query_stats())
+                recorded = True
+            await send(message)
+
+        token = begin_query_stats()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            stats = end_query_stats(token)
+            if not recorded and self.record_span:
+                # 응답 전에 예외가 난 경우 (서버 스팬은 아직 열려 있음)
+                _record_on_span(stats)
+            if self.warn_threshold and stats.count > self.warn_threshold:
+                route = getattr(scope.get("route"), "path", scope["path"])
+                logger.warning(
+                    f"요청 하나에서 SQL {stats.count}개 실행 ({stats.total_seconds * 1000:.0f}ms): "
+                    f"{scope['method']} {route}"
+                )
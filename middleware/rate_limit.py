@@ -0,0 +1,185 @@
+import json
+import logging
+import re
+from typing import Optional
+from urllib.parse import parse_qsl
+
+from starlette.concurrency import run_in_threadpool
+
+from config import RATE_LIMIT_AI_PATHS, RATE_LIMIT_EXEMPT_PATHS, TRUSTED_PROXY_HOPS
+from services.metrics import RATE_LIMITED_REQUESTS
+from services.rate_limit import AI_IP_POLICY, AI_POLICY, DEFAULT_POLICY, rate_limit_backend
+
+logger = logging.getLogger(__name__)
+
+# 본문에서 user_id를 찾는 최대 크기 (AI 경로의 JSON 요청만)
+MAX_BODY_FOR_USER_ID = 64 * 1024
+# 경로에 user_id가 들어가는 라우트 (GET /journal/summary/{user_id}, /journal/summary/check/{user_id})
+USER_ID_PATH = re.compile(r"^/journal/summary/(?:check/)?([^/]+)$")
+
+
+class RateLimitMiddleware:
+    """
+    사용자별 토큰 버킷 속도 제한 ASGI 미들웨어
+
+    - AI 경로(RATE_LIMIT_AI_PATHS, Agent API를 부르는 /process, /summary)는 경로별로 RATE_LIMIT_AI,
+      나머지 /journal 요청은 사용자당 하나의 버킷으로 RATE_LIMIT_DEFAULT 한도를 적용합니다.
+    - 사용자는 user_id 쿼리, 경로(/summary/{user_id}), AI 경로 JSON 본문의 user_id 순으로 찾고
+      없으면 클라이언트 IP(X-Forwarded-For의 뒤에서 TRUSTED_PROXY_HOPS번째 값)로 구분합니다.
+    - user_id는 클라이언트가 보내는 값이므로 AI 경로에는 클라이언트 IP별 버킷(RATE_LIMIT_AI_IP)도 함께 적용합니다.
+    - 한도를 넘으면 429 + Retry-After, 모든 응답에 RateLimit-Limit/Remaining/Reset, RateLimit-Policy 헤더
+    - 공유 백엔드(redis)에 연결할 수 없으면 요청을 막지 않고 통과시킵니다 (fail open).
+    """
+
+    def __init__(self, app, backend=None, ai_policy=None, default_policy=None, ai_ip_policy=None):
+        self.app = app
+        self.backend = backend or rate_limit_backend
+        self.ai_policy = ai_policy or AI_POLICY
+        self.ai_ip_policy = ai_ip_policy or AI_IP_POLICY
+        self.default_policy = default_policy or DEFAULT_POLICY
+        self.ai_paths = tuple(path for path in RATE_LIMIT_AI_PATHS if path)
+        self.exempt_paths = tuple(path for path in RATE_LIMIT_EXEMPT_PATHS if path)
+
+    async def __call__(self, scope, receive, send):
+        path = scope.get("path", "")
+        if scope["type"] != "http" or scope["method"] == "OPTIONS" or path.startswith(self.exempt_paths):
+            await self.app(scope, receive, send)
+            return
+
+        ai_path = next((prefix for prefix in self.ai_paths if path.startswith(prefix)), None)
+        if ai_path and path.startswith(ai_path + "/check/"):
+            ai_path = None  # 요약 존재 확인(/summary/check/{user_id})은 Agent API를 부르지 않음
+        policy = self.ai_policy if ai_path else self.default_policy
+
+        user = _user_from_query(scope) or _user_from_path(path)
+        if user is None and ai_path and scope["method"] == "POST":
+            body, receive = await _buffer_body(receive)
+            user = _user_from_json(body)
+        buckets = []
+        if user is None:
+            user = "ip:" + client_ip(scope)
+        elif ai_path:
+            # user_id를 바꿔 가며 보내도 같은 IP의 AI 요청은 이 버킷 한도를 넘지 못함
+            buckets.append((f"{ai_path}:ai_ip:{client_ip(scope)}", self.ai_ip_policy))
+        buckets.append((f"{ai_path or policy.name}:{user}", policy))
+
+        try:
+            allowed, tokens, policy = await self._acquire(buckets)
+        except Exception as e:
+            logger.warning(f"속도 제한 백엔드 오류 - 제한 없이 통과: {e}")
+            await self.app(scope, receive, send)
+            return
+
+        headers = [
+            (b"ratelimit-limit", policy.limit_header),
+            (b"ratelimit-remaining", str(int(tokens)).encode()),
+            (b"ratelimit-reset", str(policy.reset_after(tokens)).encode()),
+            (b"ratelimit-policy", policy.policy_header),
+        ]
+
+        if not allowed:
+            RATE_LIMITED_REQUESTS.labels(policy.name).inc()
+            body = json.dumps({"detail": "요청이 너무 많습니다. 잠시 후 다시 시도하세요"}, ensure_ascii=False).encode("utf-8")
+            headers += [
+                (b"retry-after", str(policy.retry_after(tokens)).encode()),
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ]
+            await send({"type": "http.response.start", "status": 429, "headers": headers})
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + headers
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def _acquire(self, buckets):
+        """
+        모든 버킷에서 토큰을 가져옵니다.
+
+        Returns:
+            (허용 여부, 남은 토큰, 정책): 거절한 버킷, 모두 허용하면 남은 토큰이 가장 적은 버킷 기준
+        """
+        result = None
+        for key, policy in buckets:
+            if self.backend.blocking:
+                allowed, tokens = await run_in_threadpool(self.backend.acquire, key, policy)
+            else:
+                allowed, tokens = self.backend.acquire(key, policy)
+            if not allowed:
+                return False, tokens, policy
+            if result is None or tokens < result[1]:
+                result = (True, tokens, policy)
+        return result
+
+
+def _user_from_query(scope) -> Optional[str]:
+    query_string = scope.get("query_string", b"")
+    if b"user_id" not in query_string and b"%" not in query_string:
+        return None
+    # 라우터(Starlette QueryParams)와 같은 방식으로 파싱 - 같은 키가 여러 번이면 마지막 값
+    user = None
+    for name, value in parse_qsl(query_string.decode("latin-1"), keep_blank_values=True):
+        if name == "user_id":
+            user = value
+    return user or None
+
+
+def _user_from_path(path: str) -> Optional[str]:
+    match = USER_ID_PATH.match(path)
+    return match.group(1) if match else None
+
+
+def _user_from_json(body: bytes) -> Optional[str]:
+    if not body or len(body) > MAX_BODY_FOR_USER_ID:
+        return None
+    try:
+        user_id = json.loads(body).get("user_id")
+    except (ValueError, AttributeError):
+        return None
+    return str(user_id) if user_id else None
+
+
+async def _buffer_body(receive):
+    """본문을 모두 읽고, 하위 앱에 같은 본문을 다시 전달하는 receive를 반환합니다."""
+    body = b""
+    more_body = True
+    while more_body:
+        message = await receive()
+        body += message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+    body_sent = False
+
+    async def replay_receive():
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+
+    return body, replay_receive
+
+
+def client_ip(scope) -> str:
+    """
+    요청한 클라이언트 IP
+
+    프록시는 X-Forwarded-For 끝에 자신이 본 주소를 덧붙이므로, 신뢰하는 프록시(TRUSTED_PROXY_HOPS)가
+    붙인 뒤에서 N번째 값이 실제 클라이언트입니다. 그보다 앞쪽 값은 클라이언트가 보낸 헤더라 믿지 않습니다.
+    """
+    if TRUSTED_PROXY_HOPS > 0:
+        entries = [
+            entry.strip()
+            for name, value in scope.get("headers", []) if name == b"x-forwarded-for"
+            for entry in value.decode("latin-1").split(",")
+        ]
+        entries = [entry for entry in entries if entry]
+        if entries:
+            # 값이 N개보다 적으면 앞쪽 프록시를 거치지 않은 요청 - 모두 신뢰하는 프록시가 붙인 값
+            return entries[-min(TRUSTED_PROXY_HOPS, len(entries))]
+    client = scope.get("client")
+    return client[0] if client else "unknown"
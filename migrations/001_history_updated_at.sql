@@ -0,0 +1,5 @@
+-- History.updated_at 추가 (ETag / 조건부 GET용)
+-- 기존 행은 마이그레이션 시점 시간으로 채워집니다.
+ALTER TABLE history ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now();
+
+CREATE INDEX IF NOT EXISTS idx_history_user_updated ON history(user_id, updated_at);
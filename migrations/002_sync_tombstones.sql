@@ -0,0 +1,10 @@
+-- 변경 피드(/sync)용 updated_at / 삭제 표시(deleted_at) 컬럼과 (user_id, updated_at, id) 인덱스
+ALTER TABLE history ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMP WITH TIME ZONE;
+
+ALTER TABLE messages ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now();
+ALTER TABLE messages ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMP WITH TIME ZONE;
+
+-- 001의 (user_id, updated_at) 인덱스를 keyset 페이지네이션용 (user_id, updated_at, id)로 교체
+DROP INDEX IF EXISTS idx_history_user_updated;
+CREATE INDEX IF NOT EXISTS idx_history_user_updated ON history(user_id, updated_at, id);
+CREATE INDEX IF NOT EXISTS idx_messages_user_updated ON messages(user_id, updated_at, id);
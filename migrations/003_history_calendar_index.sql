@@ -0,0 +1,8 @@
+-- 캘린더 (/history/calendar) index-only scan용 커버링 인덱스
+-- 운영 DB에서는 쓰기 잠금을 피하도록 CONCURRENTLY로 생성 (트랜잭션 블록 밖에서 실행)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_history_calendar
+    ON history(user_id, record_date) INCLUDE (tags, s3_key)
+    WHERE deleted_at IS NULL;
+
+-- index-only scan은 visibility map이 최신이어야 heap을 건너뛸 수 있음
+VACUUM (ANALYZE) history;
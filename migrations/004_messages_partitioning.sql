@@ -0,0 +1,55 @@
+-- messages를 created_at 월 단위 범위 파티션 테이블로 전환 (KST 월 경계)
+-- 파티션 테이블의 기본키에는 파티션 키가 포함되어야 하므로 기본키는 (id, created_at)
+-- 쓰기를 멈춘 점검 시간에 실행하세요 (전체 복사). 이미 파티션 테이블이면 아무것도 하지 않습니다.
+DO $$
+DECLARE
+    first_month date;
+    last_month date;
+    m date;
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('messages')) THEN
+        RAISE NOTICE 'messages는 이미 파티션 테이블입니다';
+        RETURN;
+    END IF;
+
+    CREATE TABLE messages_partitioned (
+        id UUID NOT NULL,
+        user_id VARCHAR(255) NOT NULL,
+        content TEXT NOT NULL,
+        created_at TIMESTAMP WITH TIME ZONE NOT NULL,
+        updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+        deleted_at TIMESTAMP WITH TIME ZONE
+    ) PARTITION BY RANGE (created_at);
+
+    SELECT date_trunc('month', min(created_at) AT TIME ZONE 'Asia/Seoul')::date INTO first_month FROM messages;
+    first_month := coalesce(first_month, date_trunc('month', now() AT TIME ZONE 'Asia/Seoul')::date);
+    last_month := (date_trunc('month', now() AT TIME ZONE 'Asia/Seoul') + interval '2 months')::date;
+
+    m := first_month;
+    WHILE m <= last_month LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF messages_partitioned FOR VALUES FROM (%L) TO (%L)',
+            'messages_' || to_char(m, 'YYYY_MM'),
+            (m::timestamp AT TIME ZONE 'Asia/Seoul'),
+            ((m + interval '1 month')::timestamp AT TIME ZONE 'Asia/Seoul')
+        );
+        m := (m + interval '1 month')::date;
+    END LOOP;
+    CREATE TABLE messages_default PARTITION OF messages_partitioned DEFAULT;
+
+    INSERT INTO messages_partitioned (id, user_id, content, created_at, updated_at, deleted_at)
+    SELECT id, user_id, content, created_at, updated_at, deleted_at FROM messages;
+
+    DROP TABLE messages;
+    ALTER TABLE messages_partitioned RENAME TO messages;
+
+    -- 인덱스는 복사 후 생성 (부모에 만들면 모든 파티션에 전파됨)
+    ALTER TABLE messages ADD CONSTRAINT messages_pkey PRIMARY KEY (id, created_at);
+    CREATE INDEX ix_messages_id ON messages(id);
+    CREATE INDEX ix_messages_user_id ON messages(user_id);
+    CREATE INDEX idx_messages_user_updated ON messages(user_id, updated_at, id);
+    CREATE INDEX idx_messages_user_date ON messages(user_id, created_at);
+    CREATE INDEX idx_messages_created_at ON messages(created_at);
+END $$;
+
+ANALYZE messages;
@@ -0,0 +1,2 @@
+-- 요약된 날의 원본 메시지를 history에 압축 보관 (JSONB는 TOAST로 자동 압축됨)
+ALTER TABLE history ADD COLUMN IF NOT EXISTS raw_messages JSONB;
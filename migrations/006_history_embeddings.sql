@@ -0,0 +1,12 @@
+-- 의미 검색(/history/search/semantic)용 History 임베딩 (float16 bytea, 기록당 1행)
+CREATE TABLE IF NOT EXISTS history_embeddings (
+    history_id BIGINT PRIMARY KEY REFERENCES history(id) ON DELETE CASCADE,
+    user_id VARCHAR(255) NOT NULL,
+    model VARCHAR(64) NOT NULL,
+    vector BYTEA NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_history_embeddings_user ON history_embeddings(user_id, history_id);
+
+-- 기존 기록 임베딩은 이 파일 적용 후 python -m scripts.backfill_embeddings로 계산
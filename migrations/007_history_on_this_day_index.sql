@@ -0,0 +1,9 @@
+-- 이 날의 기록 (/history/on-this-day) - 해마다 같은 월/일 기록을 한 번에 찾는 표현식 인덱스
+-- 조회 조건이 같은 표현식(EXTRACT(month/day FROM record_date))이어야 인덱스를 사용함
+-- 운영 DB에서는 쓰기 잠금을 피하도록 CONCURRENTLY로 생성 (트랜잭션 블록 밖에서 실행)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_history_user_month_day
+    ON history(user_id, EXTRACT(month FROM record_date), EXTRACT(day FROM record_date))
+    WHERE deleted_at IS NULL;
+
+-- 표현식 인덱스는 ANALYZE 후에 표현식 통계가 생김
+ANALYZE history;
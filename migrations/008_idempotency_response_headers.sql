@@ -0,0 +1,3 @@
+-- Idempotency-Key 재전송 시 ETag 등 응답 헤더도 함께 돌려주도록 저장
+-- (이 컬럼 전에 저장된 응답은 Content-Type만 재전송)
+ALTER TABLE idempotency_keys ADD COLUMN IF NOT EXISTS response_headers JSONB;
@@ -0,0 +1,7 @@
+-- 004 적용 시 빠졌던 messages 인덱스를 파티션 인덱스로 다시 생성
+-- (사용자-하루 조회: 요약, compact_day, archive_day). 이미 있으면 아무것도 하지 않습니다.
+-- 파티션 테이블 부모에는 CONCURRENTLY를 쓸 수 없어 생성 중 쓰기가 잠기므로 점검 시간에 실행하세요.
+CREATE INDEX IF NOT EXISTS idx_messages_user_date ON messages(user_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_messages_created_at ON messages(created_at);
+
+ANALYZE messages;
@@ -1,8 +1,33 @@
-from sqlalchemy import Column, Integer, String, Text, Date, BigInteger, ARRAY
+from sqlalchemy import Column, Integer, String, Text, Date, DateTime, BigInteger, ARRAY, Index, func, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import deferred
 from database import Base
 
 class History(Base):
     __tablename__ = "history"
+    __table_args__ = (
+        # 사용자별 하루 1건 (bulk import의 ON CONFLICT 대상)
+        Index("idx_history_user_date", "user_id", "record_date", unique=True),
+        # 사용자별 버전 조회 (ETag), 변경 피드 (/sync) 범위 스캔
+        Index("idx_history_user_updated", "user_id", "updated_at", "id"),
+        # 캘린더 (/history/calendar) index-only scan용 커버링 인덱스 - content를 읽지 않음
+        Index(
+            "idx_history_calendar", "user_id", "record_date",
+            postgresql_include=["tags", "s3_key"],
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        # 이 날의 기록 (/history/on-this-day) - 해마다 같은 월/일 기록을 한 번에 찾는 표현식 인덱스
+        # 조회 조건도 extract('month'/'day', record_date)로 같은 표현식을 써야 이 인덱스를 탐
+        Index(
+            "idx_history_user_month_day",
+            "user_id",
+            text("EXTRACT(month FROM record_date)"),
+            text("EXTRACT(day FROM record_date)"),
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+    )
+    # updated_at(DB 시간)을 INSERT/UPDATE ... RETURNING으로 함께 받아 refresh 없이 사용
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(BigInteger, primary_key=True, autoincrement=True, index=True)
     user_id = Column(String(255), index=True, nullable=False)
@@ -10,4 +35,8 @@ class History(Base):
     record_date = Column(Date, nullable=False)
     tags = Column(ARRAY(Text), nullable=True)
     s3_key = Column(Text, nullable=True)  # 이미지 주소
-    text_url = Column(Text, nullable=True)  # 텍스트 파일 주소
\ No newline at end of file
+    text_url = Column(Text, nullable=True)  # 텍스트 파일 주소
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    deleted_at = Column(DateTime(timezone=True), nullable=True)  # 삭제 표시 (tombstone)
+    # 요약된 날의 원본 메시지 [{"id", "content", "created_at"}, ...] - 필요할 때만 읽도록 지연 로딩
+    raw_messages = deferred(Column(JSONB, nullable=True))
\ No newline at end of file
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, String, BigInteger, LargeBinary, DateTime, ForeignKey, Index, func
+from database import Base
+
+class HistoryEmbedding(Base):
+    """History.content 임베딩 (의미 검색용, 기록당 1행)"""
+    __tablename__ = "history_embeddings"
+    __table_args__ = (
+        # 사용자 인덱스 로딩 (user_id로 모든 벡터 읽기)
+        Index("idx_history_embeddings_user", "user_id", "history_id"),
+    )
+
+    # 기록이 영구 삭제(purge_tombstones)되면 함께 삭제
+    history_id = Column(BigInteger, ForeignKey("history.id", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(String(255), nullable=False)
+    model = Column(String(64), nullable=False)  # 임베딩 방식과 차원 (예: "hash-ngram-256") - 바뀌면 다시 계산
+    vector = Column(LargeBinary, nullable=False)  # float16 배열 (little-endian, 차원 * 2바이트)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
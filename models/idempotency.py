@@ -0,0 +1,18 @@
+from sqlalchemy import Column, String, Integer, Text, DateTime
+from sqlalchemy.dialects.postgresql import JSONB
+from datetime import datetime, timezone
+from database import Base
+
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+    
+    key = Column(String(255), primary_key=True)  # Idempotency-Key 헤더 값
+    scope = Column(String(255), primary_key=True)  # "POST /journal/messages {요청자 해시}" - 키는 사용자별
+    request_hash = Column(String(64), nullable=False)  # 요청 본문 SHA-256
+    status = Column(String(16), nullable=False, default="processing")  # processing | completed
+    status_code = Column(Integer, nullable=True)
+    content_type = Column(String(255), nullable=True)
+    response_body = Column(Text, nullable=True)
+    response_headers = Column(JSONB, nullable=True)  # 재전송할 응답 헤더 [[이름, 값], ...] (ETag, Location 등)
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
+    expires_at = Column(DateTime(timezone=True), index=True, nullable=False)
\ No newline at end of file
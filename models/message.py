@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, Text
+from sqlalchemy import Column, String, DateTime, Text, Index, func
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime
 from database import Base
@@ -6,8 +6,23 @@ import uuid
 
 class Message(Base):
     __tablename__ = "messages"
+    __table_args__ = (
+        # 변경 피드 (/sync) 범위 스캔
+        Index("idx_messages_user_updated", "user_id", "updated_at", "id"),
+        # 사용자-하루 메시지 조회 (요약, compact_day, archive_day)
+        Index("idx_messages_user_date", "user_id", "created_at"),
+        # 날짜 범위 조회 (사용자 구분 없이)
+        Index("idx_messages_created_at", "created_at"),
+        # created_at 월 단위 범위 파티션 (파티션은 services.message_partitions.ensure_partitions가 생성)
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+    # updated_at(DB 시간)을 INSERT/UPDATE ... RETURNING으로 함께 받아 refresh 없이 사용
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     user_id = Column(String(255), index=True, nullable=False)
     content = Column(Text, nullable=False)
-    created_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
\ No newline at end of file
+    # 파티션 키는 기본키에 포함되어야 함 - 기본키는 (id, created_at)
+    created_at = Column(DateTime(timezone=True), primary_key=True, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    deleted_at = Column(DateTime(timezone=True), nullable=True)  # 삭제 표시 (tombstone)
\ No newline at end of file
@@ -0,0 +1,38 @@
+import hmac
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from config import PROFILING_TOKEN
+from services.profiler import request_profiler
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+def _authorize(token: Optional[str]):
+    # 토큰이 설정되지 않았으면 관리자 엔드포인트 비활성화
+    if not PROFILING_TOKEN or token is None or not hmac.compare_digest(token, PROFILING_TOKEN):
+        raise HTTPException(status_code=403, detail="관리자 토큰이 올바르지 않습니다")
+
+
+@router.get("/profiles")
+def list_profiles(x_profile_token: Optional[str] = Header(None)):
+    """
+    최근 요청 프로파일 목록 (최신순, 최대 PROFILING_BUFFER_SIZE개)
+    """
+    _authorize(x_profile_token)
+    return {"profiles": request_profiler.list()}
+
+
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+def get_profile(profile_id: str, x_profile_token: Optional[str] = Header(None)):
+    """
+    요청 프로파일의 collapsed stacks ("프레임;프레임;... 샘플수" 한 줄씩)
+    flamegraph.pl이나 speedscope에 그대로 넣어 플레임 그래프로 볼 수 있습니다.
+    """
+    _authorize(x_profile_token)
+    session = request_profiler.get(profile_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="프로파일을 찾을 수 없습니다 (링 버퍼에서 밀려났을 수 있음)")
+    return PlainTextResponse(session.collapsed(), headers={"X-Profile-Duration-Ms": str(session.duration_ms)})
@@ -70,14 +70,15 @@ def process_with_agent(request: AgentRequest, db: Session = Depends(get_db)):
                 content=request.content
             )
             db.add(db_message)
+            db.flush()
+            message_id = str(db_message.id)
             db.commit()
-            db.refresh(db_message)
             
             return AgentResponse(
                 type="data",
                 content="",
                 message="메시지가 저장되었습니다.",
-                history_id=str(db_message.id)
+                history_id=message_id
             )
         
         elif result_type == "answer":
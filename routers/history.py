@@ -1,26 +1,116 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, undefer
 from typing import List, Optional
-from datetime import date
+from datetime import date, datetime
 import logging
 
 from database import get_db
 from models.history import History
-from schemas.history import HistoryCreate, HistoryResponse
+from schemas.history import (
+    HistoryCalendarResponse,
+    HistoryCreate,
+    HistoryFieldsResponse,
+    HistoryMessagesResponse,
+    HistoryOnThisDayResponse,
+    HistoryResponse,
+    HistorySemanticSearchResponse,
+)
 from services.s3 import s3_service
+from services.history_pack import encode_record_line, select_range
+from services.history_bulk import iter_history_ndjson, iter_ndjson_lines, upsert_history_rows
+from services.http_cache import conditional_response, history_item_etag, history_user_etag
+from services.history_cache import history_cache
+from services.fast_json import json_response, rows_to_dicts
+from services.message_compaction import compact_day_in_background, restore_day, today_kst
+from services.message_partitions import KST
+from services.on_this_day import RELATED_MAX
+from services.embeddings import embedder
+from services.semantic_search import backfill_embeddings, semantic_search
+from config import HISTORY_PREVIEW_MAX_LENGTH, MESSAGE_COMPACTION_ON_SAVE
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/history", tags=["history"])
 
+# bulk import 시 한 번의 INSERT에 담는 행 수
+IMPORT_BATCH_SIZE = 1000
+
+# 목록 조회 fields 파라미터로 선택할 수 있는 컬럼 (id는 항상 포함)
+SELECTABLE_FIELDS = {
+    "user_id": History.user_id,
+    "content": History.content,
+    "record_date": History.record_date,
+    "tags": History.tags,
+    "s3_key": History.s3_key,
+    "text_url": History.text_url,
+}
+# fields=summary: 캘린더/목록 화면용 (본문 제외)
+SUMMARY_FIELDS = ["record_date", "tags", "s3_key"]
+
+FIELDS_QUERY = Query(None, description="응답에 포함할 필드 (쉼표로 구분, 예: \"record_date,tags\" 또는 \"summary\")")
+PREVIEW_QUERY = Query(None, ge=1, le=HISTORY_PREVIEW_MAX_LENGTH, description="content 앞부분 미리보기 글자 수 (content_preview)")
+
+def _parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """fields 파라미터를 컬럼 이름 목록으로 변환합니다. 지정하지 않으면 None (전체 필드)."""
+    if fields is None:
+        return None
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    if names == ["summary"]:
+        return SUMMARY_FIELDS
+    unknown = [name for name in names if name != "id" and name not in SELECTABLE_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"알 수 없는 필드입니다: {', '.join(unknown)} (사용 가능: id, {', '.join(SELECTABLE_FIELDS)}, summary)"
+        )
+    return [name for name in names if name != "id"]
+
+def _fetch_history_page(db: Session, criteria: list, fields: Optional[str], preview: Optional[int], limit: int, offset: int, response: Optional[Response] = None):
+    """
+    목록 조회 공통 처리 (record_date 내림차순 페이지)
+    요청한 컬럼만 Core select로 튜플로 읽어 orjson으로 바로 직렬화합니다 (ORM 객체, response_model 재검증 없음).
+    preview는 SQL의 left()로 잘라서 가져옵니다.
+    """
+    names = _parse_fields(fields)
+    if names is None:
+        names = list(SELECTABLE_FIELDS)
+    columns = [History.id] + [SELECTABLE_FIELDS[name] for name in dict.fromkeys(names)]
+    if preview is not None:
+        columns.append(func.left(History.content, preview).label("content_preview"))
+    
+    result = db.execute(
+        select(*columns).where(*criteria).order_by(History.record_date.desc()).offset(offset).limit(limit)
+    )
+    return json_response(rows_to_dicts(result), response)
+
+def _commit_and_respond(db: Session, db_history: History) -> HistoryResponse:
+    """
+    변경 내용을 flush한 뒤 응답을 만들고 커밋합니다.
+    커밋하면 객체가 만료되어 응답 직렬화 때 SELECT가 다시 나가므로 (db.refresh와 같은 비용)
+    INSERT/UPDATE ... RETURNING(eager_defaults)으로 받은 값으로 커밋 전에 응답을 만듭니다.
+    """
+    db.flush()
+    response = HistoryResponse.model_validate(db_history)
+    db.commit()
+    return response
+
 @router.post("", response_model=HistoryResponse)
-def create_history(history: HistoryCreate, db: Session = Depends(get_db)):
+def create_history(history: HistoryCreate, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
     """
     새로운 기록을 저장하는 엔드포인트
     같은 날짜에 같은 사용자의 기록이 이미 있으면 덮어씁니다.
     DB와 S3에 동시에 저장됩니다.
+    MESSAGE_COMPACTION_ON_SAVE가 켜져 있으면 응답 후 그날의 메시지를 raw_messages로 압축합니다
+    (지난 날만 - 오늘(KST) 메시지는 GET /messages와 다시 요약하는 데 쓰이므로 정리 작업처럼 남겨 둠).
     """
-    # 같은 날짜, 같은 사용자의 기록이 있는지 확인
+    if MESSAGE_COMPACTION_ON_SAVE and history.record_date < today_kst():
+        background_tasks.add_task(compact_day_in_background, history.user_id, history.record_date)
+    
+    # 같은 날짜, 같은 사용자의 기록이 있는지 확인 (삭제된 기록 포함 - 유니크 제약 때문에 되살려서 사용)
     existing_history = db.query(History).filter(
         History.user_id == history.user_id,
         History.record_date == history.record_date
@@ -44,9 +134,8 @@ def create_history(history: HistoryCreate, db: Session = Depends(get_db)):
         existing_history.tags = history.tags
         existing_history.s3_key = history.s3_key  # 이미지 주소
         existing_history.text_url = text_url  # 텍스트 파일 URL
-        db.commit()
-        db.refresh(existing_history)
-        return existing_history
+        existing_history.deleted_at = None
+        return _commit_and_respond(db, existing_history)
     else:
         # 기존 기록이 없으면 새로 생성
         db_history = History(
@@ -58,16 +147,128 @@ def create_history(history: HistoryCreate, db: Session = Depends(get_db)):
             text_url=text_url  # 텍스트 파일 URL
         )
         db.add(db_history)
-        db.commit()
-        db.refresh(db_history)
-        return db_history
+        return _commit_and_respond(db, db_history)
+
+@router.get("/export")
+def export_history(user_id: str):
+    """
+    사용자의 전체 기록을 NDJSON으로 스트리밍하는 엔드포인트 (백업/마이그레이션용)
+    서버 사이드 커서로 읽으므로 기록 수와 관계없이 메모리 사용량이 일정합니다.
+    
+    - user_id: 사용자 ID (필수)
+    
+    각 라인: {"id", "user_id", "content", "record_date", "tags", "s3_key", "text_url"}
+    """
+    return StreamingResponse(
+        iter_history_ndjson(user_id),
+        media_type="application/x-ndjson"
+    )
 
-@router.get("/search", response_model=List[HistoryResponse])
+@router.post("/import", response_model=dict)
+async def import_history(
+    request: Request,
+    user_id: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    NDJSON 본문을 스트리밍으로 읽어 기록을 일괄 저장하는 엔드포인트
+    (user_id, record_date)가 같은 기록이 있으면 덮어씁니다. S3에는 쓰지 않습니다 (text_url 그대로 저장).
+    
+    - user_id: 지정하면 모든 라인의 user_id가 일치해야 합니다 (선택사항)
+    - 본문: /history/export 형식의 NDJSON (id는 무시)
+    
+    전체가 하나의 트랜잭션입니다. 한 줄이라도 잘못되면 아무것도 저장되지 않습니다.
+    """
+    imported = 0
+    line_no = 0
+    batch = {}
+    user_ids = set()
+    
+    try:
+        async for line in iter_ndjson_lines(request.stream()):
+            line_no += 1
+            try:
+                item = HistoryCreate.model_validate_json(line)
+            except ValidationError as e:
+                raise HTTPException(status_code=400, detail=f"{line_no}번째 줄 형식이 올바르지 않습니다: {e.errors()[0]['msg']}")
+            if user_id and item.user_id != user_id:
+                raise HTTPException(status_code=400, detail=f"{line_no}번째 줄의 user_id가 일치하지 않습니다")
+            
+            # 같은 배치 안에서 (user_id, record_date)가 중복되면 마지막 값만 사용 (ON CONFLICT 제약)
+            batch[(item.user_id, item.record_date)] = item.model_dump()
+            user_ids.add(item.user_id)
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                await run_in_threadpool(upsert_history_rows, db, list(batch.values()))
+                imported += len(batch)
+                batch = {}
+        
+        if batch:
+            await run_in_threadpool(upsert_history_rows, db, list(batch.values()))
+            imported += len(batch)
+        await run_in_threadpool(db.commit)
+    except Exception:
+        await run_in_threadpool(db.rollback)
+        raise
+    
+    # Core upsert는 Session 이벤트로 무효화되지 않으므로 캐시 전체를 비움 (가져오기는 드문 작업)
+    history_cache.clear()
+    # 같은 이유로 임베딩도 Session 이벤트 대신 가져온 사용자 단위로 계산
+    try:
+        await run_in_threadpool(backfill_embeddings, user_ids)
+    except Exception as e:
+        logger.error(f"가져온 기록 임베딩 계산 실패 (python -m scripts.backfill_embeddings로 재시도): {e}")
+    
+    logger.info(f"히스토리 가져오기 완료: {imported}건 ({line_no}줄)")
+    return {"imported": imported, "lines": line_no}
+
+@router.get("/search/semantic", response_model=List[HistorySemanticSearchResponse], response_model_exclude_unset=True)
+def semantic_search_history(
+    user_id: str,
+    q: str,
+    limit: int = Query(10, ge=1, le=100),
+    fields: Optional[str] = FIELDS_QUERY,
+    preview: Optional[int] = PREVIEW_QUERY,
+    db: Session = Depends(get_db)
+):
+    """
+    의미가 비슷한 기록을 찾는 엔드포인트 (키워드가 그대로 들어 있지 않아도 검색)
+    기록 저장 시 계산해 둔 content 임베딩과 검색어 임베딩의 코사인 유사도 순으로 반환합니다.
+    
+    - user_id: 사용자 ID (필수)
+    - q: 검색 문장 (필수)
+    - limit: 가져올 기록 수 (기본값: 10, 최대 100)
+    - fields: 응답에 포함할 필드 (선택사항, id와 score는 항상 포함)
+    - preview: content_preview 글자 수 (선택사항)
+    """
+    if embedder is None:
+        raise HTTPException(status_code=503, detail="의미 검색이 비활성화되어 있습니다 (EMBEDDING_PROVIDER=none)")
+    hits = semantic_search(db, user_id, q, limit)
+    if not hits:
+        return json_response([])
+    scores = dict(hits)
+    
+    names = _parse_fields(fields)
+    if names is None:
+        names = list(SELECTABLE_FIELDS)
+    columns = [History.id] + [SELECTABLE_FIELDS[name] for name in dict.fromkeys(names)]
+    if preview is not None:
+        columns.append(func.left(History.content, preview).label("content_preview"))
+    rows = rows_to_dicts(db.execute(
+        select(*columns).where(History.id.in_(scores), History.user_id == user_id, History.deleted_at.is_(None))
+    ))
+    for row in rows:
+        row["score"] = round(scores[row["id"]], 4)
+    rows.sort(key=lambda row: -row["score"])
+    return json_response(rows)
+
+@router.get("/search", response_model=List[HistoryFieldsResponse], response_model_exclude_unset=True)
 def search_history(
     user_id: str,
     q: str,
     limit: int = 100,
     offset: int = 0,
+    fields: Optional[str] = FIELDS_QUERY,
+    preview: Optional[int] = PREVIEW_QUERY,
     db: Session = Depends(get_db)
 ):
     """
@@ -78,21 +279,24 @@ def search_history(
     - q: 검색 키워드 (필수)
     - limit: 가져올 기록 수 (기본값: 100)
     - offset: 건너뛸 기록 수 (페이지네이션용, 기본값: 0)
+    - fields: 응답에 포함할 필드 (선택사항, id는 항상 포함)
+    - preview: content_preview 글자 수 (선택사항)
     """
-    query = db.query(History).filter(
+    criteria = [
         History.user_id == user_id,
-        History.content.ilike(f"%{q}%")
-    )
-    
-    history_records = query.order_by(History.record_date.desc()).offset(offset).limit(limit).all()
-    return history_records
+        History.content.ilike(f"%{q}%"),
+        History.deleted_at.is_(None)
+    ]
+    return _fetch_history_page(db, criteria, fields, preview, limit, offset)
 
-@router.get("/tags", response_model=List[HistoryResponse])
+@router.get("/tags", response_model=List[HistoryFieldsResponse], response_model_exclude_unset=True)
 def search_by_tags(
     user_id: str,
     tags: str,
     limit: int = 100,
     offset: int = 0,
+    fields: Optional[str] = FIELDS_QUERY,
+    preview: Optional[int] = PREVIEW_QUERY,
     db: Session = Depends(get_db)
 ):
     """
@@ -102,24 +306,27 @@ def search_by_tags(
     - tags: 태그 (쉼표로 구분, 예: "개발,학습") (필수)
     - limit: 가져올 기록 수 (기본값: 100)
     - offset: 건너뛸 기록 수 (페이지네이션용, 기본값: 0)
+    - fields: 응답에 포함할 필드 (선택사항, id는 항상 포함)
+    - preview: content_preview 글자 수 (선택사항)
     """
     tag_list = [tag.strip() for tag in tags.split(",")]
     
-    query = db.query(History).filter(
+    criteria = [
         History.user_id == user_id,
-        History.tags.overlap(tag_list)
-    )
-    
-    history_records = query.order_by(History.record_date.desc()).offset(offset).limit(limit).all()
-    return history_records
+        History.tags.overlap(tag_list),
+        History.deleted_at.is_(None)
+    ]
+    return _fetch_history_page(db, criteria, fields, preview, limit, offset)
 
-@router.get("/date-range", response_model=List[HistoryResponse])
+@router.get("/date-range", response_model=List[HistoryFieldsResponse], response_model_exclude_unset=True)
 def get_by_date_range(
     user_id: str,
     start_date: date,
     end_date: date,
     limit: int = 100,
     offset: int = 0,
+    fields: Optional[str] = FIELDS_QUERY,
+    preview: Optional[int] = PREVIEW_QUERY,
     db: Session = Depends(get_db)
 ):
     """
@@ -130,23 +337,85 @@ def get_by_date_range(
     - end_date: 종료 날짜 (YYYY-MM-DD) (필수)
     - limit: 가져올 기록 수 (기본값: 100)
     - offset: 건너뛸 기록 수 (페이지네이션용, 기본값: 0)
+    - fields: 응답에 포함할 필드 (선택사항, id는 항상 포함)
+    - preview: content_preview 글자 수 (선택사항)
     """
-    query = db.query(History).filter(
+    criteria = [
         History.user_id == user_id,
         History.record_date >= start_date,
-        History.record_date <= end_date
-    )
+        History.record_date <= end_date,
+        History.deleted_at.is_(None)
+    ]
+    return _fetch_history_page(db, criteria, fields, preview, limit, offset)
+
+def _parse_month(value: str) -> tuple:
+    try:
+        year, month = (int(v) for v in value.split("-"))
+        date(year, month, 1)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="월 형식이 올바르지 않습니다. YYYY-MM 형식을 사용하세요.")
+    return year, month
+
+def _iter_archive_export(user_id: str, months: list):
+    """월별 팩이 있으면 Range GET으로, 없으면 일별 객체로 NDJSON 라인을 생성합니다."""
+    for year, month in months:
+        pack_key = s3_service.generate_pack_key(user_id, year, month)
+        index = s3_service.read_pack_index(pack_key)
+        if index is not None:
+            byte_range = select_range(index)
+            if byte_range:
+                yield from s3_service.iter_object_range(pack_key, *byte_range)
+            continue
+        
+        # 아직 압축되지 않은 달 (진행 중인 달 등) - 일별 객체 읽기
+        for s3_key in s3_service.list_month_history_keys(user_id, year, month):
+            yield encode_record_line(s3_service.get_history_record(s3_key))
+
+@router.get("/archive/export")
+def export_history_archive(
+    user_id: str,
+    start_month: str,
+    end_month: str
+):
+    """
+    S3에 저장된 히스토리를 NDJSON으로 스트리밍하는 엔드포인트
+    월별 팩 객체가 있는 달은 팩에서 범위 읽기를 하므로 한 달에 GET 2회로 내보냅니다.
+    
+    - user_id: 사용자 ID (필수)
+    - start_month: 시작 월 (YYYY-MM) (필수)
+    - end_month: 종료 월 (YYYY-MM) (필수, 최대 10년)
     
-    history_records = query.order_by(History.record_date.desc()).offset(offset).limit(limit).all()
-    return history_records
+    각 라인: {"record_date": "...", "user_id": "...", "tags": [...], "content": "..."}
+    """
+    start_year, start_mon = _parse_month(start_month)
+    end_year, end_mon = _parse_month(end_month)
+    
+    months = []
+    year, month = start_year, start_mon
+    while (year, month) <= (end_year, end_mon):
+        months.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    
+    if not months:
+        raise HTTPException(status_code=400, detail="start_month는 end_month보다 이후일 수 없습니다")
+    if len(months) > 120:
+        raise HTTPException(status_code=400, detail="한 번에 최대 120개월까지 내보낼 수 있습니다")
+    
+    return StreamingResponse(
+        _iter_archive_export(user_id, months),
+        media_type="application/x-ndjson"
+    )
 
 @router.get("/tags/list", response_model=dict)
 def get_all_tags(
     user_id: str,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db)
 ):
     """
     사용자의 모든 태그 목록을 반환하는 엔드포인트
+    If-None-Match가 현재 ETag와 같으면 304를 반환합니다.
     
     - user_id: 사용자 ID (필수)
     
@@ -157,8 +426,15 @@ def get_all_tags(
             "count": 태그 개수
         }
     """
-    # 사용자의 모든 히스토리 조회
-    histories = db.query(History).filter(History.user_id == user_id).all()
+    not_modified = conditional_response(request, response, history_user_etag(db, user_id))
+    if not_modified:
+        return not_modified
+    
+    # 사용자의 모든 히스토리의 태그 컬럼만 조회
+    histories = db.query(History.tags).filter(
+        History.user_id == user_id,
+        History.deleted_at.is_(None)
+    ).all()
     
     # 모든 태그 수집 (중복 제거)
     all_tags = set()
@@ -175,18 +451,23 @@ def get_all_tags(
         "count": len(sorted_tags)
     }
 
-@router.get("", response_model=List[HistoryResponse])
+@router.get("", response_model=List[HistoryFieldsResponse], response_model_exclude_unset=True)
 def get_history(
+    request: Request,
+    response: Response,
     user_id: Optional[str] = None,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     tags: Optional[str] = None,
     limit: int = 100,
     offset: int = 0,
+    fields: Optional[str] = FIELDS_QUERY,
+    preview: Optional[int] = PREVIEW_QUERY,
     db: Session = Depends(get_db)
 ):
     """
     기록을 조회하는 엔드포인트
+    user_id를 지정하면 ETag를 반환하고, If-None-Match가 일치하면 304를 반환합니다.
     
     - user_id: 특정 사용자의 기록만 조회 (선택사항)
     - start_date: 시작 날짜 (선택사항)
@@ -194,24 +475,98 @@ def get_history(
     - tags: 태그로 필터링 (쉼표로 구분, 예: "개발,학습")
     - limit: 가져올 기록 수 (기본값: 100)
     - offset: 건너뛸 기록 수 (페이지네이션용, 기본값: 0)
+    - fields: 응답에 포함할 필드 (선택사항, 예: "summary" = record_date,tags,s3_key, id는 항상 포함)
+    - preview: content_preview 글자 수 (선택사항, SQL에서 잘라서 가져옴)
     """
-    query = db.query(History)
+    if user_id:
+        not_modified = conditional_response(request, response, history_user_etag(db, user_id))
+        if not_modified:
+            return not_modified
+    
+    criteria = [History.deleted_at.is_(None)]
     
     if user_id:
-        query = query.filter(History.user_id == user_id)
+        criteria.append(History.user_id == user_id)
     
     if start_date:
-        query = query.filter(History.record_date >= start_date)
+        criteria.append(History.record_date >= start_date)
     
     if end_date:
-        query = query.filter(History.record_date <= end_date)
+        criteria.append(History.record_date <= end_date)
     
     if tags:
         tag_list = [tag.strip() for tag in tags.split(",")]
-        query = query.filter(History.tags.overlap(tag_list))
+        criteria.append(History.tags.overlap(tag_list))
+    
+    return _fetch_history_page(db, criteria, fields, preview, limit, offset, response)
+
+@router.get("/calendar", response_model=HistoryCalendarResponse)
+def get_history_calendar(
+    user_id: str,
+    year: int = Query(..., ge=1900, le=9999),
+    month: int = Query(..., ge=1, le=12),
+    db: Session = Depends(get_db)
+):
+    """
+    월간 캘린더/히트맵용으로 기록이 있는 날짜 목록을 반환하는 엔드포인트
+    (user_id, record_date) INCLUDE (tags, s3_key) 인덱스만 읽으며 content는 조회하지 않습니다.
+    결과는 사용자-월 단위로 캐시되고 해당 월 기록이 바뀌면 무효화됩니다.
+    
+    - user_id: 사용자 ID (필수)
+    - year: 연도 (필수)
+    - month: 월 (1~12) (필수)
+    """
+    calendar = history_cache.get_calendar(db, user_id, year, month)
+    return HistoryCalendarResponse(user_id=user_id, year=year, month=month, **calendar)
+
+@router.get("/on-this-day", response_model=HistoryOnThisDayResponse, response_model_exclude_unset=True)
+def get_on_this_day(
+    request: Request,
+    response: Response,
+    user_id: str,
+    target_date: Optional[date] = Query(None, alias="date", description="기준 날짜 (기본값: 오늘, KST)"),
+    related: int = Query(5, ge=0, le=RELATED_MAX),
+    preview: Optional[int] = PREVIEW_QUERY,
+    db: Session = Depends(get_db)
+):
+    """
+    이 날의 기록: 이전 해들의 같은 월/일 기록과 태그가 겹치는 관련 기록을 한 번에 반환하는 엔드포인트
+    같은 월/일 기록은 (user_id, 월, 일) 표현식 인덱스 한 번으로 조회하고 (/date-range를 해마다 호출할 필요 없음),
+    결과는 사용자-날짜별로 캐시되어 기록이 바뀌기 전까지 다시 계산하지 않습니다.
     
-    history_records = query.order_by(History.record_date.desc()).offset(offset).limit(limit).all()
-    return history_records
+    - user_id: 사용자 ID (필수)
+    - date: 기준 날짜 (YYYY-MM-DD) (선택사항, 기본값: 오늘)
+    - related: 관련 기록 수 (기본값: 5, 최대 20, 0이면 생략)
+    - preview: content 대신 content_preview 글자 수 (선택사항)
+    """
+    target = target_date or datetime.now(KST).date()
+    # 날짜를 생략하면 같은 URL이 날마다 다른 결과이므로 ETag에 날짜를 넣음
+    etag = history_user_etag(db, user_id, target.isoformat())
+    not_modified = conditional_response(request, response, etag)
+    if not_modified:
+        return not_modified
+    
+    result = history_cache.get_on_this_day(db, user_id, target, etag)
+    same_day = result["same_day"]
+    if preview is not None:
+        same_day = [
+            {**{name: value for name, value in entry.items() if name != "content"}, "content_preview": entry["content"][:preview]}
+            for entry in same_day
+        ]
+    return json_response({
+        "user_id": user_id,
+        "date": target,
+        "same_day": same_day,
+        "related": result["related"][:related],
+    }, response)
+
+@router.get("/cache/stats", response_model=dict)
+def get_history_cache_stats():
+    """
+    History 단건 조회 캐시 지표 (적중률, 무효화/축출 횟수, 항목 수)
+    지표는 프로세스(워커)별로 집계됩니다.
+    """
+    return history_cache.stats()
 
 @router.get("/check-s3-by-date", response_model=dict)
 def check_s3_key_by_date(
@@ -230,10 +585,7 @@ def check_s3_key_by_date(
     except ValueError:
         raise HTTPException(status_code=400, detail="날짜 형식이 올바르지 않습니다. YYYY-MM-DD 형식을 사용하세요.")
     
-    history = db.query(History).filter(
-        History.user_id == user_id,
-        History.record_date == parsed_date
-    ).first()
+    history = history_cache.get_by_day(db, user_id, parsed_date)
     
     if not history:
         return {
@@ -245,28 +597,55 @@ def check_s3_key_by_date(
     
     return {
         "found": True,
-        "history_id": history.id,
-        "has_s3_key": history.s3_key is not None,
-        "s3_key": history.s3_key
+        "history_id": history["id"],
+        "has_s3_key": history["s3_key"] is not None,
+        "s3_key": history["s3_key"]
     }
 
 @router.get("/{history_id}", response_model=HistoryResponse)
-def get_history_by_id(history_id: int, db: Session = Depends(get_db)):
+def get_history_by_id(history_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
     """
     특정 ID의 기록을 조회하는 엔드포인트
+    캐시된 스냅샷으로 응답하며, If-None-Match가 현재 ETag와 같으면 304를 반환합니다.
     """
-    history = db.query(History).filter(History.id == history_id).first()
+    history = history_cache.get_by_id(db, history_id)
     if not history:
         raise HTTPException(status_code=404, detail="기록을 찾을 수 없습니다")
+    
+    not_modified = conditional_response(request, response, history_item_etag(history_id, history["updated_at"]))
+    if not_modified:
+        return not_modified
     return history
 
+@router.get("/{history_id}/messages", response_model=HistoryMessagesResponse)
+def get_history_messages(history_id: int, db: Session = Depends(get_db)):
+    """
+    요약된 날의 원본 메시지(raw_messages)를 조회하는 엔드포인트
+    메시지 압축(MESSAGE_COMPACTION_ON_SAVE 또는 scripts.compact_messages) 후 messages 테이블 대신 여기서 읽습니다.
+    """
+    history = db.query(History).options(undefer(History.raw_messages)).filter(
+        History.id == history_id,
+        History.deleted_at.is_(None)
+    ).first()
+    if not history:
+        raise HTTPException(status_code=404, detail="기록을 찾을 수 없습니다")
+    
+    messages = history.raw_messages or []
+    return HistoryMessagesResponse(
+        history_id=history.id,
+        user_id=history.user_id,
+        record_date=history.record_date,
+        messages=messages,
+        count=len(messages)
+    )
+
 @router.put("/{history_id}", response_model=HistoryResponse)
 def update_history(history_id: int, history: HistoryCreate, db: Session = Depends(get_db)):
     """
     기록을 수정하는 엔드포인트
     DB와 S3 파일을 모두 업데이트합니다.
     """
-    db_history = db.query(History).filter(History.id == history_id).first()
+    db_history = db.query(History).filter(History.id == history_id, History.deleted_at.is_(None)).first()
     if not db_history:
         raise HTTPException(status_code=404, detail="기록을 찾을 수 없습니다")
     
@@ -290,23 +669,21 @@ def update_history(history_id: int, history: HistoryCreate, db: Session = Depend
     db_history.s3_key = history.s3_key  # 이미지 주소
     db_history.text_url = text_url  # 텍스트 파일 URL
     
-    db.commit()
-    db.refresh(db_history)
-    return db_history
+    return _commit_and_respond(db, db_history)
 
 @router.get("/{history_id}/check-s3", response_model=dict)
 def check_s3_key(history_id: int, db: Session = Depends(get_db)):
     """
     특정 기록의 s3_key가 null인지 확인하는 엔드포인트
     """
-    history = db.query(History).filter(History.id == history_id).first()
+    history = history_cache.get_by_id(db, history_id)
     if not history:
         raise HTTPException(status_code=404, detail="기록을 찾을 수 없습니다")
     
     return {
         "history_id": history_id,
-        "has_s3_key": history.s3_key is not None,
-        "s3_key": history.s3_key
+        "has_s3_key": history["s3_key"] is not None,
+        "s3_key": history["s3_key"]
     }
 
 @router.get("/{history_id}/s3-content")
@@ -314,16 +691,16 @@ def get_history_s3_content(history_id: int, db: Session = Depends(get_db)):
     """
     S3에서 히스토리 파일 내용을 읽어오는 엔드포인트
     """
-    history = db.query(History).filter(History.id == history_id).first()
+    history = history_cache.get_by_id(db, history_id)
     if not history:
         raise HTTPException(status_code=404, detail="기록을 찾을 수 없습니다")
     
-    if not history.s3_key:
+    if not history["s3_key"]:
         raise HTTPException(status_code=404, detail="S3 파일이 없습니다")
     
     try:
-        content = s3_service.get_history_from_s3(history.s3_key)
-        return {"s3_key": history.s3_key, "content": content}
+        content = s3_service.get_history_from_s3(history["s3_key"])
+        return {"s3_key": history["s3_key"], "content": content}
     except Exception as e:
         logger.error(f"S3 읽기 실패: {e}")
         raise HTTPException(status_code=500, detail=f"S3에서 파일을 읽는 중 오류가 발생했습니다: {str(e)}")
@@ -336,23 +713,21 @@ def update_s3_key(history_id: int, s3_key: str, db: Session = Depends(get_db)):
     - history_id: 기록 ID
     - s3_key: 새로운 S3 이미지 URL
     """
-    db_history = db.query(History).filter(History.id == history_id).first()
+    db_history = db.query(History).filter(History.id == history_id, History.deleted_at.is_(None)).first()
     if not db_history:
         raise HTTPException(status_code=404, detail="기록을 찾을 수 없습니다")
     
     db_history.s3_key = s3_key
-    db.commit()
-    db.refresh(db_history)
-    return db_history
+    return _commit_and_respond(db, db_history)
 
 
 @router.delete("/{history_id}")
 def delete_history(history_id: int, db: Session = Depends(get_db)):
     """
     기록을 삭제하는 엔드포인트
-    DB와 S3 파일을 모두 삭제합니다.
+    S3 파일은 삭제하고, DB 행은 내용을 비운 삭제 표시(tombstone)로 남깁니다 (/sync 변경 피드용).
     """
-    db_history = db.query(History).filter(History.id == history_id).first()
+    db_history = db.query(History).filter(History.id == history_id, History.deleted_at.is_(None)).first()
     if not db_history:
         raise HTTPException(status_code=404, detail="기록을 찾을 수 없습니다")
     
@@ -376,7 +751,13 @@ def delete_history(history_id: int, db: Session = Depends(get_db)):
         except Exception as e:
             logger.warning(f"S3 이미지 파일 삭제 실패 (계속 진행): {e}")
     
-    # DB에서 삭제
-    db.delete(db_history)
+    # DB에서 삭제 (soft delete - 내용은 지우고 삭제 시간만 남김)
+    db_history.content = ""
+    db_history.tags = None
+    db_history.s3_key = None
+    db_history.text_url = None
+    # 압축된 원본 메시지는 messages로 되돌림 (요약만 삭제 - 다시 요약할 수 있도록)
+    restore_day(db, db_history)
+    db_history.deleted_at = func.now()
     db.commit()
     return {"message": "기록이 삭제되었습니다"}
\ No newline at end of file
@@ -1,12 +1,21 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import func, insert, select
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime, date, timezone, timedelta
 import uuid
 
 from database import get_db
+from services.fast_json import json_response, rows_to_dicts
 from models.message import Message
-from schemas.message import MessageCreate, MessageResponse, MessageContentResponse, MessageUpdate
+from schemas.message import (
+    MessageCreate,
+    MessageResponse,
+    MessageContentResponse,
+    MessageUpdate,
+    MessageBatchCreate,
+    MessageBatchResponse,
+)
 
 router = APIRouter(prefix="/messages", tags=["messages"])
 
@@ -24,7 +33,7 @@ def get_messages_content_only(
     - limit: 가져올 메시지 수 (기본값: 100)
     - offset: 건너뛸 메시지 수 (페이지네이션용, 기본값: 0)
     """
-    query = db.query(Message)
+    query = db.query(Message).filter(Message.deleted_at.is_(None))
     
     # 사용자별 필터링 (선택사항)
     if user_id:
@@ -70,19 +79,20 @@ def get_messages(
 ):
     """
     저장된 메시지를 가져오는 엔드포인트 (오늘 날짜만)
+    필요한 컬럼만 튜플로 읽어 orjson으로 바로 직렬화합니다 (UUID도 orjson이 문자열로 변환).
     
     - user_id: 특정 사용자의 메시지만 가져올 때 사용 (선택사항)
     - limit: 가져올 메시지 수 (기본값: 100)
     - offset: 건너뛸 메시지 수 (페이지네이션용, 기본값: 0)
     """
-    query = db.query(Message)
+    query = select(Message.id, Message.user_id, Message.content, Message.created_at).where(Message.deleted_at.is_(None))
     
     # 사용자별 필터링 (선택사항)
     if user_id:
-        query = query.filter(Message.user_id == user_id)
+        query = query.where(Message.user_id == user_id)
     
     # 모든 메시지를 가져온 후 Python에서 날짜 필터링
-    all_messages = query.order_by(Message.created_at.asc()).all()
+    all_messages = rows_to_dicts(db.execute(query.order_by(Message.created_at.asc())))
     
     # 한국 시간대 (KST, UTC+9)
     kst = timezone(timedelta(hours=9))
@@ -93,10 +103,10 @@ def get_messages(
     today_messages = []
     for msg in all_messages:
         # timezone-aware로 변환
-        if msg.created_at.tzinfo is None:
-            msg_dt = msg.created_at.replace(tzinfo=timezone.utc)
+        if msg["created_at"].tzinfo is None:
+            msg_dt = msg["created_at"].replace(tzinfo=timezone.utc)
         else:
-            msg_dt = msg.created_at
+            msg_dt = msg["created_at"]
         
         # 한국 시간으로 변환하여 날짜 비교
         msg_date_kst = msg_dt.astimezone(kst).date()
@@ -104,18 +114,7 @@ def get_messages(
             today_messages.append(msg)
     
     # 페이지네이션 적용
-    paginated_messages = today_messages[offset:offset + limit]
-    
-    # UUID를 문자열로 변환
-    return [
-        MessageResponse(
-            id=str(msg.id),
-            user_id=msg.user_id,
-            content=msg.content,
-            created_at=msg.created_at
-        )
-        for msg in paginated_messages
-    ]
+    return json_response(today_messages[offset:offset + limit])
 
 @router.post("", response_model=MessageResponse)
 def create_message(message: MessageCreate, db: Session = Depends(get_db)):
@@ -136,16 +135,52 @@ def create_message(message: MessageCreate, db: Session = Depends(get_db)):
         db_message.created_at = message.created_at
     
     db.add(db_message)
-    db.commit()
-    db.refresh(db_message)
+    db.flush()
     
-    # UUID를 문자열로 변환하여 반환
-    return MessageResponse(
+    # UUID를 문자열로 변환하여 반환 (커밋 후 만료된 객체를 다시 읽지 않도록 커밋 전에 응답 생성)
+    response = MessageResponse(
         id=str(db_message.id),
         user_id=db_message.user_id,
         content=db_message.content,
         created_at=db_message.created_at
     )
+    db.commit()
+    return response
+
+@router.post("/batch", response_model=MessageBatchResponse)
+def create_messages_batch(batch: MessageBatchCreate, db: Session = Depends(get_db)):
+    """
+    여러 메시지를 한 번에 저장하는 엔드포인트 (채팅 로그 가져오기, 오프라인 동기화용)
+    
+    - messages: MessageCreate 목록 (최대 MESSAGE_BATCH_MAX_SIZE건, 기본값 500)
+      - created_at을 보내면 그대로 저장, 없으면 현재 시간
+    
+    하나의 다중 행 INSERT ... RETURNING과 단일 트랜잭션으로 저장합니다.
+    전부 저장되거나 전부 실패합니다 (부분 저장 없음). 반환되는 ids는 요청 순서와 같습니다.
+    """
+    now = datetime.now(timezone.utc)
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "user_id": message.user_id,
+            "content": message.content,
+            "created_at": message.created_at or now,
+        }
+        for message in batch.messages
+    ]
+    
+    try:
+        result = db.execute(
+            insert(Message).returning(Message.id, sort_by_parameter_order=True),
+            rows
+        )
+        ids = [str(row.id) for row in result]
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    
+    return MessageBatchResponse(ids=ids, count=len(ids))
 
 @router.get("/{message_id}", response_model=MessageResponse)
 def get_message_by_id(message_id: str, db: Session = Depends(get_db)):
@@ -157,7 +192,7 @@ def get_message_by_id(message_id: str, db: Session = Depends(get_db)):
     except ValueError:
         raise HTTPException(status_code=400, detail="유효하지 않은 UUID 형식입니다")
     
-    message = db.query(Message).filter(Message.id == message_uuid).first()
+    message = db.query(Message).filter(Message.id == message_uuid, Message.deleted_at.is_(None)).first()
     if not message:
         raise HTTPException(status_code=404, detail="메시지를 찾을 수 없습니다")
     
@@ -178,21 +213,22 @@ def update_message(message_id: str, message_update: MessageUpdate, db: Session =
     except ValueError:
         raise HTTPException(status_code=400, detail="유효하지 않은 UUID 형식입니다")
     
-    db_message = db.query(Message).filter(Message.id == message_uuid).first()
+    db_message = db.query(Message).filter(Message.id == message_uuid, Message.deleted_at.is_(None)).first()
     if not db_message:
         raise HTTPException(status_code=404, detail="메시지를 찾을 수 없습니다")
     
     # content 업데이트
     db_message.content = message_update.content
-    db.commit()
-    db.refresh(db_message)
+    db.flush()
     
-    return MessageResponse(
+    response = MessageResponse(
         id=str(db_message.id),
         user_id=db_message.user_id,
         content=db_message.content,
         created_at=db_message.created_at
     )
+    db.commit()
+    return response
 
 @router.delete("/{message_id}")
 def delete_message(message_id: str, db: Session = Depends(get_db)):
@@ -204,10 +240,12 @@ def delete_message(message_id: str, db: Session = Depends(get_db)):
     except ValueError:
         raise HTTPException(status_code=400, detail="유효하지 않은 UUID 형식입니다")
     
-    db_message = db.query(Message).filter(Message.id == message_uuid).first()
+    db_message = db.query(Message).filter(Message.id == message_uuid, Message.deleted_at.is_(None)).first()
     if not db_message:
         raise HTTPException(status_code=404, detail="메시지를 찾을 수 없습니다")
     
-    db.delete(db_message)
+    # soft delete - 내용은 지우고 삭제 시간만 남김 (/sync 변경 피드용)
+    db_message.content = ""
+    db_message.deleted_at = func.now()
     db.commit()
     return {"message": "메시지가 삭제되었습니다"}
\ No newline at end of file
@@ -8,8 +8,8 @@ import httpx
 
 from database import get_db
 from models.message import Message
-from models.history import History
 from schemas.summary import SummaryRequest, SummaryResponse, SummaryExistsResponse
+from services.history_cache import history_cache
 from config import AGENT_API_URL
 
 logger = logging.getLogger(__name__)
@@ -41,29 +41,18 @@ async def _get_user_messages_summary(
         kst = timezone(timedelta(hours=9))
         target_date = datetime.now(kst).date()
     
-    # 모든 메시지를 가져온 후 날짜 필터링
-    all_messages = db.query(Message).filter(
+    # 한국 시간 기준 하루 범위로 DB에서 필터링 (파티션 프루닝 + 오래된 메시지가 많아도 오늘 메시지를 놓치지 않음)
+    kst = timezone(timedelta(hours=9))
+    day_start = datetime(target_date.year, target_date.month, target_date.day, tzinfo=kst)
+    filtered_messages = db.query(Message).filter(
         Message.user_id == user_id,
+        Message.created_at >= day_start,
+        Message.created_at < day_start + timedelta(days=1),
+        Message.deleted_at.is_(None),
         Message.content.isnot(None),
         Message.content != ""
     ).order_by(Message.created_at.asc()).limit(1000).all()
     
-    # 한국 시간대로 날짜 필터링
-    kst = timezone(timedelta(hours=9))
-    filtered_messages = []
-    
-    for msg in all_messages:
-        # timezone-aware로 변환
-        if msg.created_at.tzinfo is None:
-            msg_dt = msg.created_at.replace(tzinfo=timezone.utc)
-        else:
-            msg_dt = msg.created_at
-        
-        # 한국 시간으로 변환하여 날짜 비교
-        msg_date_kst = msg_dt.astimezone(kst).date()
-        if msg_date_kst == target_date:
-            filtered_messages.append(msg)
-    
     if not filtered_messages:
         raise HTTPException(status_code=404, detail="요약할 메시지가 없습니다")
     
@@ -206,18 +195,15 @@ async def check_today_summary_exists(
     today = date.today()
     
     # 오늘 날짜의 요약 조회
-    existing_summary = db.query(History).filter(
-        History.user_id == user_id,
-        History.record_date == today
-    ).first()
+    existing_summary = history_cache.get_by_day(db, user_id, today)
     
     if existing_summary:
         return SummaryExistsResponse(
             exists=True,
-            id=existing_summary.id,
-            record_date=existing_summary.record_date,
-            summary=existing_summary.content,
-            s3_key=existing_summary.s3_key
+            id=existing_summary["id"],
+            record_date=existing_summary["record_date"],
+            summary=existing_summary["content"],
+            s3_key=existing_summary["s3_key"]
         )
     else:
         return SummaryExistsResponse(
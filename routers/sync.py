@@ -0,0 +1,176 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+import base64
+import json
+import logging
+import uuid
+
+from database import get_db
+from models.history import History
+from models.message import Message
+from schemas.sync import (
+    SyncResponse,
+    SyncHistoryChanges,
+    SyncHistoryItem,
+    SyncMessageChanges,
+    SyncMessageItem,
+)
+from config import SYNC_PAGE_SIZE, SYNC_SAFETY_WINDOW_SECONDS, SYNC_TOMBSTONE_RETENTION_DAYS
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/sync", tags=["sync"])
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _to_micros(value: datetime) -> int:
+    return (value - _EPOCH) // timedelta(microseconds=1)
+
+
+def _from_micros(value: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=value)
+
+
+def _encode_token(positions: dict, issued_at: datetime) -> str:
+    # 발급 시각(t): 토큰 만료는 위치(마지막 변경 시각)가 아니라 마지막 동기화 시점으로 판단
+    # (변경이 오래 없던 사용자의 토큰도 계속 유효해야 함)
+    raw = json.dumps({"v": 1, "t": _to_micros(issued_at), **positions}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _is_micros(value) -> bool:
+    # bool은 int의 하위 타입이라 따로 제외
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _check_position(position, message: bool):
+    """토큰의 테이블 위치가 None 또는 [updated_at_micros, id]인지 확인합니다 (id는 히스토리 int, 메시지 UUID 문자열)."""
+    if position is None:
+        return None
+    if not isinstance(position, list) or len(position) != 2 or not _is_micros(position[0]):
+        raise ValueError
+    _from_micros(position[0])  # 범위 밖이면 OverflowError
+    if message:
+        if not isinstance(position[1], str):
+            raise ValueError
+        uuid.UUID(position[1])
+    elif not _is_micros(position[1]):
+        raise ValueError
+    return position
+
+
+def _decode_token(token: str) -> dict:
+    """
+    동기화 토큰을 테이블별 위치로 디코딩합니다.
+
+    Returns:
+        tuple: (발급 시각 micros | None, {"h": [updated_at_micros, id] | None, "m": [updated_at_micros, uuid] | None})
+        발급 시각이 없는 토큰은 이 필드 추가 전에 발급된 토큰입니다.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        data = json.loads(raw)
+        if data.get("v") != 1:
+            raise ValueError
+        issued_at = data.get("t")
+        if issued_at is not None and not _is_micros(issued_at):
+            raise ValueError
+        return issued_at, {"h": _check_position(data.get("h"), False), "m": _check_position(data.get("m"), True)}
+    except (ValueError, TypeError, AttributeError, OverflowError):
+        raise HTTPException(status_code=400, detail="유효하지 않은 동기화 토큰입니다")
+
+
+def _fetch_changes(db: Session, model, user_id: str, position, limit: int, cutoff: datetime, initial: bool):
+    """
+    (updated_at, id) keyset으로 position 이후 변경된 행을 가져옵니다.
+    initial이면 (since 없는 첫 동기화) 삭제 표시를 제외합니다.
+
+    다음 위치는 항상 안전 구간(cutoff) 이전의 마지막 행까지만 진행합니다. 안전 구간 안의 행은 반환하되
+    위치를 넘기지 않아, 늦게 커밋되어 더 이른 updated_at을 가진 트랜잭션도 다음 동기화에서 전달됩니다.
+    페이지가 꽉 찼어도 위치가 진행하지 않았으면(모두 안전 구간 안) has_more는 false입니다
+    - 같은 위치로 바로 다시 요청해도 같은 페이지만 오므로, 다음 주기 동기화에서 이어 받습니다.
+
+    Returns:
+        tuple: (행 목록, 다음 위치, 더 있는지 여부)
+    """
+    query = select(model).where(model.user_id == user_id)
+    if position:
+        position_id = uuid.UUID(position[1]) if model is Message else position[1]
+        query = query.where(tuple_(model.updated_at, model.id) > tuple_(_from_micros(position[0]), position_id))
+    if initial:
+        # 첫 동기화에서는 삭제 표시를 보낼 필요가 없음
+        query = query.where(model.deleted_at.is_(None))
+
+    rows = db.execute(
+        query.order_by(model.updated_at, model.id).limit(limit + 1)
+    ).scalars().all()
+    full = len(rows) > limit
+    rows = rows[:limit]
+
+    next_position = position
+    for row in rows:
+        # updated_at 순서이므로 cutoff 이전 행은 앞쪽에 모여 있음
+        if row.updated_at > cutoff:
+            break
+        next_position = [_to_micros(row.updated_at), str(row.id) if model is Message else row.id]
+    return rows, next_position, full and next_position != position
+
+
+@router.get("", response_model=SyncResponse)
+def sync_changes(
+    user_id: str,
+    since: Optional[str] = Query(None, description="이전 응답의 next_token (없으면 처음부터)"),
+    limit: int = Query(SYNC_PAGE_SIZE, ge=1, le=1000, description="테이블별 최대 행 수"),
+    db: Session = Depends(get_db)
+):
+    """
+    since 토큰 이후 변경/삭제된 히스토리와 메시지를 반환하는 변경 피드 엔드포인트
+    (user_id, updated_at, id) 인덱스 범위 스캔 한 번씩으로 처리합니다.
+
+    - user_id: 사용자 ID (필수)
+    - since: 이전 응답의 next_token (첫 동기화는 생략 - 삭제되지 않은 전체 행 반환)
+    - limit: 테이블별 최대 행 수 (기본값: 500)
+
+    클라이언트는 id 기준으로 changed는 upsert, deleted는 삭제하고 next_token을 저장합니다.
+    has_more가 true면 next_token으로 바로 다시 요청합니다.
+    최근 SYNC_SAFETY_WINDOW_SECONDS 안의 변경은 다음 동기화에서 한 번 더 올 수 있습니다 (id로 중복 제거).
+    토큰 발급 후 삭제 표시 보관 기간이 지나면 410을 반환합니다 (그 사이 삭제 표시가 정리되었을 수 있으므로
+    since 없이 전체 동기화 필요). 변경이 오래 없던 사용자라도 주기적으로 동기화하면 토큰은 만료되지 않습니다.
+    """
+    initial = since is None
+    issued_at, positions = (None, {"h": None, "m": None}) if initial else _decode_token(since)
+
+    now = db.execute(select(func.now())).scalar_one()
+    retention_start = now - timedelta(days=SYNC_TOMBSTONE_RETENTION_DAYS)
+    if issued_at is not None and _from_micros(issued_at) < retention_start:
+        raise HTTPException(status_code=410, detail="동기화 토큰이 만료되었습니다. since 없이 전체 동기화하세요.")
+
+    cutoff = now - timedelta(seconds=SYNC_SAFETY_WINDOW_SECONDS)
+    histories, history_position, history_more = _fetch_changes(db, History, user_id, positions["h"], limit, cutoff, initial)
+    messages, message_position, message_more = _fetch_changes(db, Message, user_id, positions["m"], limit, cutoff, initial)
+
+    return SyncResponse(
+        history=SyncHistoryChanges(
+            changed=[SyncHistoryItem.model_validate(h) for h in histories if h.deleted_at is None],
+            deleted=[h.id for h in histories if h.deleted_at is not None]
+        ),
+        messages=SyncMessageChanges(
+            changed=[
+                SyncMessageItem(
+                    id=str(m.id),
+                    user_id=m.user_id,
+                    content=m.content,
+                    created_at=m.created_at,
+                    updated_at=m.updated_at
+                )
+                for m in messages if m.deleted_at is None
+            ],
+            deleted=[str(m.id) for m in messages if m.deleted_at is not None]
+        ),
+        next_token=_encode_token({"h": history_position, "m": message_position}, now),
+        has_more=history_more or message_more
+    )
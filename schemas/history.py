@@ -1,6 +1,6 @@
 from pydantic import BaseModel
-from datetime import date
-from typing import List, Optional
+from datetime import date, datetime
+from typing import Dict, List, Optional
 
 class HistoryCreate(BaseModel):
     user_id: str
@@ -20,4 +20,78 @@ class HistoryResponse(BaseModel):
     text_url: Optional[str] = None  # 텍스트 파일 주소
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class HistoryFieldsResponse(BaseModel):
+    """fields/preview 파라미터를 쓰는 목록 응답 (요청한 필드만 포함, 지정하지 않으면 HistoryResponse와 동일)"""
+    id: int
+    user_id: Optional[str] = None
+    content: Optional[str] = None
+    record_date: Optional[date] = None
+    tags: Optional[List[str]] = None
+    s3_key: Optional[str] = None  # 이미지 주소
+    text_url: Optional[str] = None  # 텍스트 파일 주소
+    content_preview: Optional[str] = None  # content 앞부분 (preview 지정 시)
+    
+    class Config:
+        from_attributes = True
+
+
+class HistorySemanticSearchResponse(HistoryFieldsResponse):
+    """의미 검색 결과 (유사도 내림차순)"""
+    score: float  # 코사인 유사도 (-1 ~ 1)
+
+
+class CalendarDay(BaseModel):
+    record_date: date
+    tag_count: int
+    has_image: bool
+
+
+class HistoryCalendarResponse(BaseModel):
+    user_id: str
+    year: int
+    month: int
+    days: List[CalendarDay]  # 기록이 있는 날짜만 (날짜 오름차순)
+    tag_counts: Dict[str, int]  # 월 전체 태그별 기록 수 (많은 순)
+
+
+class OnThisDayEntry(BaseModel):
+    id: int
+    record_date: date
+    years_ago: int  # 몇 년 전 같은 날인지
+    content: Optional[str] = None  # preview를 지정하면 content_preview만 포함
+    content_preview: Optional[str] = None
+    tags: Optional[List[str]] = None
+    s3_key: Optional[str] = None  # 이미지 주소
+    text_url: Optional[str] = None  # 텍스트 파일 주소
+
+
+class RelatedDayEntry(BaseModel):
+    id: int
+    record_date: date
+    tags: List[str]
+    s3_key: Optional[str] = None  # 이미지 주소
+    shared_tags: List[str]  # 이 날의 기록과 겹치는 태그
+    score: int  # 겹치는 태그 수
+
+
+class HistoryOnThisDayResponse(BaseModel):
+    user_id: str
+    date: date
+    same_day: List[OnThisDayEntry]  # 이전 해들의 같은 월/일 기록 (최신순)
+    related: List[RelatedDayEntry]  # 태그가 많이 겹치는 다른 날 기록 (겹치는 태그 많은 순)
+
+
+class RawMessage(BaseModel):
+    id: str
+    content: str
+    created_at: datetime
+
+
+class HistoryMessagesResponse(BaseModel):
+    history_id: int
+    user_id: str
+    record_date: date
+    messages: List[RawMessage]  # 작성 시간 오름차순
+    count: int
@@ -1,8 +1,10 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 import uuid
 
+from config import MESSAGE_BATCH_MAX_SIZE
+
 class MessageCreate(BaseModel):
     user_id: str
     content: str
@@ -20,6 +22,13 @@ class MessageResponse(BaseModel):
             uuid.UUID: lambda v: str(v)
         }
 
+class MessageBatchCreate(BaseModel):
+    messages: List[MessageCreate] = Field(..., min_length=1, max_length=MESSAGE_BATCH_MAX_SIZE)
+
+class MessageBatchResponse(BaseModel):
+    ids: List[str]  # 요청 순서와 동일
+    count: int
+
 class MessageUpdate(BaseModel):
     content: str
 
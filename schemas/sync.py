@@ -0,0 +1,37 @@
+from pydantic import BaseModel
+from datetime import date, datetime
+from typing import List, Optional
+
+class SyncHistoryItem(BaseModel):
+    id: int
+    user_id: str
+    content: str
+    record_date: date
+    tags: Optional[List[str]] = None
+    s3_key: Optional[str] = None  # 이미지 주소
+    text_url: Optional[str] = None  # 텍스트 파일 주소
+    updated_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+class SyncMessageItem(BaseModel):
+    id: str  # UUID를 문자열로 반환
+    user_id: str
+    content: str
+    created_at: datetime
+    updated_at: datetime
+
+class SyncHistoryChanges(BaseModel):
+    changed: List[SyncHistoryItem]
+    deleted: List[int]
+
+class SyncMessageChanges(BaseModel):
+    changed: List[SyncMessageItem]
+    deleted: List[str]
+
+class SyncResponse(BaseModel):
+    history: SyncHistoryChanges
+    messages: SyncMessageChanges
+    next_token: str  # 다음 요청의 since 값
+    has_more: bool  # true면 next_token으로 바로 다시 요청
\ No newline at end of file
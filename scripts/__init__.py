@@ -0,0 +1 @@
+# scripts 패키지
\ No newline at end of file
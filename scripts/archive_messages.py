@@ -0,0 +1,71 @@
+"""
+오래된 메시지를 보관소로 옮기고 빈 월 파티션을 삭제하는 보관 작업 (매일 실행)
+
+사용법:
+    python -m scripts.archive_messages                       # MESSAGE_ARCHIVE_AFTER_DAYS(기본 90일) 이전, S3에 보관
+    python -m scripts.archive_messages --days 120 --local-dir /var/lib/journal/archive
+    python -m scripts.archive_messages --dry-run
+
+1. 이번 달부터 MESSAGE_PARTITION_MONTHS_AHEAD개월 뒤까지 월 파티션을 만듭니다.
+2. 기준일 이전 날짜 중 History 요약이 저장된 (사용자, 날짜)의 메시지를
+   gzip NDJSON으로 보관소에 저장한 뒤 messages에서 삭제합니다.
+3. 기준일 이전에 끝나는 월 파티션이 비었으면 DROP TABLE로 삭제합니다.
+   요약되지 않은 날의 메시지가 남은 파티션은 유지됩니다.
+"""
+import argparse
+import logging
+from datetime import datetime, timedelta
+
+from config import MESSAGE_ARCHIVE_AFTER_DAYS, MESSAGE_ARCHIVE_DIR, SYNC_TOMBSTONE_RETENTION_DAYS
+from database import SessionLocal, engine
+from services.message_archive import LocalArchiveStore, S3ArchiveStore, archive_day, find_archivable_days
+from services.message_partitions import KST, drop_empty_partitions, ensure_partitions
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="메시지 보관 및 파티션 정리")
+    parser.add_argument("--days", type=int, default=MESSAGE_ARCHIVE_AFTER_DAYS, help="보관 기준 일수")
+    parser.add_argument("--local-dir", default=MESSAGE_ARCHIVE_DIR, help="로컬 보관 디렉토리 (기본값: S3)")
+    parser.add_argument("--limit", type=int, default=10000, help="한 번에 보관할 최대 (사용자, 날짜) 수")
+    parser.add_argument("--dry-run", action="store_true", help="대상만 출력하고 변경하지 않음")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    # 삭제 표시 보관 기간 안의 메시지를 지우면 /sync 클라이언트가 삭제를 알 수 없음
+    if args.days < SYNC_TOMBSTONE_RETENTION_DAYS:
+        parser.error(f"--days는 SYNC_TOMBSTONE_RETENTION_DAYS({SYNC_TOMBSTONE_RETENTION_DAYS}) 이상이어야 합니다")
+
+    if not args.dry_run:
+        ensure_partitions(engine)
+
+    before = datetime.now(KST).date() - timedelta(days=args.days)
+    store = LocalArchiveStore(args.local_dir) if args.local_dir else S3ArchiveStore()
+
+    db = SessionLocal()
+    archived_days = 0
+    archived_messages = 0
+    try:
+        for user_id, day in find_archivable_days(db, before, args.limit):
+            try:
+                count = archive_day(db, store, user_id, day, dry_run=args.dry_run)
+            except Exception as e:
+                db.rollback()
+                logger.error(f"메시지 보관 실패: {user_id} {day} - {e}")
+                continue
+            archived_days += 1
+            archived_messages += count
+    finally:
+        db.close()
+
+    dropped = drop_empty_partitions(engine, before, dry_run=args.dry_run)
+    logger.info(
+        f"메시지 보관 완료{' (dry-run)' if args.dry_run else ''}: "
+        f"{archived_days}일 / {archived_messages}건, 삭제한 파티션 {len(dropped)}개 (기준일 {before})"
+    )
+
+
+if __name__ == "__main__":
+    main()
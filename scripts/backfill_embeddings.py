@@ -0,0 +1,39 @@
+"""
+의미 검색용 History 임베딩을 채우는 작업
+
+사용법:
+    python -m scripts.backfill_embeddings
+    python -m scripts.backfill_embeddings --user-id user123
+
+임베딩이 없는 기록(기능 도입 전 기록, 임베딩 저장 실패), 임베딩 이후에 바뀐 기록,
+EMBEDDING_PROVIDER/EMBEDDING_DIM이 바뀌어 방식이 다른 기록만 다시 계산합니다.
+여러 번 실행해도 됩니다 (scripts.init_db로 history_embeddings 테이블을 먼저 만드세요).
+"""
+import argparse
+import logging
+import time
+
+from services.embeddings import embedder
+from services.semantic_search import backfill_embeddings
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="History 임베딩 채우기")
+    parser.add_argument("--user-id", action="append", help="대상 사용자 (여러 번 지정 가능, 생략하면 전체)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="트랜잭션당 기록 수 (기본값: 1000)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    if embedder is None:
+        logger.info("EMBEDDING_PROVIDER=none - 할 일 없음")
+        return
+    start = time.perf_counter()
+    total = backfill_embeddings(args.user_id, args.batch_size)
+    logger.info(f"임베딩 {total}건 계산 ({embedder.name}, {time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
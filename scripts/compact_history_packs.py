@@ -0,0 +1,87 @@
+"""
+사용자별 일별 히스토리 객체를 월 단위 팩 객체로 압축하는 작업
+
+사용법:
+    python -m scripts.compact_history_packs                 # 지난 달, 전체 사용자
+    python -m scripts.compact_history_packs --month 2025-03 --user user_001
+    python -m scripts.compact_history_packs --month 2025-03 --workers 16
+
+일별 객체({user_id}/history/YYYY/MM/DD/*.txt)는 쓰기 경로로 그대로 유지되며,
+팩({user_id}/history-packs/YYYY/YYYY-MM.pack)은 내보내기 전용 읽기 경로입니다.
+지난 달 기록이 수정/삭제되면 S3Service가 해당 팩을 삭제하므로 이 작업을 다시 실행하면 됩니다.
+"""
+import argparse
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+
+from services.history_pack import build_pack
+from services.message_partitions import KST
+from services.s3 import s3_service
+
+logger = logging.getLogger(__name__)
+
+
+def compact_month(user_id: str, year: int, month: int, workers: int = 8) -> int:
+    """
+    한 사용자의 한 달치 일별 객체를 팩으로 저장합니다.
+
+    Returns:
+        int: 팩에 포함된 레코드 수 (0이면 팩을 만들지 않음)
+    """
+    keys = s3_service.list_month_history_keys(user_id, year, month)
+    if not keys:
+        return 0
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        records = list(executor.map(s3_service.get_history_record, keys))
+
+    body = build_pack(user_id, f"{year:04d}-{month:02d}", records)
+    s3_service.save_pack(user_id, year, month, body)
+    return len(records)
+
+
+def previous_month(today: date) -> tuple:
+    if today.month == 1:
+        return today.year - 1, 12
+    return today.year, today.month - 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="월별 히스토리 팩 압축")
+    parser.add_argument("--month", help="대상 월 YYYY-MM (기본값: 지난 달)")
+    parser.add_argument("--user", help="대상 사용자 ID (기본값: 전체)")
+    parser.add_argument("--workers", type=int, default=8, help="사용자별 객체 읽기 병렬 수 (기본값: 8)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    # record_date와 같은 KST 기준 (UTC로 보면 월초 9시간 동안 진행 중인 달이 달라짐)
+    today = datetime.now(KST).date()
+    if args.month:
+        year, month = (int(v) for v in args.month.split("-"))
+    else:
+        year, month = previous_month(today)
+
+    if (year, month) >= (today.year, today.month):
+        parser.error("진행 중인 달은 압축할 수 없습니다 (지난 달까지만 가능)")
+
+    user_ids = [args.user] if args.user else s3_service.list_user_prefixes()
+
+    packed_users = 0
+    packed_records = 0
+    for user_id in user_ids:
+        try:
+            count = compact_month(user_id, year, month, args.workers)
+        except Exception as e:
+            logger.error(f"팩 생성 실패: {user_id} {year:04d}-{month:02d} - {e}")
+            continue
+        if count:
+            packed_users += 1
+            packed_records += count
+
+    logger.info(f"완료 - {year:04d}-{month:02d}: 사용자 {packed_users}명, 레코드 {packed_records}건")
+
+
+if __name__ == "__main__":
+    main()
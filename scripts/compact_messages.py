@@ -0,0 +1,44 @@
+"""
+요약(History)이 저장된 지난 날의 메시지를 history.raw_messages로 압축하는 정리 작업
+
+사용법:
+    python -m scripts.compact_messages               # 어제까지
+    python -m scripts.compact_messages --limit 500
+
+MESSAGE_COMPACTION_ON_SAVE=true면 POST /history 저장 직후 그날을 바로 압축하므로,
+이 작업은 그 이후에 추가된 메시지나 설정 이전 데이터를 정리하는 용도입니다.
+"""
+import argparse
+import logging
+
+from database import SessionLocal
+from services.message_compaction import compact_day, find_compactable_days, today_kst
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="요약된 날의 메시지 압축")
+    parser.add_argument("--limit", type=int, default=10000, help="한 번에 처리할 최대 (사용자, 날짜) 수")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    db = SessionLocal()
+    days = 0
+    compacted = 0
+    try:
+        for user_id, day in find_compactable_days(db, today_kst(), args.limit):
+            try:
+                compacted += compact_day(db, user_id, day)
+                days += 1
+            except Exception as e:
+                db.rollback()
+                logger.error(f"메시지 압축 실패: {user_id} {day} - {e}")
+    finally:
+        db.close()
+    logger.info(f"메시지 압축 완료: {days}일 / {compacted}건")
+
+
+if __name__ == "__main__":
+    main()
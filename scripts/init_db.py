@@ -0,0 +1,33 @@
+"""
+DB 스키마 초기화 작업 (테이블 생성 + 메시지 월 파티션 생성)
+
+사용법:
+    python -m scripts.init_db
+
+앱 시작 경로에서 create_all/파티션 생성을 하지 않으므로 배포마다 한 번 실행합니다
+(k8s/k8s-deployment.yaml의 journal-api-init-db Job, ArgoCD PreSync 훅).
+이미 있는 테이블/파티션은 건너뛰므로 여러 번 실행해도 됩니다.
+파티션은 이번 달부터 MESSAGE_PARTITION_MONTHS_AHEAD개월 뒤까지 만들며, 메시지 보관 작업에서도 다시 확인합니다.
+"""
+import logging
+import time
+
+from database import Base, engine
+# create_all 대상 모델 등록
+from models import history, history_embedding, idempotency, message  # noqa: F401
+from services.message_partitions import ensure_partitions
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+
+    start = time.perf_counter()
+    Base.metadata.create_all(bind=engine)
+    created = ensure_partitions(engine)
+    logger.info(f"스키마 초기화 완료: 새 파티션 {created or '없음'} ({(time.perf_counter() - start) * 1000:.0f}ms)")
+
+
+if __name__ == "__main__":
+    main()
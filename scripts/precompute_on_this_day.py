@@ -0,0 +1,59 @@
+"""
+이 날의 기록(/history/on-this-day)을 미리 계산해 캐시에 넣는 작업 (KST 자정 직후 실행)
+
+사용법:
+    python -m scripts.precompute_on_this_day
+    python -m scripts.precompute_on_this_day --date 2026-01-05 --active-days 7
+
+최근 --active-days일 안에 기록을 쓴 사용자의 그날 결과를 계산해 두어, 아침에 몰리는 첫 요청이
+DB 계산 없이 캐시에서 응답하도록 합니다. 레플리카가 함께 보는 HISTORY_CACHE_BACKEND=redis에서만
+의미가 있습니다 (memory 백엔드는 이 프로세스 안에만 저장되므로 아무것도 하지 않음).
+"""
+import argparse
+import logging
+import time
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import select
+
+from database import SessionLocal
+from models.history import History
+from services.history_cache import RedisCacheBackend, history_cache
+from services.http_cache import history_user_etag
+from services.message_partitions import KST
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="이 날의 기록 미리 계산")
+    parser.add_argument("--date", type=date.fromisoformat, help="기준 날짜 (YYYY-MM-DD, 기본값: 오늘 KST)")
+    parser.add_argument("--active-days", type=int, default=30, help="이 기간 안에 기록을 쓴 사용자만 (기본값: 30)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    if not isinstance(history_cache.backend, RedisCacheBackend):
+        logger.info(f"{type(history_cache.backend).__name__} - 공유 캐시가 아니므로 할 일 없음 (HISTORY_CACHE_BACKEND=redis 필요)")
+        return
+    target = args.date or datetime.now(KST).date()
+    since = datetime.now(timezone.utc) - timedelta(days=args.active_days)
+
+    start = time.perf_counter()
+    db = SessionLocal()
+    try:
+        user_ids = db.execute(
+            select(History.user_id).where(History.updated_at >= since).distinct()
+        ).scalars().all()
+        for user_id in user_ids:
+            version = history_user_etag(db, user_id, target.isoformat())
+            history_cache.get_on_this_day(db, user_id, target, version)
+            # 사용자마다 트랜잭션을 끝내 오래 열린 트랜잭션을 만들지 않음
+            db.rollback()
+    finally:
+        db.close()
+    logger.info(f"{target} 이 날의 기록 {len(user_ids)}명 계산 ({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+보관 기간이 지난 삭제 표시(tombstone) 행을 영구 삭제하는 작업
+
+사용법:
+    python -m scripts.purge_tombstones
+    python -m scripts.purge_tombstones --days 180
+
+SYNC_TOMBSTONE_RETENTION_DAYS보다 오래된 동기화 토큰은 /sync에서 410을 받으므로
+이 기간이 지난 tombstone은 더 이상 전달할 필요가 없습니다.
+"""
+import argparse
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete
+
+from config import SYNC_TOMBSTONE_RETENTION_DAYS
+from database import SessionLocal
+from models.history import History
+from models.message import Message
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="오래된 tombstone 삭제")
+    parser.add_argument("--days", type=int, default=SYNC_TOMBSTONE_RETENTION_DAYS, help="보관 기간 (일)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    cutoff = datetime.now(timezone.utc) - timedelta(days=args.days)
+    db = SessionLocal()
+    try:
+        for model in (History, Message):
+            result = db.execute(delete(model).where(model.deleted_at < cutoff))
+            logger.info(f"{model.__tablename__}: tombstone {result.rowcount}건 삭제")
+        db.commit()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
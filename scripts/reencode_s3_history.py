@@ -0,0 +1,103 @@
+"""
+S3 히스토리 텍스트 객체를 지정한 포맷으로 다시 인코딩하는 마이그레이션 명령
+
+사용법:
+    python -m scripts.reencode_s3_history --format gzip --workers 16
+    python -m scripts.reencode_s3_history --format zstd --prefix user_001/ --dry-run
+    python -m scripts.reencode_s3_history --format text   # 평문으로 되돌리기
+
+키 형식({user_id}/history/YYYY/MM/DD/YYYY-MM-DD.txt)은 그대로 유지하므로
+DB의 text_url은 변경할 필요가 없습니다.
+"""
+import argparse
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from services.history_codec import SUPPORTED_FORMATS, content_type_for, decode_history, detect_format, encode_history
+from services.s3 import s3_service
+
+logger = logging.getLogger(__name__)
+
+
+def iter_history_keys(prefix: str = ""):
+    """버킷에서 히스토리 텍스트 객체 키를 순회합니다."""
+    paginator = s3_service.s3_client.get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=s3_service.bucket_name, Prefix=prefix):
+        for obj in page.get("Contents", []):
+            key = obj["Key"]
+            if "/history/" in key and key.endswith(".txt"):
+                yield key
+
+
+def reencode_object(key: str, fmt: str, level, dry_run: bool) -> tuple:
+    """
+    객체 하나를 다시 인코딩합니다.
+
+    Returns:
+        tuple: (결과 상태, 기존 크기, 새 크기)
+    """
+    body = s3_service.get_object_bytes(key)
+    if detect_format(body) == fmt:
+        return "skipped", len(body), len(body)
+
+    record = decode_history(body)
+    new_body = encode_history(
+        user_id=record["user_id"],
+        content=record["content"],
+        record_date=record["record_date"],
+        tags=record["tags"],
+        fmt=fmt,
+        level=level,
+    )
+    if not dry_run:
+        s3_service.s3_client.put_object(
+            Bucket=s3_service.bucket_name,
+            Key=key,
+            Body=new_body,
+            ContentType=content_type_for(fmt),
+            Metadata={"history-format": fmt},
+        )
+    return "converted", len(body), len(new_body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="S3 히스토리 객체 포맷 변환")
+    parser.add_argument("--format", required=True, choices=SUPPORTED_FORMATS, help="변환할 포맷")
+    parser.add_argument("--level", type=int, default=None, help="압축 레벨 (기본값: 코덱 기본값)")
+    parser.add_argument("--prefix", default="", help="대상 키 prefix (예: user_001/)")
+    parser.add_argument("--workers", type=int, default=8, help="병렬 작업 수 (기본값: 8)")
+    parser.add_argument("--dry-run", action="store_true", help="업로드하지 않고 결과만 집계")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    stats = {"converted": 0, "skipped": 0, "failed": 0, "bytes_before": 0, "bytes_after": 0}
+    lock = threading.Lock()
+
+    def run(key: str):
+        try:
+            status, before, after = reencode_object(key, args.format, args.level, args.dry_run)
+        except Exception as e:
+            logger.error(f"변환 실패: {key} - {e}")
+            with lock:
+                stats["failed"] += 1
+            return
+        with lock:
+            stats[status] += 1
+            stats["bytes_before"] += before
+            stats["bytes_after"] += after
+
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        list(executor.map(run, iter_history_keys(args.prefix)))
+
+    ratio = stats["bytes_after"] / stats["bytes_before"] if stats["bytes_before"] else 1.0
+    logger.info(
+        f"완료 - 변환: {stats['converted']}, 건너뜀: {stats['skipped']}, 실패: {stats['failed']}, "
+        f"크기: {stats['bytes_before']} -> {stats['bytes_after']} bytes ({ratio:.1%})"
+        + (" [dry-run]" if args.dry_run else "")
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@ import logging
 import httpx
 from typing import Dict, Any, Optional
 from config import AGENT_API_URL
+from services.metrics import observe_agent_call
 
 logger = logging.getLogger(__name__)
 
@@ -42,7 +43,8 @@ class AgentAPIService:
             }
         """
         try:
-            return self._invoke_agent_api(user_input, user_id, request_type, temperature, current_date)
+            with observe_agent_call(request_type):
+                return self._invoke_agent_api(user_input, user_id, request_type, temperature, current_date)
         except Exception as e:
             logger.error(f"Agent API 호출 실패: {e}")
             raise
@@ -0,0 +1,110 @@
+import logging
+import re
+import zlib
+from typing import List
+
+import httpx
+import numpy as np
+
+from config import (
+    AGENT_API_URL,
+    EMBEDDING_AGENT_PATH,
+    EMBEDDING_BATCH_SIZE,
+    EMBEDDING_DIM,
+    EMBEDDING_PROVIDER,
+)
+
+logger = logging.getLogger(__name__)
+
+# 저장 형식: float16 little-endian (벡터당 차원 * 2바이트)
+STORAGE_DTYPE = np.dtype("<f2")
+# 단어 단위로 자른 뒤 글자 n-gram을 만듦 (한글/영문/숫자만)
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """행별 L2 정규화 (내적 = 코사인 유사도). 0벡터는 그대로 둡니다."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def to_blob(vector: np.ndarray) -> bytes:
+    return vector.astype(STORAGE_DTYPE).tobytes()
+
+
+def from_blobs(blobs: List[bytes], dim: int) -> np.ndarray:
+    """저장된 벡터들을 (n, dim) float16 행렬로 읽습니다."""
+    return np.frombuffer(b"".join(blobs), dtype=STORAGE_DTYPE).reshape(len(blobs), dim)
+
+
+class HashingEmbedder:
+    """
+    글자 n-gram 해싱 임베딩 (외부 호출 없음)
+
+    단어마다 단어 전체와 글자 2-gram, 3-gram을 crc32로 dim개 버킷에 부호를 붙여 더합니다 (feature hashing).
+    "우울했던"과 "우울한"처럼 어미/조사가 다른 한국어 단어도 "우울" 같은 n-gram을 공유해 가깝게 나오지만,
+    "울적한"처럼 글자가 다른 동의어는 잡지 못합니다 (그런 검색은 EMBEDDING_PROVIDER=agent).
+    """
+
+    def __init__(self, dim: int):
+        self.dim = dim
+        self.name = f"hash-ngram-{dim}"
+
+    def _features(self, text: str) -> List[int]:
+        features = []
+        for word in WORD_PATTERN.findall(text.lower()):
+            features.append(zlib.crc32(word.encode()))
+            for n in (2, 3):
+                for i in range(len(word) - n + 1):
+                    features.append(zlib.crc32(word[i:i + n].encode()))
+        return features
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """(len(texts), dim) float32, 행별 정규화"""
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            hashes = np.array(self._features(text), dtype=np.uint32)
+            if not len(hashes):
+                continue
+            # 해시 상위 비트로 부호를 정해 충돌한 특징끼리 서로 상쇄되도록 함
+            signs = np.where(hashes >> 31, 1.0, -1.0)
+            matrix[row] = np.bincount(hashes % self.dim, weights=signs, minlength=self.dim)
+        return normalize_rows(matrix)
+
+
+class AgentEmbedder:
+    """Agent API 임베딩 (POST {AGENT_API_URL}{EMBEDDING_AGENT_PATH})"""
+
+    def __init__(self, url: str, dim: int, batch_size: int):
+        self.url = url
+        self.dim = dim
+        self.batch_size = batch_size
+        self.name = f"agent-{dim}"
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """(len(texts), dim) float32, 행별 정규화"""
+        vectors = []
+        with httpx.Client(timeout=30.0) as client:
+            for offset in range(0, len(texts), self.batch_size):
+                response = client.post(self.url, json={"texts": texts[offset:offset + self.batch_size]})
+                response.raise_for_status()
+                vectors.extend(response.json()["embeddings"])
+        matrix = np.asarray(vectors, dtype=np.float32).reshape(len(texts), -1)
+        if matrix.shape[1] != self.dim:
+            raise ValueError(f"Agent API 임베딩 차원이 EMBEDDING_DIM과 다릅니다: {matrix.shape[1]} != {self.dim}")
+        return normalize_rows(matrix)
+
+
+def _create_embedder():
+    if EMBEDDING_PROVIDER == "hash":
+        return HashingEmbedder(EMBEDDING_DIM)
+    if EMBEDDING_PROVIDER == "agent":
+        return AgentEmbedder(f"{AGENT_API_URL}{EMBEDDING_AGENT_PATH}", EMBEDDING_DIM, EMBEDDING_BATCH_SIZE)
+    if EMBEDDING_PROVIDER == "none":
+        return None
+    raise ValueError(f"EMBEDDING_PROVIDER 값이 올바르지 않습니다: {EMBEDDING_PROVIDER}")
+
+
+# 싱글톤 인스턴스 (EMBEDDING_PROVIDER=none이면 None - 의미 검색 비활성화)
+embedder = _create_embedder()
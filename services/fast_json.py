@@ -0,0 +1,43 @@
+import logging
+from typing import Optional
+
+import orjson
+from fastapi import Response
+
+logger = logging.getLogger(__name__)
+
+# pydantic 직렬화와 같은 형식 (UTC는 "Z", date는 ISO, UUID는 문자열)
+ORJSON_OPTIONS = orjson.OPT_UTC_Z
+
+
+class FastJSONResponse(Response):
+    """
+    orjson으로 직렬화하는 JSON 응답
+
+    핸들러가 이 응답을 직접 반환하면 FastAPI의 response_model 검증/직렬화를 건너뜁니다.
+    SQL에서 필요한 컬럼만 튜플로 읽은 목록 응답에만 사용합니다 (response_model은 문서용으로 유지).
+    """
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+def rows_to_dicts(result) -> list:
+    """SQLAlchemy Core 결과를 dict 목록으로 변환합니다 (ORM 객체/pydantic 모델 생성 없음)."""
+    keys = list(result.keys())
+    return [dict(zip(keys, row)) for row in result]
+
+
+def json_response(content, response: Optional[Response] = None) -> FastJSONResponse:
+    """
+    FastJSONResponse를 만듭니다.
+
+    Args:
+        content: 직렬화할 값
+        response: 핸들러에 주입된 Response (ETag 등 이미 설정한 헤더를 옮겨 담음)
+    """
+    headers = None
+    if response is not None:
+        headers = {name: value for name, value in response.headers.items() if name != "content-length"}
+    return FastJSONResponse(content, headers=headers)
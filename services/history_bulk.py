@@ -0,0 +1,94 @@
+import json
+import logging
+from typing import AsyncIterator, Iterator, List
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+from models.history import History
+
+logger = logging.getLogger(__name__)
+
+# 내보내기/가져오기 NDJSON 한 줄에 담기는 컬럼
+EXPORT_COLUMNS = (
+    History.id,
+    History.user_id,
+    History.content,
+    History.record_date,
+    History.tags,
+    History.s3_key,
+    History.text_url,
+)
+
+
+def iter_history_ndjson(user_id: str, batch_size: int = 1000) -> Iterator[bytes]:
+    """
+    사용자의 전체 히스토리를 NDJSON 바이트로 스트리밍합니다.
+
+    서버 사이드 커서(yield_per)로 batch_size 행씩 가져오므로 메모리 사용량은 전체 행 수와 무관합니다.
+    StreamingResponse가 요청 스코프 밖에서 순회할 수 있으므로 세션을 직접 열고 닫습니다.
+    """
+    db = SessionLocal()
+    try:
+        result = db.execute(
+            select(*EXPORT_COLUMNS)
+            .where(History.user_id == user_id, History.deleted_at.is_(None))
+            .order_by(History.record_date.asc())
+            .execution_options(yield_per=batch_size)
+        )
+        for partition in result.partitions():
+            chunk = []
+            for row in partition:
+                chunk.append(json.dumps({
+                    "id": row.id,
+                    "user_id": row.user_id,
+                    "content": row.content,
+                    "record_date": row.record_date.isoformat(),
+                    "tags": row.tags,
+                    "s3_key": row.s3_key,
+                    "text_url": row.text_url,
+                }, ensure_ascii=False, separators=(",", ":")))
+            yield ("\n".join(chunk) + "\n").encode("utf-8")
+    finally:
+        db.close()
+
+
+async def iter_ndjson_lines(stream: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """요청 본문 스트림을 줄 단위로 나눕니다 (빈 줄은 건너뜀)."""
+    buffer = b""
+    async for chunk in stream:
+        buffer += chunk
+        lines = buffer.split(b"\n")
+        buffer = lines.pop()
+        for line in lines:
+            if line.strip():
+                yield line
+    if buffer.strip():
+        yield buffer
+
+
+def upsert_history_rows(db: Session, rows: List[dict]) -> None:
+    """
+    히스토리 행들을 다중 행 INSERT ... ON CONFLICT (user_id, record_date) DO UPDATE로 저장합니다.
+    커밋은 호출자가 합니다.
+    
+    executemany 형태로 실행하면 psycopg2 dialect가 캐시된 문장 하나로 다중 VALUES 배치를 만듭니다
+    (values(rows)로 매번 7000개 바인드 파라미터 문장을 컴파일하는 것보다 훨씬 빠름).
+    """
+    if not rows:
+        return
+    stmt = insert(History)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[History.user_id, History.record_date],
+        set_={
+            "content": stmt.excluded.content,
+            "tags": stmt.excluded.tags,
+            "s3_key": stmt.excluded.s3_key,
+            "text_url": stmt.excluded.text_url,
+            "updated_at": func.now(),
+            "deleted_at": None,
+        },
+    )
+    db.execute(stmt, rows)
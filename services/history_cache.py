@@ -0,0 +1,484 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Optional
+
+import orjson
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from config import (
+    HISTORY_CACHE_BACKEND,
+    HISTORY_CACHE_MAX_ENTRIES,
+    HISTORY_CACHE_TTL_SECONDS,
+    ON_THIS_DAY_CACHE_TTL_SECONDS,
+    REDIS_URL,
+)
+from models.history import History
+from services.on_this_day import compute_on_this_day
+
+try:
+    import redis
+except ImportError:  # 선택 의존성 (HISTORY_CACHE_BACKEND=redis 사용 시에만 필요)
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "history:"
+# 캐시에 "없음"을 저장할 때의 값 (오늘 기록이 아직 없는 check 요청이 대부분)
+MISSING = None
+# 백엔드 get에서 키가 없을 때 반환하는 값
+_ABSENT = object()
+# 키별 무효화 기록을 보관하는 시간 - 읽기(DB 조회)가 이보다 오래 걸리면 결과를 저장하지 않음
+INVALIDATION_MARKER_SECONDS = 60
+
+_SNAPSHOT_COLUMNS = (
+    History.id,
+    History.user_id,
+    History.content,
+    History.record_date,
+    History.tags,
+    History.s3_key,
+    History.text_url,
+    History.updated_at,
+)
+
+
+def _encode_default(value):
+    # date/datetime은 문자열과 구분되도록 태그를 붙여 저장 (OPT_PASSTHROUGH_DATETIME으로 여기로 전달됨)
+    if isinstance(value, datetime):
+        return {"$datetime": value.isoformat()}
+    if isinstance(value, date):
+        return {"$date": value.isoformat()}
+    raise TypeError(f"캐시에 저장할 수 없는 타입입니다: {type(value).__name__}")
+
+
+def _decode_hook(obj: dict):
+    if len(obj) == 1:
+        if "$datetime" in obj:
+            return datetime.fromisoformat(obj["$datetime"])
+        if "$date" in obj:
+            return date.fromisoformat(obj["$date"])
+    return obj
+
+
+def _dumps(value) -> bytes:
+    """공유 캐시 저장 형식 (JSON - 다른 프로세스가 쓴 값을 읽어도 코드가 실행되지 않음)"""
+    return orjson.dumps(value, default=_encode_default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+
+
+def _loads(raw: bytes):
+    return json.loads(raw, object_hook=_decode_hook)
+
+
+def _id_key(history_id: int) -> str:
+    return f"{KEY_PREFIX}id:{history_id}"
+
+
+def _day_key(user_id: str, record_date: date) -> str:
+    return f"{KEY_PREFIX}day:{user_id}:{record_date.isoformat()}"
+
+
+def _calendar_key(user_id: str, year: int, month: int) -> str:
+    return f"{KEY_PREFIX}calendar:{user_id}:{year:04d}-{month:02d}"
+
+
+def _on_this_day_key(user_id: str, target: date, version: str) -> str:
+    return f"{KEY_PREFIX}onthisday:{user_id}:{target.isoformat()}:{version}"
+
+
+class MemoryCacheBackend:
+    """프로세스 로컬 LRU + TTL 캐시 (레플리카 간 공유되지 않음 - TTL이 최대 지연)"""
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        # 무효화 시계와 키별 마지막 무효화 시점 (INVALIDATION_MARKER_SECONDS 동안만 보관)
+        self._generation = 0
+        self._invalidated = OrderedDict()
+        self._cleared_at = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _ABSENT
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return _ABSENT
+            self._entries.move_to_end(key)
+            return value
+
+    def set_many(self, items: dict, generation: int, ttl_seconds: Optional[int] = None) -> bool:
+        with self._lock:
+            # 읽기 시작 후 이 키들 중 하나라도 무효화되었으면 오래된 값일 수 있으므로 저장하지 않음
+            if generation < self._cleared_at or any(
+                self._invalidated.get(key, (0, 0))[0] > generation for key in items
+            ):
+                return False
+            expires_at = time.monotonic() + (ttl_seconds or self.ttl_seconds)
+            for key, value in items.items():
+                self._entries[key] = (expires_at, value)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            return True
+
+    def delete_many(self, keys) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                self._entries.pop(key, None)
+                self._invalidated[key] = (self._generation, now)
+                self._invalidated.move_to_end(key)
+            # 오래된 무효화 기록 정리 (그보다 오래 걸린 읽기는 HistoryCache가 저장하지 않음)
+            while self._invalidated:
+                _, (_, invalidated_at) = next(iter(self._invalidated.items()))
+                if now - invalidated_at <= INVALIDATION_MARKER_SECONDS:
+                    break
+                self._invalidated.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._cleared_at = self._generation
+            self._entries.clear()
+            self._invalidated.clear()
+
+    def size(self) -> int:
+        return len(self._entries)
+
+
+class RedisCacheBackend:
+    """Redis 공유 캐시 (모든 레플리카가 같은 캐시를 보므로 무효화가 즉시 전파됨)"""
+
+    GENERATION_KEY = f"{KEY_PREFIX}generation"
+    CLEARED_KEY = f"{KEY_PREFIX}cleared"
+
+    def __init__(self, url: str, ttl_seconds: int):
+        if redis is None:
+            raise ValueError("HISTORY_CACHE_BACKEND=redis 사용 시 redis 패키지가 필요합니다 (pip install redis)")
+        self.client = redis.Redis.from_url(url)
+        self.ttl_seconds = ttl_seconds
+        self.evictions = 0
+
+    @staticmethod
+    def _marker_key(key: str) -> str:
+        return f"{KEY_PREFIX}invalidated:{key}"
+
+    def generation(self) -> int:
+        return int(self.client.get(self.GENERATION_KEY) or 0)
+
+    def get(self, key: str):
+        raw = self.client.get(key)
+        if raw is None:
+            return _ABSENT
+        return _loads(raw)
+
+    def set_many(self, items: dict, generation: int, ttl_seconds: Optional[int] = None) -> bool:
+        markers = [self._marker_key(key) for key in items] + [self.CLEARED_KEY]
+        with self.client.pipeline() as pipe:
+            try:
+                pipe.watch(*markers)
+                if any(int(value) > generation for value in pipe.mget(markers) if value is not None):
+                    pipe.reset()
+                    return False
+                pipe.multi()
+                for key, value in items.items():
+                    pipe.set(key, _dumps(value), ex=ttl_seconds or self.ttl_seconds)
+                pipe.execute()
+                return True
+            except redis.WatchError:
+                # 저장 직전에 다른 레플리카가 이 키를 무효화함
+                return False
+
+    def delete_many(self, keys) -> None:
+        generation = self.client.incr(self.GENERATION_KEY)
+        with self.client.pipeline() as pipe:
+            for key in keys:
+                pipe.set(self._marker_key(key), generation, ex=INVALIDATION_MARKER_SECONDS)
+            pipe.delete(*keys)
+            pipe.execute()
+
+    def clear(self) -> None:
+        generation = self.client.incr(self.GENERATION_KEY)
+        self.client.set(self.CLEARED_KEY, generation)
+        keep = {self.GENERATION_KEY.encode(), self.CLEARED_KEY.encode()}
+        keys = [key for key in self.client.scan_iter(match=f"{KEY_PREFIX}*") if key not in keep]
+        for offset in range(0, len(keys), 1000):
+            self.client.delete(*keys[offset:offset + 1000])
+
+    def size(self) -> Optional[int]:
+        # 같은 Redis를 속도 제한 등이 함께 쓰므로 dbsize()는 캐시 크기가 아님 - 키 접두사 SCAN은 비싸서 보고하지 않음
+        return None
+
+
+class NullCacheBackend:
+    """캐시 비활성화 (HISTORY_CACHE_BACKEND=none)"""
+
+    evictions = 0
+
+    def generation(self) -> int:
+        return 0
+
+    def get(self, key: str):
+        return _ABSENT
+
+    def set_many(self, items: dict, generation: int, ttl_seconds: Optional[int] = None) -> bool:
+        return False
+
+    def delete_many(self, keys) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+    def size(self) -> int:
+        return 0
+
+
+class HistoryCache:
+    """
+    History 단건 조회용 read-through 캐시
+
+    id와 (user_id, record_date) 두 가지 키로 같은 스냅샷(dict)을 저장하며, 없는 기록도 캐시합니다.
+    사용자-월 캘린더 결과도 같은 백엔드에 저장하고 같은 경로로 무효화합니다.
+    이 날의 기록은 키에 사용자 버전(ETag)을 넣어 저장하므로 무효화 없이 쓰기 후 새 키로 다시 계산합니다.
+    무효화는 Session 커밋 이벤트 한 곳에서 처리하므로 ORM으로 History를 바꾸는 모든 엔드포인트에
+    자동으로 적용됩니다. Core 문으로 직접 쓰는 경우(bulk import)는 invalidate/clear를 호출해야 합니다.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get_by_id(self, db: Session, history_id: int) -> Optional[dict]:
+        """id로 삭제되지 않은 기록 스냅샷을 조회합니다. 없으면 None."""
+        return self._get_or_load(db, _id_key(history_id), History.id == history_id)
+
+    def get_by_day(self, db: Session, user_id: str, record_date: date) -> Optional[dict]:
+        """(user_id, record_date)로 삭제되지 않은 기록 스냅샷을 조회합니다. 없으면 None."""
+        return self._get_or_load(
+            db,
+            _day_key(user_id, record_date),
+            History.user_id == user_id,
+            History.record_date == record_date
+        )
+
+    def invalidate(self, rows) -> None:
+        """
+        기록 키를 무효화합니다.
+
+        Args:
+            rows: (id 또는 None, user_id, record_date) 튜플 목록
+        """
+        keys = set()
+        for history_id, user_id, record_date in rows:
+            if history_id is not None:
+                keys.add(_id_key(history_id))
+            if user_id is not None and record_date is not None:
+                keys.add(_day_key(user_id, record_date))
+                keys.add(_calendar_key(user_id, record_date.year, record_date.month))
+        if not keys:
+            return
+        try:
+            self.backend.delete_many(keys)
+        except Exception as e:
+            logger.error(f"히스토리 캐시 무효화 실패: {e}")
+        with self._lock:
+            self.invalidations += len(keys)
+
+    def clear(self) -> None:
+        """전체 캐시를 비웁니다 (bulk import 등)."""
+        try:
+            self.backend.clear()
+        except Exception as e:
+            logger.error(f"히스토리 캐시 비우기 실패: {e}")
+
+    def stats(self) -> dict:
+        """캐시 적중률 등 지표를 반환합니다."""
+        with self._lock:
+            hits, misses, invalidations = self.hits, self.misses, self.invalidations
+        try:
+            size = self.backend.size()
+        except Exception:
+            size = None
+        total = hits + misses
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / total, 4) if total else None,
+            "invalidations": invalidations,
+            "evictions": self.backend.evictions,
+            "size": size,
+        }
+
+    def get_calendar(self, db: Session, user_id: str, year: int, month: int) -> dict:
+        """
+        사용자-월 캘린더(기록이 있는 날짜, 태그 수, 이미지 여부)를 조회합니다.
+        (user_id, record_date) INCLUDE (tags, s3_key) 부분 인덱스만 읽습니다 (content 미조회).
+        """
+        def load():
+            start = date(year, month, 1)
+            end = date(year + month // 12, month % 12 + 1, 1)
+            rows = db.execute(
+                select(History.record_date, History.tags, History.s3_key)
+                .where(
+                    History.user_id == user_id,
+                    History.record_date >= start,
+                    History.record_date < end,
+                    History.deleted_at.is_(None)
+                )
+                .order_by(History.record_date)
+            ).all()
+            tag_counts = {}
+            for row in rows:
+                for tag in row.tags or ():
+                    tag_counts[tag] = tag_counts.get(tag, 0) + 1
+            calendar = {
+                "days": [
+                    {"record_date": row.record_date, "tag_count": len(row.tags or ()), "has_image": row.s3_key is not None}
+                    for row in rows
+                ],
+                "tag_counts": dict(sorted(tag_counts.items(), key=lambda item: (-item[1], item[0]))),
+            }
+            return calendar, {}
+
+        return self._read_through(_calendar_key(user_id, year, month), load)
+
+    def get_on_this_day(self, db: Session, user_id: str, target: date, version: str) -> dict:
+        """
+        이 날의 기록(이전 해들의 같은 월/일 기록, 태그가 겹치는 관련 기록)을 조회합니다.
+        사용자-날짜-버전별로 ON_THIS_DAY_CACHE_TTL_SECONDS 동안 저장해 하루 한 번만 계산합니다.
+
+        Args:
+            version: 사용자 히스토리 버전 (history_user_etag) - 기록이 바뀌면 다른 키가 됨
+        """
+        return self._read_through(
+            _on_this_day_key(user_id, target, version),
+            lambda: (compute_on_this_day(db, user_id, target), {}),
+            ON_THIS_DAY_CACHE_TTL_SECONDS,
+        )
+
+    def _get_or_load(self, db: Session, key: str, *criteria) -> Optional[dict]:
+        def load():
+            row = db.execute(
+                select(*_SNAPSHOT_COLUMNS).where(*criteria, History.deleted_at.is_(None))
+            ).first()
+            if not row:
+                return MISSING, {}
+            snapshot = dict(row._mapping)
+            # 다른 키로도 같은 기록을 바로 찾을 수 있도록 함께 저장
+            return snapshot, {
+                _id_key(snapshot["id"]): snapshot,
+                _day_key(snapshot["user_id"], snapshot["record_date"]): snapshot,
+            }
+
+        return self._read_through(key, load)
+
+    def _read_through(self, key: str, load, ttl_seconds: Optional[int] = None):
+        """
+        캐시에 있으면 반환하고, 없으면 load()로 DB에서 읽어 저장합니다.
+        load는 (값, 함께 저장할 다른 키의 값 dict)를 반환합니다.
+        ttl_seconds를 지정하지 않으면 백엔드 기본값(HISTORY_CACHE_TTL_SECONDS)을 씁니다.
+        """
+        try:
+            cached = self.backend.get(key)
+        except Exception as e:
+            # 캐시 장애는 DB 조회로 대체
+            logger.warning(f"히스토리 캐시 조회 실패 (DB 조회로 진행): {e}")
+            cached = _ABSENT
+        if cached is not _ABSENT:
+            self._count(hit=True)
+            return cached
+        self._count(hit=False)
+
+        # 조회 전 무효화 시계를 기록 - 조회 중에 저장할 키가 무효화되었으면 저장하지 않음
+        # (키별로 비교하므로 다른 사용자/기록의 쓰기는 저장을 막지 않음)
+        try:
+            generation = self.backend.generation()
+        except Exception:
+            generation = None
+        started = time.monotonic()
+
+        value, related = load()
+
+        if generation is not None and time.monotonic() - started < INVALIDATION_MARKER_SECONDS:
+            try:
+                self.backend.set_many({key: value, **related}, generation, ttl_seconds)
+            except Exception as e:
+                logger.warning(f"히스토리 캐시 저장 실패: {e}")
+        return value
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+
+def _create_backend():
+    if HISTORY_CACHE_BACKEND == "redis":
+        return RedisCacheBackend(REDIS_URL, HISTORY_CACHE_TTL_SECONDS)
+    if HISTORY_CACHE_BACKEND == "memory":
+        return MemoryCacheBackend(HISTORY_CACHE_MAX_ENTRIES, HISTORY_CACHE_TTL_SECONDS)
+    if HISTORY_CACHE_BACKEND == "none":
+        return NullCacheBackend()
+    raise ValueError(f"HISTORY_CACHE_BACKEND 값이 올바르지 않습니다: {HISTORY_CACHE_BACKEND}")
+
+
+# 싱글톤 인스턴스
+history_cache = HistoryCache(_create_backend())
+
+
+# 쓰기 경로: flush된 History의 키(변경 전/후 user_id, record_date 모두)를 모아 두었다가 커밋 후 무효화
+_PENDING_KEY = "history_cache_pending"
+
+
+def _attribute_values(state, name: str) -> list:
+    attr = state.attrs[name]
+    values = [attr.value] + list(attr.history.deleted or ())
+    return [value for value in values if value is not None]
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_history_changes(session, flush_context):
+    pending = session.info.setdefault(_PENDING_KEY, set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if not isinstance(obj, History):
+            continue
+        state = inspect(obj)
+        history_id = obj.id
+        for user_id in _attribute_values(state, "user_id"):
+            for record_date in _attribute_values(state, "record_date"):
+                pending.add((history_id, user_id, record_date))
+        pending.add((history_id, None, None))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        history_cache.invalidate(pending)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending(session, previous_transaction):
+    session.info.pop(_PENDING_KEY, None)
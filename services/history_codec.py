@@ -0,0 +1,151 @@
+import gzip
+import json
+import logging
+from datetime import date
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import zstandard
+except ImportError:  # zstd는 선택 의존성
+    zstandard = None
+
+# 압축 포맷 객체 구조: MAGIC(4) + VERSION(1) + CODEC(1) + compress(헤더 JSON + "\n" + 본문)
+MAGIC = b"JRNL"
+VERSION = 1
+CODEC_IDS = {"gzip": 1, "zstd": 2}
+CODEC_NAMES = {v: k for k, v in CODEC_IDS.items()}
+SUPPORTED_FORMATS = ("text", "gzip", "zstd")
+
+COMPRESSED_CONTENT_TYPE = "application/x-journal-history"
+TEXT_CONTENT_TYPE = "text/plain; charset=utf-8"
+
+
+def _compress(payload: bytes, codec: str, level: Optional[int]) -> bytes:
+    if codec == "gzip":
+        # mtime=0: 같은 내용이면 같은 바이트가 나오도록 (ETag 비교, 중복 업로드 방지)
+        return gzip.compress(payload, compresslevel=level or 6, mtime=0)
+    if codec == "zstd":
+        if zstandard is None:
+            raise ValueError("zstd 포맷을 사용하려면 zstandard 패키지가 필요합니다")
+        return zstandard.ZstdCompressor(level=level or 3).compress(payload)
+    raise ValueError(f"지원하지 않는 압축 방식입니다: {codec}")
+
+
+def _decompress(payload: bytes, codec: str) -> bytes:
+    if codec == "gzip":
+        return gzip.decompress(payload)
+    if codec == "zstd":
+        if zstandard is None:
+            raise ValueError("zstd 객체를 읽으려면 zstandard 패키지가 필요합니다")
+        return zstandard.ZstdDecompressor().decompress(payload)
+    raise ValueError(f"지원하지 않는 압축 방식입니다: {codec}")
+
+
+def render_text(record: dict) -> str:
+    """기존 평문 포맷("날짜:/사용자:/태그:" 머리말)으로 변환합니다."""
+    text = f"날짜: {record['record_date']}\n"
+    text += f"사용자: {record['user_id']}\n"
+    if record.get("tags"):
+        text += f"태그: {', '.join(record['tags'])}\n"
+    text += f"\n내용:\n{record['content']}"
+    return text
+
+
+def parse_legacy_text(text: str) -> dict:
+    """기존 평문 포맷을 레코드(dict)로 파싱합니다."""
+    head, sep, content = text.partition("\n\n내용:\n")
+    if not sep:
+        raise ValueError("히스토리 텍스트 형식이 올바르지 않습니다")
+
+    record = {"record_date": None, "user_id": None, "tags": None, "content": content}
+    for line in head.split("\n"):
+        name, _, value = line.partition(": ")
+        if name == "날짜":
+            record["record_date"] = value
+        elif name == "사용자":
+            record["user_id"] = value
+        elif name == "태그":
+            record["tags"] = [tag for tag in value.split(", ") if tag]
+    return record
+
+
+def detect_format(body: bytes) -> str:
+    """객체 바이트에서 저장 포맷("text" | "gzip" | "zstd")을 판별합니다."""
+    if body[:4] == MAGIC and len(body) >= 6:
+        codec = CODEC_NAMES.get(body[5])
+        if codec is None:
+            raise ValueError(f"알 수 없는 압축 코덱입니다: {body[5]}")
+        return codec
+    return "text"
+
+
+def encode_history(
+    user_id: str,
+    content: str,
+    record_date: date,
+    tags: Optional[list] = None,
+    fmt: str = "text",
+    level: Optional[int] = None,
+) -> bytes:
+    """
+    히스토리를 S3 객체 바이트로 인코딩합니다.
+
+    Args:
+        fmt: "text"(기존 평문), "gzip", "zstd"
+        level: 압축 레벨 (None이면 코덱 기본값)
+    """
+    record = {
+        "record_date": str(record_date),
+        "user_id": user_id,
+        "tags": list(tags) if tags else None,
+        "content": content,
+    }
+    if fmt == "text":
+        return render_text(record).encode("utf-8")
+
+    # 본문을 제외한 메타데이터만 헤더 JSON에 담습니다
+    header = {"v": VERSION, "date": record["record_date"], "user_id": user_id}
+    if record["tags"]:
+        header["tags"] = record["tags"]
+    payload = json.dumps(header, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    payload += b"\n" + content.encode("utf-8")
+
+    return MAGIC + bytes([VERSION, CODEC_IDS[fmt]]) + _compress(payload, fmt, level)
+
+
+def decode_history(body: bytes) -> dict:
+    """
+    S3 객체 바이트(평문/압축 모두)를 레코드로 디코딩합니다.
+
+    Returns:
+        dict: {"record_date", "user_id", "tags", "content"}
+    """
+    fmt = detect_format(body)
+    if fmt == "text":
+        return parse_legacy_text(body.decode("utf-8"))
+
+    if body[4] != VERSION:
+        raise ValueError(f"지원하지 않는 히스토리 포맷 버전입니다: {body[4]}")
+
+    payload = _decompress(body[6:], fmt)
+    header_bytes, _, content_bytes = payload.partition(b"\n")
+    header = json.loads(header_bytes)
+    return {
+        "record_date": header.get("date"),
+        "user_id": header.get("user_id"),
+        "tags": header.get("tags"),
+        "content": content_bytes.decode("utf-8"),
+    }
+
+
+def decode_history_text(body: bytes) -> str:
+    """S3 객체 바이트를 기존 평문 포맷 문자열로 반환합니다 (포맷 무관)."""
+    if detect_format(body) == "text":
+        return body.decode("utf-8")
+    return render_text(decode_history(body))
+
+
+def content_type_for(fmt: str) -> str:
+    return TEXT_CONTENT_TYPE if fmt == "text" else COMPRESSED_CONTENT_TYPE
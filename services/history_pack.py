@@ -0,0 +1,98 @@
+import json
+import struct
+import logging
+from typing import Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# 월별 팩 객체 구조:
+#   [레코드 NDJSON 라인들][인덱스 JSON][푸터 16바이트]
+#   푸터 = 인덱스 오프셋(uint64) + 인덱스 길이(uint32) + MAGIC(4)
+# 레코드 구간이 그대로 NDJSON이므로 Range GET 결과를 변환 없이 스트리밍할 수 있습니다.
+MAGIC = b"JPK1"
+FOOTER = struct.Struct(">QI4s")
+FOOTER_SIZE = FOOTER.size
+# 인덱스는 한 달 최대 31개 항목이라 수 KB 이내 - 꼬리 읽기 한 번으로 푸터와 인덱스를 함께 가져옵니다
+TAIL_READ_SIZE = 8192
+
+
+def encode_record_line(record: dict) -> bytes:
+    """레코드를 NDJSON 한 줄로 인코딩합니다."""
+    line = json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+    return line.encode("utf-8") + b"\n"
+
+
+def build_pack(user_id: str, month: str, records: Iterable[dict]) -> bytes:
+    """
+    한 사용자의 한 달치 레코드를 팩 객체 바이트로 만듭니다.
+
+    Args:
+        user_id: 사용자 ID
+        month: 대상 월 (YYYY-MM)
+        records: {"record_date", "user_id", "tags", "content"} 레코드들
+
+    Returns:
+        bytes: 팩 객체 내용
+    """
+    body = bytearray()
+    entries = []
+    for record in sorted(records, key=lambda r: r["record_date"]):
+        line = encode_record_line(record)
+        entries.append({"date": record["record_date"], "offset": len(body), "length": len(line)})
+        body += line
+
+    index = json.dumps(
+        {"v": 1, "user_id": user_id, "month": month, "entries": entries},
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+    index_offset = len(body)
+    body += index
+    body += FOOTER.pack(index_offset, len(index), MAGIC)
+    return bytes(body)
+
+
+def parse_tail(tail: bytes, object_size: int) -> Optional[dict]:
+    """
+    팩 객체의 꼬리 바이트에서 인덱스를 읽습니다.
+
+    Args:
+        tail: 객체 끝부분 바이트 (최소 푸터 크기)
+        object_size: 객체 전체 크기
+
+    Returns:
+        dict | None: 인덱스 (꼬리에 인덱스 전체가 없으면 None, offset/length만 담긴 dict 반환)
+    """
+    if len(tail) < FOOTER_SIZE:
+        raise ValueError("팩 객체가 너무 작습니다")
+    index_offset, index_length, magic = FOOTER.unpack(tail[-FOOTER_SIZE:])
+    if magic != MAGIC:
+        raise ValueError("팩 객체 형식이 올바르지 않습니다")
+
+    tail_start = object_size - len(tail)
+    start = index_offset - tail_start
+    if start < 0:
+        # 꼬리 읽기 범위를 벗어난 큰 인덱스 - 호출자가 별도로 읽어야 함
+        return {"index_offset": index_offset, "index_length": index_length, "entries": None}
+
+    index = json.loads(tail[start:start + index_length])
+    index["index_offset"] = index_offset
+    index["index_length"] = index_length
+    return index
+
+
+def select_range(index: dict, start_date: Optional[str] = None, end_date: Optional[str] = None) -> Optional[tuple]:
+    """
+    날짜 구간에 해당하는 레코드들의 연속 바이트 범위를 구합니다.
+
+    Returns:
+        tuple | None: (시작 오프셋, 끝 오프셋(포함)) - 해당 레코드가 없으면 None
+    """
+    entries = [
+        e for e in index["entries"]
+        if (start_date is None or e["date"] >= start_date) and (end_date is None or e["date"] <= end_date)
+    ]
+    if not entries:
+        return None
+    # 레코드는 날짜순으로 연속 저장되므로 첫 항목 시작 ~ 마지막 항목 끝이 하나의 범위가 됩니다
+    return entries[0]["offset"], entries[-1]["offset"] + entries[-1]["length"] - 1
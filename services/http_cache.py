@@ -0,0 +1,65 @@
+import logging
+from typing import Optional
+
+from fastapi import Request, Response
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from models.history import History
+
+logger = logging.getLogger(__name__)
+
+# 브라우저/앱이 응답을 저장하되 매번 ETag로 재검증하도록 (사용자별 데이터이므로 private)
+CACHE_CONTROL = "private, no-cache"
+
+
+def _format_etag(*parts) -> str:
+    return 'W/"' + "-".join(str(p) for p in parts) + '"'
+
+
+def _version_stamp(value) -> int:
+    return int(value.timestamp() * 1_000_000) if value else 0
+
+
+def history_user_etag(db: Session, user_id: str, *scope) -> str:
+    """
+    사용자 히스토리 전체의 약한 ETag를 계산합니다.
+
+    (행 수, max(updated_at))을 (user_id, updated_at) 인덱스로만 조회하므로 content를 읽지 않습니다.
+    삭제는 tombstone의 updated_at을 갱신하므로 삭제된 행도 포함해 계산합니다.
+    scope: URL에 드러나지 않지만 응답을 바꾸는 값 (예: 기본값이 오늘인 날짜)
+    """
+    count, last_updated = db.execute(
+        select(func.count(), func.max(History.updated_at)).where(History.user_id == user_id)
+    ).one()
+    return _format_etag("u", count, _version_stamp(last_updated), *scope)
+
+
+def history_item_etag(history_id: int, updated_at) -> str:
+    """기록 하나의 약한 ETag를 계산합니다 (캐시된 스냅샷의 updated_at 사용)."""
+    return _format_etag("h", history_id, _version_stamp(updated_at))
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """If-None-Match가 현재 ETag와 일치하는지 확인합니다 (약한 비교)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    current = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == current for tag in header.split(","))
+
+
+def conditional_response(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """
+    ETag/Cache-Control 헤더를 설정하고, 클라이언트 캐시가 최신이면 304 응답을 반환합니다.
+
+    Returns:
+        Response | None: 304 응답 (None이면 핸들러가 본문을 계속 생성)
+    """
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if is_not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
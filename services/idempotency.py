@@ -0,0 +1,154 @@
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from config import IDEMPOTENCY_TTL_SECONDS, IDEMPOTENCY_LOCK_TIMEOUT_SECONDS
+from database import SessionLocal
+from models.idempotency import IdempotencyKey
+
+logger = logging.getLogger(__name__)
+
+# claim 결과
+CLAIMED = "claimed"  # 이 요청이 처리 권한을 얻음
+REPLAY = "replay"  # 완료된 응답이 있음 - 저장된 응답 반환
+IN_PROGRESS = "in_progress"  # 같은 키의 요청이 처리 중
+MISMATCH = "mismatch"  # 같은 키가 다른 요청 본문에 사용됨
+
+# 만료된 키 정리 주기 (claim N회마다 한 번)
+PURGE_EVERY = 500
+
+
+class IdempotencyStore:
+    """Idempotency-Key 저장소 (PostgreSQL idempotency_keys 테이블, 모든 레플리카가 공유)"""
+
+    def __init__(self):
+        self._claims = 0
+        self._lock = threading.Lock()
+
+    def claim(self, key: str, scope: str, request_hash: str) -> Tuple[str, Optional[IdempotencyKey]]:
+        """
+        키에 대한 처리 권한을 얻습니다.
+
+        INSERT ... ON CONFLICT DO NOTHING으로 선점하므로 같은 키의 요청이 동시에 들어와도
+        정확히 하나만 CLAIMED를 받습니다.
+        """
+        now = datetime.now(timezone.utc)
+        self._maybe_purge()
+
+        db = SessionLocal()
+        try:
+            # 만료된 같은 키는 지우고 새로 선점
+            db.execute(delete(IdempotencyKey).where(
+                IdempotencyKey.key == key,
+                IdempotencyKey.scope == scope,
+                IdempotencyKey.expires_at < now
+            ))
+            inserted = db.execute(
+                insert(IdempotencyKey)
+                .values(
+                    key=key,
+                    scope=scope,
+                    request_hash=request_hash,
+                    status="processing",
+                    created_at=now,
+                    expires_at=now + timedelta(seconds=IDEMPOTENCY_TTL_SECONDS)
+                )
+                .on_conflict_do_nothing()
+                .returning(IdempotencyKey.key)
+            ).first()
+            db.commit()
+            if inserted:
+                return CLAIMED, None
+
+            record = db.execute(select(IdempotencyKey).where(
+                IdempotencyKey.key == key,
+                IdempotencyKey.scope == scope
+            )).scalar_one_or_none()
+            if record is None:
+                # 그 사이 다른 요청이 처리 실패로 키를 해제함 - 재시도 요청으로 간주
+                return IN_PROGRESS, None
+            if record.request_hash != request_hash:
+                return MISMATCH, None
+            if record.status == "completed":
+                return REPLAY, record
+
+            # 처리 중이던 워커가 죽어 오래 남은 키는 인계받음
+            stale_before = now - timedelta(seconds=IDEMPOTENCY_LOCK_TIMEOUT_SECONDS)
+            taken = db.execute(
+                update(IdempotencyKey)
+                .where(
+                    IdempotencyKey.key == key,
+                    IdempotencyKey.scope == scope,
+                    IdempotencyKey.status == "processing",
+                    IdempotencyKey.created_at < stale_before
+                )
+                .values(created_at=now)
+                .returning(IdempotencyKey.key)
+            ).first()
+            db.commit()
+            return (CLAIMED, None) if taken else (IN_PROGRESS, None)
+        finally:
+            db.close()
+
+    def complete(self, key: str, scope: str, status_code: int, content_type: Optional[str], body: bytes, headers: List[List[str]]) -> None:
+        """처리 결과를 저장합니다. 이후 같은 키의 요청은 이 응답을 그대로 받습니다."""
+        db = SessionLocal()
+        try:
+            db.execute(
+                update(IdempotencyKey)
+                .where(IdempotencyKey.key == key, IdempotencyKey.scope == scope)
+                .values(
+                    status="completed",
+                    status_code=status_code,
+                    content_type=content_type,
+                    response_body=body.decode("utf-8"),
+                    response_headers=headers
+                )
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    def release(self, key: str, scope: str) -> None:
+        """처리에 실패한 키를 해제합니다 (재시도 시 다시 처리)."""
+        db = SessionLocal()
+        try:
+            db.execute(delete(IdempotencyKey).where(
+                IdempotencyKey.key == key,
+                IdempotencyKey.scope == scope,
+                IdempotencyKey.status == "processing"
+            ))
+            db.commit()
+        finally:
+            db.close()
+
+    def purge_expired(self) -> int:
+        """만료된 키를 삭제합니다."""
+        db = SessionLocal()
+        try:
+            result = db.execute(delete(IdempotencyKey).where(
+                IdempotencyKey.expires_at < datetime.now(timezone.utc)
+            ))
+            db.commit()
+            return result.rowcount
+        finally:
+            db.close()
+
+    def _maybe_purge(self) -> None:
+        with self._lock:
+            self._claims += 1
+            if self._claims % PURGE_EVERY:
+                return
+        try:
+            purged = self.purge_expired()
+            logger.info(f"만료된 Idempotency-Key 정리: {purged}건")
+        except Exception as e:
+            logger.warning(f"Idempotency-Key 정리 실패 (계속 진행): {e}")
+
+
+# 싱글톤 인스턴스
+idempotency_store = IdempotencyStore()
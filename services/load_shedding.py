@@ -0,0 +1,126 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+
+import anyio.to_thread
+
+from config import (
+    LOAD_SHED_COOLDOWN_SECONDS,
+    LOAD_SHED_LOOP_LAG_MS,
+    LOAD_SHED_MAX_IN_FLIGHT,
+    LOAD_SHED_MAX_THREADPOOL_QUEUE,
+    LOAD_SHED_SAMPLE_INTERVAL_MS,
+)
+from services.metrics import EVENT_LOOP_LAG, LOAD_SHEDDING, THREADPOOL_QUEUE
+
+logger = logging.getLogger(__name__)
+
+# 이벤트 루프 지연 평활 계수 (GC 등 한 번의 멈춤으로 바로 과부하가 되지 않도록)
+LAG_SMOOTHING = 0.5
+
+
+class LoadMonitor:
+    """
+    워커 프로세스의 부하 상태 (이벤트 루프 지연, 처리 중인 요청 수, 스레드풀 대기 작업 수)
+
+    이벤트 루프에서 주기적으로 짧게 sleep해서 예정보다 늦게 깨어난 시간을 루프 지연으로 재고,
+    같은 주기에 스레드풀 대기 작업 수를 읽습니다. 하나라도 기준을 넘으면 과부하(shedding)가 되고,
+    모든 지표가 cooldown_seconds 동안 기준 아래여야 해제됩니다.
+    처리 중인 요청 수는 LoadSheddingMiddleware가 요청마다 바로 갱신합니다.
+    """
+
+    def __init__(
+        self,
+        max_loop_lag_ms: float,
+        max_in_flight: int,
+        max_threadpool_queue: int,
+        cooldown_seconds: float,
+        sample_interval_ms: float,
+    ):
+        self.max_loop_lag = max_loop_lag_ms / 1000
+        self.max_in_flight = max_in_flight
+        self.max_threadpool_queue = max_threadpool_queue
+        self.cooldown_seconds = cooldown_seconds
+        self.sample_interval = sample_interval_ms / 1000
+
+        self.loop_lag = 0.0
+        self.in_flight = 0
+        self.threadpool_queue = 0
+        self.shedding = False
+        self.reason: Optional[str] = None
+        self.shedding_since: Optional[float] = None
+        self._last_overload = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def overload_reason(self) -> Optional[str]:
+        """기준을 넘은 지표 이름 (없으면 None)"""
+        if self.max_loop_lag and self.loop_lag > self.max_loop_lag:
+            return "loop_lag"
+        if self.max_threadpool_queue and self.threadpool_queue > self.max_threadpool_queue:
+            return "threadpool_queue"
+        if self.max_in_flight and self.in_flight > self.max_in_flight:
+            return "in_flight"
+        return None
+
+    def update(self, now: Optional[float] = None) -> None:
+        """현재 지표로 과부하 상태를 갱신합니다 (샘플링 주기마다 호출)."""
+        now = time.monotonic() if now is None else now
+        reason = self.overload_reason()
+        if reason:
+            self._last_overload = now
+            if not self.shedding:
+                self.shedding = True
+                self.shedding_since = now
+                logger.warning(
+                    f"과부하 - 우선순위 낮은 요청 거절 시작 ({reason}): 루프 지연 {self.loop_lag * 1000:.0f}ms, "
+                    f"처리 중 {self.in_flight}, 스레드풀 대기 {self.threadpool_queue}"
+                )
+            self.reason = reason
+        elif self.shedding and now - self._last_overload >= self.cooldown_seconds:
+            logger.info(f"과부하 해제 ({now - self.shedding_since:.1f}초 동안 거절)")
+            self.shedding = False
+            self.reason = None
+            self.shedding_since = None
+        LOAD_SHEDDING.set(1 if self.shedding else 0)
+
+    async def run(self):
+        """샘플링 루프 (lifespan에서 태스크로 실행)"""
+        limiter = anyio.to_thread.current_default_thread_limiter()
+        while True:
+            expected = time.monotonic() + self.sample_interval
+            await asyncio.sleep(self.sample_interval)
+            lag = max(0.0, time.monotonic() - expected)
+            self.loop_lag = LAG_SMOOTHING * lag + (1 - LAG_SMOOTHING) * self.loop_lag
+            self.threadpool_queue = limiter.statistics().tasks_waiting
+            EVENT_LOOP_LAG.set(self.loop_lag)
+            THREADPOOL_QUEUE.set(self.threadpool_queue)
+            self.update()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def status(self) -> dict:
+        return {
+            "shedding": self.shedding,
+            "reason": self.reason,
+            "loop_lag_ms": round(self.loop_lag * 1000, 1),
+            "in_flight": self.in_flight,
+            "threadpool_queue": self.threadpool_queue,
+        }
+
+
+# 싱글톤 인스턴스
+load_monitor = LoadMonitor(
+    max_loop_lag_ms=LOAD_SHED_LOOP_LAG_MS,
+    max_in_flight=LOAD_SHED_MAX_IN_FLIGHT,
+    max_threadpool_queue=LOAD_SHED_MAX_THREADPOOL_QUEUE,
+    cooldown_seconds=LOAD_SHED_COOLDOWN_SECONDS,
+    sample_interval_ms=LOAD_SHED_SAMPLE_INTERVAL_MS,
+)
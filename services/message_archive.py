@@ -0,0 +1,145 @@
+import gzip
+import logging
+import os
+from datetime import date, datetime, timedelta
+from typing import List, Optional, Tuple
+
+import orjson
+from sqlalchemy import delete, exists, func, select
+from sqlalchemy.orm import Session
+
+from models.history import History
+from models.message import Message
+from services.fast_json import ORJSON_OPTIONS
+from services.message_partitions import KST
+
+logger = logging.getLogger(__name__)
+
+# 메시지의 KST 날짜 (History.record_date와 같은 기준)
+MESSAGE_DAY = func.date(func.timezone("Asia/Seoul", Message.created_at))
+
+
+class LocalArchiveStore:
+    """로컬 디렉토리 보관소 ({base_dir}/{user_id}/messages-archive/YYYY/MM/YYYY-MM-DD.ndjson.gz)"""
+
+    def __init__(self, base_dir: str):
+        self.base_dir = base_dir
+
+    def _path(self, user_id: str, day: date) -> str:
+        return os.path.join(
+            self.base_dir, user_id, "messages-archive", day.strftime("%Y"), day.strftime("%m"), f"{day.isoformat()}.ndjson.gz"
+        )
+
+    def load(self, user_id: str, day: date) -> Optional[bytes]:
+        try:
+            with open(self._path(user_id, day), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def save(self, user_id: str, day: date, body: bytes) -> str:
+        path = self._path(user_id, day)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(body)
+        os.replace(tmp_path, path)
+        return path
+
+
+class S3ArchiveStore:
+    """S3 보관소 (S3Service.save_message_archive / load_message_archive)"""
+
+    def load(self, user_id: str, day: date) -> Optional[bytes]:
+        from services.s3 import s3_service
+        return s3_service.load_message_archive(user_id, day)
+
+    def save(self, user_id: str, day: date, body: bytes) -> str:
+        # 로컬 보관만 쓸 때는 S3Service(S3_BUCKET_NAME 필수)를 만들지 않도록 지연 import
+        from services.s3 import s3_service
+        return s3_service.save_message_archive(user_id, day, body)
+
+
+def day_bounds(day: date) -> Tuple[datetime, datetime]:
+    """KST 하루의 [시작, 끝) 시각"""
+    start = datetime(day.year, day.month, day.day, tzinfo=KST)
+    return start, start + timedelta(days=1)
+
+
+def find_archivable_days(db: Session, before: date, limit: int = 10000) -> List[Tuple[str, date]]:
+    """
+    before 이전 날짜 중 History 요약이 저장된 (user_id, 날짜) 목록을 반환합니다.
+    요약이 없는 날의 메시지는 보관하지 않습니다 (아직 요약 전일 수 있음).
+    """
+    summarized = exists().where(
+        History.user_id == Message.user_id,
+        History.record_date == MESSAGE_DAY,
+        History.deleted_at.is_(None)
+    )
+    rows = db.execute(
+        select(Message.user_id, MESSAGE_DAY.label("day"))
+        .where(Message.created_at < day_bounds(before)[0], summarized)
+        .group_by(Message.user_id, MESSAGE_DAY)
+        .order_by(MESSAGE_DAY)
+        .limit(limit)
+    ).all()
+    return [(row.user_id, row.day) for row in rows]
+
+
+def _message_record(m) -> dict:
+    return {"id": m.id, "user_id": m.user_id, "content": m.content, "created_at": m.created_at}
+
+
+def encode_messages(records) -> bytes:
+    """메시지 dict 목록을 gzip NDJSON으로 인코딩합니다."""
+    lines = b"".join(orjson.dumps(record, option=ORJSON_OPTIONS) + b"\n" for record in records)
+    return gzip.compress(lines, compresslevel=6)
+
+
+def decode_messages(body: bytes) -> List[dict]:
+    """encode_messages로 만든 gzip NDJSON을 메시지 dict 목록으로 읽습니다 (id, created_at은 문자열)."""
+    return [orjson.loads(line) for line in gzip.decompress(body).splitlines() if line]
+
+
+def merge_archived(archived: List[dict], messages) -> List[dict]:
+    """이미 보관된 메시지에 새 메시지를 id 기준으로 합칩니다 (같은 id는 새 값, created_at 순)."""
+    merged = {item["id"]: item for item in archived}
+    for m in messages:
+        # 보관 객체와 같은 문자열 형식으로 맞춤 (UTC Z 형식 ISO 문자열이라 문자열 순서가 시간 순서)
+        merged[str(m.id)] = orjson.loads(orjson.dumps(_message_record(m), option=ORJSON_OPTIONS))
+    return sorted(merged.values(), key=lambda item: item["created_at"])
+
+
+def archive_day(db: Session, store, user_id: str, day: date, dry_run: bool = False) -> int:
+    """
+    한 사용자의 하루치 메시지를 보관소에 저장하고 messages에서 삭제합니다.
+    보관소 저장이 끝난 뒤에 삭제하므로 중간에 실패해도 다시 실행하면 됩니다.
+    이미 보관된 날에 메시지가 더 쌓였으면(/messages/batch의 지난 created_at 등) 기존 보관 객체를 읽어
+    id 기준으로 합친 뒤 저장합니다 - 새로 찾은 메시지만으로 덮어쓰지 않음.
+    삭제 표시(tombstone) 행은 보관하지 않고 함께 삭제합니다.
+
+    Returns:
+        int: 보관한 메시지 수
+    """
+    start, end = day_bounds(day)
+    in_day = (Message.user_id == user_id, Message.created_at >= start, Message.created_at < end)
+    messages = db.execute(
+        select(Message.id, Message.user_id, Message.content, Message.created_at)
+        .where(*in_day, Message.deleted_at.is_(None))
+        .order_by(Message.created_at)
+    ).all()
+
+    if dry_run:
+        return len(messages)
+
+    if messages:
+        # 보관 객체는 하루에 하나라 덮어쓰므로, 기존 보관분을 빠뜨리면 영구히 사라짐
+        archived = store.load(user_id, day)
+        if archived is None:
+            records = [_message_record(m) for m in messages]
+        else:
+            records = merge_archived(decode_messages(archived), messages)
+        store.save(user_id, day, encode_messages(records))
+    db.execute(delete(Message).where(*in_day))
+    db.commit()
+    return len(messages)
@@ -0,0 +1,135 @@
+import logging
+import uuid
+from datetime import date, datetime
+from typing import List, Tuple
+
+from sqlalchemy import exists, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session, undefer
+
+from database import SessionLocal
+from models.history import History
+from models.message import Message
+from services.message_archive import MESSAGE_DAY, day_bounds
+from services.message_partitions import KST
+
+logger = logging.getLogger(__name__)
+
+
+def compact_day(db: Session, user_id: str, day: date) -> int:
+    """
+    요약(History)이 저장된 날의 메시지를 history.raw_messages(JSONB 배열)로 옮기고
+    messages에서는 삭제 표시(내용 비움)로 바꿉니다.
+
+    삭제 표시로 남기는 이유는 /sync 클라이언트가 로컬 메시지를 지울 수 있도록 하기 위함이며,
+    삭제 표시 행은 purge_tombstones / archive_messages 작업에서 물리적으로 삭제됩니다.
+    이미 압축된 날에 메시지가 더 쌓였으면 id 기준으로 합칩니다 (여러 번 실행해도 안전).
+
+    Returns:
+        int: 새로 압축한 메시지 수 (그날 요약이 없으면 0)
+    """
+    history = db.execute(
+        select(History)
+        .options(undefer(History.raw_messages))
+        .where(History.user_id == user_id, History.record_date == day, History.deleted_at.is_(None))
+        .with_for_update()
+    ).scalar_one_or_none()
+    if history is None:
+        db.rollback()
+        return 0
+
+    start, end = day_bounds(day)
+    in_day = (Message.user_id == user_id, Message.created_at >= start, Message.created_at < end)
+    messages = db.execute(
+        select(Message.id, Message.content, Message.created_at)
+        .where(*in_day, Message.deleted_at.is_(None))
+        .order_by(Message.created_at)
+    ).all()
+    if not messages:
+        db.rollback()
+        return 0
+
+    compacted = list(history.raw_messages or [])
+    seen = {item["id"] for item in compacted}
+    for message in messages:
+        if str(message.id) not in seen:
+            compacted.append({
+                "id": str(message.id),
+                "content": message.content,
+                "created_at": message.created_at.isoformat(),
+            })
+    compacted.sort(key=lambda item: item["created_at"])
+    history.raw_messages = compacted
+
+    db.execute(
+        update(Message)
+        .where(*in_day, Message.id.in_([message.id for message in messages]))
+        .values(content="", deleted_at=func.now())
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    logger.info(f"메시지 압축 완료: {user_id} {day} ({len(messages)}건)")
+    return len(messages)
+
+
+def restore_day(db: Session, history: History) -> int:
+    """
+    compact_day를 되돌립니다 - history.raw_messages의 메시지를 messages 테이블에 다시 살리고 raw_messages를 비움 (커밋은 호출자).
+
+    요약을 삭제해도 원본 메시지는 남아 있어야 다시 요약할 수 있으므로 기록 삭제 시 호출합니다.
+    삭제 표시 행은 내용을 되돌리고, 이미 물리적으로 삭제된 행은 다시 만듭니다 (updated_at이 바뀌어 /sync에도 반영).
+
+    Returns:
+        int: 되살린 메시지 수
+    """
+    compacted = history.raw_messages or []
+    if compacted:
+        stmt = insert(Message)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Message.id, Message.created_at],
+            set_={"content": stmt.excluded.content, "deleted_at": None, "updated_at": func.now()},
+        )
+        db.execute(stmt, [
+            {
+                "id": uuid.UUID(item["id"]),
+                "user_id": history.user_id,
+                "content": item["content"],
+                "created_at": datetime.fromisoformat(item["created_at"]),
+            }
+            for item in compacted
+        ])
+    history.raw_messages = None
+    return len(compacted)
+
+
+def compact_day_in_background(user_id: str, day: date) -> None:
+    """요청이 끝난 뒤 실행되는 압축 작업 (BackgroundTasks용, 세션을 직접 열고 닫음)"""
+    db = SessionLocal()
+    try:
+        compact_day(db, user_id, day)
+    except Exception as e:
+        db.rollback()
+        logger.error(f"메시지 압축 실패 (다음 정리 작업에서 재시도): {user_id} {day} - {e}")
+    finally:
+        db.close()
+
+
+def find_compactable_days(db: Session, before: date, limit: int = 10000) -> List[Tuple[str, date]]:
+    """before 이전 날짜 중 요약이 있고 아직 압축되지 않은 메시지가 남은 (user_id, 날짜) 목록"""
+    summarized = exists().where(
+        History.user_id == Message.user_id,
+        History.record_date == MESSAGE_DAY,
+        History.deleted_at.is_(None)
+    )
+    rows = db.execute(
+        select(Message.user_id, MESSAGE_DAY.label("day"))
+        .where(Message.created_at < day_bounds(before)[0], Message.deleted_at.is_(None), summarized)
+        .group_by(Message.user_id, MESSAGE_DAY)
+        .order_by(MESSAGE_DAY)
+        .limit(limit)
+    ).all()
+    return [(row.user_id, row.day) for row in rows]
+
+
+def today_kst() -> date:
+    return datetime.now(KST).date()
@@ -0,0 +1,127 @@
+import logging
+import re
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from config import MESSAGE_PARTITION_MONTHS_AHEAD
+
+logger = logging.getLogger(__name__)
+
+# 파티션 경계는 KST 자정 기준 (하루치 메시지가 두 파티션에 나뉘지 않도록)
+KST = timezone(timedelta(hours=9))
+PARTITION_NAME = re.compile(r"^messages_(\d{4})_(\d{2})$")
+DEFAULT_PARTITION = "messages_default"
+
+
+def add_months(year: int, month: int, months: int) -> Tuple[int, int]:
+    index = year * 12 + (month - 1) + months
+    return index // 12, index % 12 + 1
+
+
+def partition_name(year: int, month: int) -> str:
+    return f"messages_{year:04d}_{month:02d}"
+
+
+def partition_bounds(year: int, month: int) -> Tuple[datetime, datetime]:
+    """월 파티션의 [시작, 끝) 경계 (KST 월 경계)"""
+    next_year, next_month = add_months(year, month, 1)
+    return datetime(year, month, 1, tzinfo=KST), datetime(next_year, next_month, 1, tzinfo=KST)
+
+
+def is_partitioned(engine: Engine) -> bool:
+    """messages가 파티션 테이블인지 확인합니다 (마이그레이션 004 적용 전이면 False)."""
+    with engine.connect() as conn:
+        return conn.execute(text(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('messages'))"
+        )).scalar()
+
+
+def list_partitions(engine: Engine) -> List[Tuple[str, Optional[Tuple[int, int]]]]:
+    """
+    messages의 파티션 목록을 반환합니다.
+
+    Returns:
+        list: (파티션 이름, (연, 월) 또는 None(기본 파티션 등)) 목록 (이름순)
+    """
+    with engine.connect() as conn:
+        names = conn.execute(text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = to_regclass('messages') ORDER BY c.relname"
+        )).scalars().all()
+    partitions = []
+    for name in names:
+        match = PARTITION_NAME.match(name)
+        partitions.append((name, (int(match.group(1)), int(match.group(2))) if match else None))
+    return partitions
+
+
+def ensure_partitions(engine: Engine, today: Optional[date] = None, months_ahead: int = MESSAGE_PARTITION_MONTHS_AHEAD) -> List[str]:
+    """
+    이번 달부터 months_ahead개월 뒤까지의 월 파티션과 기본 파티션을 만듭니다 (이미 있으면 건너뜀).
+    배포 시 scripts.init_db(PreSync Job)와 매일 도는 scripts.archive_messages(CronJob)에서 호출하므로
+    매달 따로 파티션을 만들 필요가 없습니다. 앱 시작 경로에서는 호출하지 않습니다.
+
+    Returns:
+        list: 새로 만든 파티션 이름
+    """
+    if not is_partitioned(engine):
+        logger.warning("messages가 파티션 테이블이 아닙니다 - migrations/004_messages_partitioning.sql 적용 필요")
+        return []
+
+    today = today or datetime.now(KST).date()
+    existing = {name for name, _ in list_partitions(engine)}
+    created = []
+    for offset in range(months_ahead + 1):
+        year, month = add_months(today.year, today.month, offset)
+        name = partition_name(year, month)
+        if name in existing:
+            continue
+        start, end = partition_bounds(year, month)
+        try:
+            with engine.begin() as conn:
+                conn.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF messages "
+                    f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+                ))
+            created.append(name)
+            logger.info(f"메시지 파티션 생성: {name}")
+        except Exception as e:
+            # 기본 파티션에 이미 해당 월 행이 있으면 생성 실패 - 행을 옮긴 뒤 다시 실행해야 함
+            logger.error(f"메시지 파티션 생성 실패: {name} - {e}")
+
+    if DEFAULT_PARTITION not in existing:
+        # 범위 밖(먼 과거/미래 created_at)의 행을 받는 기본 파티션 - INSERT 실패 방지
+        with engine.begin() as conn:
+            conn.execute(text(f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF messages DEFAULT"))
+        created.append(DEFAULT_PARTITION)
+    return created
+
+
+def drop_empty_partitions(engine: Engine, before: date, dry_run: bool = False) -> List[str]:
+    """
+    before 이전에 끝나는 월 파티션 중 비어 있는 것을 삭제합니다.
+    DELETE + VACUUM 대신 DROP TABLE로 공간을 바로 반환합니다.
+
+    Returns:
+        list: 삭제한 (dry_run이면 삭제 대상) 파티션 이름
+    """
+    dropped = []
+    for name, month in list_partitions(engine):
+        if month is None:
+            continue
+        _, end = partition_bounds(*month)
+        if end.date() > before:
+            continue
+        with engine.begin() as conn:
+            has_rows = conn.execute(text(f"SELECT EXISTS (SELECT 1 FROM {name})")).scalar()
+            if has_rows:
+                logger.info(f"파티션에 보관되지 않은 메시지가 남아 있어 유지: {name}")
+                continue
+            if not dry_run:
+                conn.execute(text(f"DROP TABLE {name}"))
+        dropped.append(name)
+        logger.info(f"빈 메시지 파티션 삭제{' (dry-run)' if dry_run else ''}: {name}")
+    return dropped
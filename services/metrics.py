@@ -0,0 +1,211 @@
+import functools
+import inspect
+import logging
+import os
+import time
+from contextlib import contextmanager, nullcontext
+
+import httpx
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+from config import METRICS_ENABLED
+
+logger = logging.getLogger(__name__)
+
+# 라벨 값은 항상 유한한 집합만 사용 (user_id, 경로 파라미터 값 등은 넣지 않음)
+UNMATCHED_ROUTE = "unmatched"
+AGENT_REQUEST_TYPES = {"summarize", "question"}
+
+# 멀티 프로세스(gunicorn 워커) 모드 - 값을 PROMETHEUS_MULTIPROC_DIR의 파일에 쓰고 스크레이프 때 모든 워커 값을 합침
+# (gunicorn.conf.py가 앱 import 전에 설정)
+MULTIPROCESS = bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+
+HTTP_REQUESTS = Counter(
+    "journal_http_requests_total", "HTTP 요청 수", ["method", "route", "status"]
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "journal_http_request_duration_seconds", "HTTP 요청 처리 시간 (라우트 템플릿 기준)", ["method", "route"]
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "journal_http_requests_in_progress", "처리 중인 HTTP 요청 수", multiprocess_mode="livesum"
+)
+
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "journal_db_pool_checkout_wait_seconds", "커넥션 풀 체크아웃 대기 시간 (새 연결 생성 포함)",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+DB_POOL_CHECKOUT_TIMEOUTS = Counter(
+    "journal_db_pool_checkout_timeouts_total", "커넥션 풀 체크아웃 타임아웃 수"
+)
+DB_POOL_CONNECTIONS_CREATED = Counter(
+    "journal_db_pool_connections_created_total", "새로 만든 DB 연결 수"
+)
+DB_POOL_CHECKED_OUT = Gauge("journal_db_pool_checked_out", "사용 중인 DB 연결 수", multiprocess_mode="livesum")
+DB_POOL_OVERFLOW = Gauge("journal_db_pool_overflow", "pool_size를 넘어 만든 연결 수 (음수면 아직 만들지 않은 기본 연결 수)", multiprocess_mode="livesum")
+DB_POOL_IDLE = Gauge("journal_db_pool_idle", "풀에서 쉬고 있는 DB 연결 수", multiprocess_mode="livesum")
+
+S3_REQUESTS = Counter(
+    "journal_s3_requests_total", "S3Service 메서드 호출 수", ["method", "outcome"]
+)
+S3_REQUEST_DURATION = Histogram(
+    "journal_s3_request_duration_seconds", "S3Service 메서드 실행 시간", ["method"]
+)
+
+RATE_LIMITED_REQUESTS = Counter(
+    "journal_rate_limited_requests_total", "속도 제한으로 거절한 요청 수 (429)", ["policy"]
+)
+
+SHED_REQUESTS = Counter(
+    "journal_shed_requests_total", "과부하로 거절한 요청 수 (503)", ["reason"]
+)
+LOAD_SHEDDING = Gauge("journal_load_shedding", "과부하 상태인 워커 수 (1이면 우선순위 낮은 요청 거절 중)", multiprocess_mode="livesum")
+EVENT_LOOP_LAG = Gauge("journal_event_loop_lag_seconds", "이벤트 루프 지연 (평활값)", multiprocess_mode="livemax")
+THREADPOOL_QUEUE = Gauge("journal_threadpool_queue_depth", "스레드풀 스레드를 기다리는 작업 수", multiprocess_mode="livesum")
+
+AGENT_API_REQUESTS = Counter(
+    "journal_agent_api_requests_total", "Agent API 호출 수", ["request_type", "outcome"]
+)
+AGENT_API_REQUEST_DURATION = Histogram(
+    "journal_agent_api_request_duration_seconds", "Agent API 호출 시간", ["request_type"],
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60)
+)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """체크아웃 대기 시간/타임아웃을 기록하는 QueuePool (engine.dispose() 후 새 풀도 같은 클래스)"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            DB_POOL_CHECKOUT_TIMEOUTS.inc()
+            raise
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start)
+            if MULTIPROCESS:
+                self._update_gauges()
+
+    def _do_return_conn(self, record):
+        super()._do_return_conn(record)
+        if MULTIPROCESS:
+            self._update_gauges()
+
+    def _update_gauges(self):
+        # 멀티 프로세스 모드에서는 set_function을 쓸 수 없어 체크아웃/반납 때 값을 기록
+        DB_POOL_CHECKED_OUT.set(self.checkedout())
+        DB_POOL_OVERFLOW.set(self.overflow())
+        DB_POOL_IDLE.set(self.checkedin())
+
+    def _create_connection(self):
+        DB_POOL_CONNECTIONS_CREATED.inc()
+        return super()._create_connection()
+
+
+# METRICS_ENABLED=false면 풀 계측 없이 기본 QueuePool 사용
+POOL_CLASS = InstrumentedQueuePool if METRICS_ENABLED else QueuePool
+
+
+def register_pool_metrics(engine):
+    """
+    풀 상태 게이지 등록 - 스크레이프 시점에 engine.pool(교체된 풀 포함)을 읽으므로 요청 경로 비용 없음
+    (멀티 프로세스 모드에서는 InstrumentedQueuePool이 체크아웃/반납 때 기록)
+    """
+    if MULTIPROCESS:
+        return
+    DB_POOL_CHECKED_OUT.set_function(lambda: engine.pool.checkedout())
+    DB_POOL_OVERFLOW.set_function(lambda: engine.pool.overflow())
+    DB_POOL_IDLE.set_function(lambda: engine.pool.checkedin())
+
+
+def observe_s3(fn):
+    """S3Service 메서드의 호출 수/시간 기록 (제너레이터는 마지막 청크까지의 시간, METRICS_ENABLED=false면 감싸지 않음)"""
+    if not METRICS_ENABLED:
+        return fn
+    method = fn.__name__
+    duration = S3_REQUEST_DURATION.labels(method)
+    success = S3_REQUESTS.labels(method, "success")
+    error = S3_REQUESTS.labels(method, "error")
+
+    if inspect.isgeneratorfunction(fn):
+        @functools.wraps(fn)
+        def generator_wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                yield from fn(*args, **kwargs)
+            except Exception:
+                error.inc()
+                raise
+            else:
+                success.inc()
+            finally:
+                duration.observe(time.perf_counter() - start)
+        return generator_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            error.inc()
+            raise
+        finally:
+            duration.observe(time.perf_counter() - start)
+        success.inc()
+        return result
+    return wrapper
+
+
+def agent_request_type_label(request_type) -> str:
+    if request_type is None:
+        return "auto"
+    return request_type if request_type in AGENT_REQUEST_TYPES else "other"
+
+
+def observe_agent_call(request_type):
+    """Agent API 호출 수/시간 기록 (METRICS_ENABLED=false면 아무것도 하지 않음)"""
+    if not METRICS_ENABLED:
+        return nullcontext()
+    return _observe_agent_call(request_type)
+
+
+@contextmanager
+def _observe_agent_call(request_type):
+    """
+    Agent API 호출 수/시간 기록
+
+    outcome: success | timeout | http_error | connect_error | error
+    (AgentAPIService가 httpx 예외를 Exception으로 감싸므로 원래 예외(__context__)로 구분)
+    """
+    label = agent_request_type_label(request_type)
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        cause = e.__context__ if e.__context__ is not None else e
+        if isinstance(cause, httpx.TimeoutException):
+            outcome = "timeout"
+        elif isinstance(cause, httpx.HTTPStatusError):
+            outcome = "http_error"
+        elif isinstance(cause, httpx.RequestError):
+            outcome = "connect_error"
+        else:
+            outcome = "error"
+        AGENT_API_REQUESTS.labels(label, outcome).inc()
+        raise
+    else:
+        AGENT_API_REQUESTS.labels(label, "success").inc()
+    finally:
+        AGENT_API_REQUEST_DURATION.labels(label).observe(time.perf_counter() - start)
+
+
+def render_metrics():
+    """Prometheus 텍스트 포맷 (본문, Content-Type) - 멀티 프로세스 모드면 모든 워커의 값을 합침"""
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
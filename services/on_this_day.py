@@ -0,0 +1,80 @@
+import calendar
+from datetime import date
+from typing import List
+
+from sqlalchemy import extract, select
+from sqlalchemy.dialects.postgresql import array
+from sqlalchemy.orm import Session
+
+from models.history import History
+
+# 캐시에는 관련 기록을 이만큼 저장하고 요청한 수만큼 잘라서 반환
+RELATED_MAX = 20
+
+
+def _month_days(target: date) -> List[int]:
+    """target과 같은 날로 볼 일(day) 목록 - 평년 2월 28일에는 윤년의 2월 29일 기록도 포함"""
+    if target.month == 2 and target.day == 28 and not calendar.isleap(target.year):
+        return [28, 29]
+    return [target.day]
+
+
+def compute_on_this_day(db: Session, user_id: str, target: date) -> dict:
+    """
+    이 날의 기록과 관련 기록을 계산합니다.
+
+    - same_day: 이전 해들의 같은 월/일 기록 (최신순) - (user_id, 월, 일) 표현식 인덱스 한 번 조회
+    - related: same_day와 target 당일 기록의 태그를 가장 많이 공유하는 다른 날 기록 최대 RELATED_MAX개
+      (content는 읽지 않고 사용자 기록의 tags를 && 조건으로 걸러 Python에서 겹치는 수를 셈)
+    """
+    # target 당일도 같은 월/일이므로 함께 읽어 관련 기록 기준 태그로만 씀 (별도 조회 없음)
+    rows = db.execute(
+        select(History.id, History.record_date, History.content, History.tags, History.s3_key, History.text_url)
+        .where(
+            History.user_id == user_id,
+            extract("month", History.record_date) == target.month,
+            extract("day", History.record_date).in_(_month_days(target)),
+            History.record_date <= target,
+            History.deleted_at.is_(None)
+        )
+        .order_by(History.record_date.desc())
+    )
+    anchor_tags = set()
+    same_day = []
+    for row in rows:
+        anchor_tags.update(row.tags or ())
+        if row.record_date == target:
+            continue
+        entry = dict(row._mapping)
+        entry["years_ago"] = target.year - row.record_date.year
+        same_day.append(entry)
+
+    related = []
+    if anchor_tags:
+        excluded = {entry["record_date"] for entry in same_day} | {target}
+        rows = db.execute(
+            select(History.id, History.record_date, History.tags, History.s3_key)
+            .where(
+                History.user_id == user_id,
+                # tags는 일반 ARRAY 타입이라 overlap()이 없어 && 연산자를 직접 사용
+                History.tags.op("&&")(array(sorted(anchor_tags))),
+                History.deleted_at.is_(None)
+            )
+        ).all()
+        for row in rows:
+            if row.record_date in excluded:
+                continue
+            shared = sorted(set(row.tags) & anchor_tags)
+            related.append({
+                "id": row.id,
+                "record_date": row.record_date,
+                "tags": row.tags,
+                "s3_key": row.s3_key,
+                "shared_tags": shared,
+                "score": len(shared),
+            })
+        # 공유 태그가 많은 순, 같으면 최근 기록 먼저
+        related.sort(key=lambda entry: (-entry["score"], -entry["record_date"].toordinal()))
+        related = related[:RELATED_MAX]
+
+    return {"same_day": same_day, "related": related}
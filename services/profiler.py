@@ -0,0 +1,168 @@
+import asyncio
+import contextvars
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from config import PROFILING_BUFFER_SIZE, PROFILING_INTERVAL_MS
+
+logger = logging.getLogger(__name__)
+
+# 프로파일링 중인 요청의 세션 - 동기 핸들러가 도는 스레드풀 워커에도 컨텍스트가 복사됨
+_current_session: contextvars.ContextVar[Optional["ProfileSession"]] = contextvars.ContextVar("profile_session", default=None)
+
+# 워커 스레드 스택의 아래쪽 몇 프레임에서 요청 컨텍스트(contextvars.Context)를 찾음 (anyio WorkerThread.run)
+WORKER_CONTEXT_SEARCH_DEPTH = 8
+MAX_STACK_DEPTH = 128
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _collapse(frame) -> str:
+    """프레임 체인을 collapsed stack 한 줄로 (루트부터 ;로 연결, flamegraph.pl/speedscope 형식)"""
+    labels = []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+def _worker_context(frame) -> Optional[contextvars.Context]:
+    """스레드 스택 맨 아래쪽에서 context.run(...)에 넘긴 Context를 찾음"""
+    bottom = []
+    while frame is not None:
+        bottom.append(frame)
+        if len(bottom) > WORKER_CONTEXT_SEARCH_DEPTH:
+            bottom.pop(0)
+        frame = frame.f_back
+    for candidate in bottom:
+        context = candidate.f_locals.get("context")
+        if isinstance(context, contextvars.Context):
+            return context
+    return None
+
+
+class ProfileSession:
+    """요청 하나의 샘플 모음"""
+
+    def __init__(self, method: str, path: str, reason: str):
+        self.id = uuid.uuid4().hex[:12]
+        self.method = method
+        self.path = path
+        self.reason = reason
+        self.loop_thread_id = threading.get_ident()
+        self.task = asyncio.current_task()
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+        self.started_at = datetime.now(timezone.utc)
+        self._start = time.perf_counter()
+        self.duration_ms: Optional[float] = None
+        self.status_code: Optional[int] = None
+
+    def finish(self, status_code: int):
+        self.duration_ms = round((time.perf_counter() - self._start) * 1000, 2)
+        self.status_code = status_code
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "reason": self.reason,
+            "status_code": self.status_code,
+            "duration_ms": self.duration_ms,
+            "sample_count": self.sample_count,
+            "interval_ms": PROFILING_INTERVAL_MS,
+            "created_at": self.started_at.isoformat(),
+        }
+
+    def collapsed(self) -> str:
+        return "\n".join(f"{stack} {count}" for stack, count in self.samples.most_common())
+
+
+class RequestProfiler:
+    """
+    요청 단위 샘플링 프로파일러
+
+    프로파일링 중인 요청이 있을 때만 샘플링 스레드가 돌며 PROFILING_INTERVAL_MS마다 스택을 수집합니다.
+    - 이벤트 루프 스레드: 그 요청의 태스크가 실행 중일 때만 (다른 요청의 코루틴 제외)
+    - 스레드풀 워커: 그 요청의 컨텍스트로 실행 중일 때만 (동기 핸들러/의존성)
+    끝난 요청은 크기가 PROFILING_BUFFER_SIZE인 링 버퍼에 보관합니다 (오래된 것부터 버림).
+    """
+
+    def __init__(self, interval_ms: float = 5.0, buffer_size: int = 50):
+        self.interval = interval_ms / 1000
+        self.profiles: deque = deque(maxlen=buffer_size)
+        self._active: List[ProfileSession] = []
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, method: str, path: str, reason: str) -> ProfileSession:
+        session = ProfileSession(method, path, reason)
+        _current_session.set(session)
+        with self._lock:
+            self._active.append(session)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._sample_loop, name="request-profiler", daemon=True)
+                self._thread.start()
+        return session
+
+    def stop(self, session: ProfileSession, status_code: int):
+        session.finish(status_code)
+        with self._lock:
+            if session in self._active:
+                self._active.remove(session)
+        self.profiles.append(session)
+        logger.info(f"요청 프로파일 저장: {session.id} {session.method} {session.path} ({session.duration_ms}ms, 샘플 {session.sample_count}개)")
+
+    def list(self) -> List[dict]:
+        return [session.summary() for session in reversed(self.profiles)]
+
+    def get(self, profile_id: str) -> Optional[ProfileSession]:
+        for session in self.profiles:
+            if session.id == profile_id:
+                return session
+        return None
+
+    def _sample_loop(self):
+        sampler_id = threading.get_ident()
+        while True:
+            with self._lock:
+                sessions = list(self._active)
+                if not sessions:
+                    # 프로파일링 중인 요청이 없으면 스레드 종료 (비활성 시 비용 없음)
+                    self._thread = None
+                    return
+            frames = sys._current_frames()
+            for thread_id, frame in frames.items():
+                if thread_id == sampler_id:
+                    continue
+                for session in sessions:
+                    if self._belongs_to(session, thread_id, frame):
+                        session.samples[_collapse(frame)] += 1
+                        session.sample_count += 1
+            del frames
+            time.sleep(self.interval)
+
+    @staticmethod
+    def _belongs_to(session: ProfileSession, thread_id: int, frame) -> bool:
+        if thread_id == session.loop_thread_id:
+            try:
+                return session.task is not None and asyncio.current_task(session.task.get_loop()) is session.task
+            except RuntimeError:
+                return False
+        context = _worker_context(frame)
+        return context is not None and context.get(_current_session) is session
+
+
+# 싱글톤 인스턴스
+request_profiler = RequestProfiler(interval_ms=PROFILING_INTERVAL_MS, buffer_size=PROFILING_BUFFER_SIZE)
@@ -0,0 +1,123 @@
+import logging
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    """요청 하나에서 실행한 SQL 수와 총 실행 시간"""
+    __slots__ = ("count", "total_seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.total_seconds = 0.0
+
+
+# 요청마다 새 QueryStats를 넣음 - 동기 핸들러(스레드풀)에도 컨텍스트가 복사되어 같은 객체에 누적됨
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def begin_query_stats() -> Token:
+    return _current_stats.set(QueryStats())
+
+
+def end_query_stats(token: Token) -> Optional[QueryStats]:
+    stats = _current_stats.get()
+    _current_stats.reset(token)
+    return stats
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _current_stats.get()
+
+
+def parameter_shape(parameters) -> str:
+    """
+    바인드 파라미터의 형태 (값 대신 타입/개수 - 개인정보를 로그에 남기지 않음)
+    예: {user_id_1: str, param_1: int}, executemany는 "500 x {...}"
+    """
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}: {_value_shape(value)}" for key, value in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return f"{len(parameters)} x {parameter_shape(parameters[0])}"
+        return "(" + ", ".join(_value_shape(value) for value in parameters) + ")"
+    return type(parameters).__name__
+
+
+def _value_shape(value) -> str:
+    if isinstance(value, (list, tuple)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+def _compact_statement(statement: str, max_length: int = 500) -> str:
+    statement = re.sub(r"\s+", " ", statement).strip()
+    return statement if len(statement) <= max_length else statement[:max_length] + "..."
+
+
+def install_query_stats(engine: Engine, slow_query_threshold_ms: float = 0):
+    """
+    engine의 모든 SQL 실행 시간을 현재 요청의 QueryStats에 누적 (요청 밖에서는 무시)
+    slow_query_threshold_ms보다 오래 걸린 문장은 요청 밖(스크립트 등)에서도 경고 로그로 남깁니다.
+    """
+    slow_seconds = slow_query_threshold_ms / 1000
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.count += 1
+            stats.total_seconds += elapsed
+        if slow_seconds and elapsed >= slow_seconds:
+            logger.warning(
+                f"느린 쿼리 {elapsed * 1000:.0f}ms: {_compact_statement(statement)} "
+                f"| 파라미터: {parameter_shape(parameters)}"
+            )
+
+
+@contextmanager
+def count_queries(engine: Optional[Engine] = None) -> Iterator[List[str]]:
+    """
+    블록 안에서 engine이 실행한 SQL 문장을 모읍니다 (테스트용).
+    요청 컨텍스트와 무관하게 engine 전체를 보므로 TestClient처럼 다른 스레드에서 도는 요청도 셉니다.
+    """
+    if engine is None:
+        from database import engine
+    statements: List[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(_compact_statement(statement, max_length=200))
+
+    event.listen(engine, "after_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "after_cursor_execute", _record)
+
+
+@contextmanager
+def assert_max_queries(max_count: int, engine: Optional[Engine] = None) -> Iterator[List[str]]:
+    """
+    블록 안에서 실행한 SQL이 max_count개를 넘으면 AssertionError (엔드포인트별 쿼리 수 회귀 테스트)
+
+        with assert_max_queries(2):
+            client.put(f"/journal/history/{history_id}", json=payload)
+    """
+    with count_queries(engine) as statements:
+        yield statements
+    if len(statements) > max_count:
+        listing = "\n".join(f"  {i}. {statement}" for i, statement in enumerate(statements, 1))
+        raise AssertionError(f"SQL {len(statements)}개 실행 (최대 {max_count}개):\n{listing}")
@@ -0,0 +1,152 @@
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Tuple
+
+from config import (
+    RATE_LIMIT_AI,
+    RATE_LIMIT_AI_IP,
+    RATE_LIMIT_BACKEND,
+    RATE_LIMIT_DEFAULT,
+    RATE_LIMIT_MAX_KEYS,
+    REDIS_URL,
+)
+
+try:
+    import redis
+except ImportError:  # 선택 의존성 (RATE_LIMIT_BACKEND=redis 사용 시에만 필요)
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "journal:ratelimit:"
+
+
+class RateLimitPolicy:
+    """토큰 버킷 한도 - capacity개까지 몰아서 쓸 수 있고 per_seconds 동안 capacity개가 다시 채워짐"""
+
+    def __init__(self, name: str, capacity: int, per_seconds: float):
+        if capacity < 1 or per_seconds <= 0:
+            raise ValueError(f"속도 제한 값이 올바르지 않습니다: {name}={capacity}/{per_seconds}")
+        self.name = name
+        self.capacity = capacity
+        self.per_seconds = per_seconds
+        self.refill_per_second = capacity / per_seconds
+        # 응답 헤더 값은 요청마다 만들지 않도록 미리 인코딩
+        self.limit_header = str(capacity).encode()
+        self.policy_header = f"{capacity};w={int(per_seconds)}".encode()
+
+    @classmethod
+    def parse(cls, name: str, value: str) -> "RateLimitPolicy":
+        """"10/60" → 60초에 10개"""
+        try:
+            capacity, per_seconds = value.split("/")
+            return cls(name, int(capacity), float(per_seconds))
+        except ValueError:
+            raise ValueError(f"속도 제한 형식이 올바르지 않습니다 (요청 수/초): {name}={value}")
+
+    def reset_after(self, tokens: float) -> int:
+        """버킷이 다시 가득 찰 때까지 남은 초"""
+        return math.ceil((self.capacity - tokens) / self.refill_per_second)
+
+    def retry_after(self, tokens: float) -> int:
+        """다음 요청 1개가 허용될 때까지 남은 초"""
+        return max(1, math.ceil((1 - tokens) / self.refill_per_second))
+
+
+class MemoryRateLimitBackend:
+    """
+    프로세스 메모리 토큰 버킷 (파드/워커별 한도)
+    버킷은 최대 max_keys개까지 보관하며 가장 오래 쓰지 않은 것부터 버립니다 (버린 버킷은 가득 찬 상태로 다시 시작).
+    """
+
+    # 이벤트 루프에서 바로 호출 (네트워크 없음)
+    blocking = False
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str, policy: RateLimitPolicy) -> Tuple[bool, float]:
+        """토큰 1개를 쓰고 (허용 여부, 남은 토큰 수)를 반환합니다."""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [float(policy.capacity), now]
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(policy.capacity, bucket[0] + (now - bucket[1]) * policy.refill_per_second)
+                bucket[1] = now
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return True, bucket[0]
+            return False, bucket[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+class RedisRateLimitBackend:
+    """
+    Redis 공유 토큰 버킷 (모든 레플리카가 같은 한도를 나눠 씀)
+    충전/차감을 Lua 스크립트 하나로 원자적으로 처리하고, 시간은 Redis 서버 시간을 써서 파드 간 시계 차이와 무관합니다.
+    """
+
+    # 네트워크 호출이므로 스레드풀에서 실행
+    blocking = True
+
+    SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+  allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+    def __init__(self, url: str):
+        if redis is None:
+            raise ValueError("RATE_LIMIT_BACKEND=redis 사용 시 redis 패키지가 필요합니다 (pip install redis)")
+        self.client = redis.Redis.from_url(url)
+        self._script = self.client.register_script(self.SCRIPT)
+
+    def acquire(self, key: str, policy: RateLimitPolicy) -> Tuple[bool, float]:
+        allowed, tokens = self._script(keys=[KEY_PREFIX + key], args=[policy.capacity, policy.refill_per_second])
+        return bool(allowed), float(tokens)
+
+    def clear(self) -> None:
+        for key in self.client.scan_iter(f"{KEY_PREFIX}*"):
+            self.client.delete(key)
+
+
+def _create_backend():
+    if RATE_LIMIT_BACKEND == "redis":
+        return RedisRateLimitBackend(REDIS_URL)
+    if RATE_LIMIT_BACKEND == "memory":
+        return MemoryRateLimitBackend(RATE_LIMIT_MAX_KEYS)
+    raise ValueError(f"RATE_LIMIT_BACKEND 값이 올바르지 않습니다: {RATE_LIMIT_BACKEND}")
+
+
+AI_POLICY = RateLimitPolicy.parse("ai", RATE_LIMIT_AI)
+AI_IP_POLICY = RateLimitPolicy.parse("ai_ip", RATE_LIMIT_AI_IP)
+DEFAULT_POLICY = RateLimitPolicy.parse("default", RATE_LIMIT_DEFAULT)
+
+# 싱글톤 인스턴스
+rate_limit_backend = _create_backend()
@@ -1,27 +1,61 @@
-import boto3
 import logging
-from datetime import date
+import threading
+from datetime import date, datetime
 from typing import Optional
 from botocore.exceptions import ClientError
 
 # config.py에서 설정 가져오기
-from config import AWS_REGION, S3_BUCKET_NAME
+from config import AWS_REGION, S3_BUCKET_NAME, S3_ENDPOINT_URL, S3_HISTORY_FORMAT, S3_HISTORY_COMPRESSION_LEVEL
+from services.metrics import observe_s3
+from services.message_partitions import KST
+from services.history_pack import FOOTER_SIZE, TAIL_READ_SIZE, parse_tail
+from services.history_codec import (
+    SUPPORTED_FORMATS,
+    content_type_for,
+    decode_history,
+    decode_history_text,
+    encode_history,
+)
 
 logger = logging.getLogger(__name__)
 
 class S3Service:
     def __init__(self):
-        # IAM Role (IRSA)을 사용하므로 자격증명 불필요
-        self.s3_client = boto3.client(
-            's3',
-            region_name=AWS_REGION
-        )
+        # boto3 클라이언트는 첫 사용 시점(또는 앱 warm-up)에 생성 - import 시점 비용 제거
+        self._s3_client = None
+        self._client_lock = threading.Lock()
         self.bucket_name = S3_BUCKET_NAME
         
         if not self.bucket_name:
             raise ValueError("S3_BUCKET_NAME이 설정되지 않았습니다.")
         
-        logger.info(f"S3Service initialized with bucket: {self.bucket_name}")
+        self.history_format = S3_HISTORY_FORMAT
+        if self.history_format not in SUPPORTED_FORMATS:
+            raise ValueError(f"S3_HISTORY_FORMAT 값이 올바르지 않습니다: {self.history_format}")
+        
+        logger.info(f"S3Service initialized with bucket: {self.bucket_name}, history format: {self.history_format}")
+    
+    @property
+    def s3_client(self):
+        if self._s3_client is None:
+            with self._client_lock:
+                if self._s3_client is None:
+                    import boto3
+                    # IAM Role (IRSA)을 사용하므로 자격증명 불필요
+                    self._s3_client = boto3.client(
+                        's3',
+                        region_name=AWS_REGION,
+                        endpoint_url=S3_ENDPOINT_URL  # 로컬 S3 호환 스토리지 (벤치마크 등)
+                    )
+        return self._s3_client
+    
+    def reset_client(self):
+        """
+        boto3 클라이언트를 버리고 다음 사용 시 새로 만듭니다.
+        fork한 워커 프로세스는 부모의 클라이언트(연결 풀)를 공유하면 안 되므로 post_fork에서 호출합니다.
+        """
+        self._s3_client = None
+        self._client_lock = threading.Lock()
     
     def generate_s3_key(self, user_id: str, record_date: date) -> str:
         """S3 키를 생성합니다. 형식: {user_id}/history/{YYYY}/{MM}/{DD}/{YYYY-MM-DD}.txt"""
@@ -31,9 +65,19 @@ class S3Service:
         date_str = record_date.strftime("%Y-%m-%d")
         return f"{user_id}/history/{year}/{month}/{day}/{date_str}.txt"
     
+    def generate_pack_key(self, user_id: str, year: int, month: int) -> str:
+        """월별 팩 키를 생성합니다. 형식: {user_id}/history-packs/{YYYY}/{YYYY-MM}.pack"""
+        return f"{user_id}/history-packs/{year:04d}/{year:04d}-{month:02d}.pack"
+    
+    def generate_message_archive_key(self, user_id: str, day: date) -> str:
+        """보관된 메시지 키를 생성합니다. 형식: {user_id}/messages-archive/{YYYY}/{MM}/{YYYY-MM-DD}.ndjson.gz"""
+        return f"{user_id}/messages-archive/{day.strftime('%Y')}/{day.strftime('%m')}/{day.isoformat()}.ndjson.gz"
+    
+    @observe_s3
     def save_history_to_s3(self, user_id: str, content: str, record_date: date, tags: Optional[list] = None) -> str:
         """
         히스토리를 S3에 텍스트 파일로 저장합니다.
+        S3_HISTORY_FORMAT 설정에 따라 평문 또는 압축 포맷(gzip/zstd)으로 저장합니다.
         
         Args:
             user_id: 사용자 ID
@@ -46,22 +90,32 @@ class S3Service:
         """
         s3_key = self.generate_s3_key(user_id, record_date)
         
-        # 텍스트 파일 내용 구성
-        file_content = f"날짜: {record_date}\n"
-        file_content += f"사용자: {user_id}\n"
-        if tags:
-            file_content += f"태그: {', '.join(tags)}\n"
-        file_content += f"\n내용:\n{content}"
+        # 파일 내용 구성 (포맷은 history_codec 참고)
+        body = encode_history(
+            user_id=user_id,
+            content=content,
+            record_date=record_date,
+            tags=tags,
+            fmt=self.history_format,
+            level=S3_HISTORY_COMPRESSION_LEVEL
+        )
         
         try:
             self.s3_client.put_object(
                 Bucket=self.bucket_name,
                 Key=s3_key,
-                Body=file_content.encode('utf-8'),
-                ContentType='text/plain; charset=utf-8'
+                Body=body,
+                ContentType=content_type_for(self.history_format),
+                Metadata={'history-format': self.history_format}
             )
             logger.info(f"S3에 히스토리 저장 완료: {s3_key}")
             
+            # 이미 압축된 지난 달 기록이 바뀌면 해당 월 팩을 무효화 (다음 압축 작업에서 재생성)
+            # record_date는 KST 날짜 - 컨테이너 시간(UTC)으로 보면 KST 월초 9시간 동안 지난 달을 이번 달로 봄
+            today = datetime.now(KST).date()
+            if (record_date.year, record_date.month) < (today.year, today.month):
+                self.invalidate_pack(user_id, record_date.year, record_date.month)
+            
             # S3 URL 생성
             text_url = f"https://{self.bucket_name}.s3.{AWS_REGION}.amazonaws.com/{s3_key}"
             return text_url
@@ -69,9 +123,11 @@ class S3Service:
             logger.error(f"S3 저장 실패: {e}")
             raise Exception(f"S3 저장 중 오류가 발생했습니다: {str(e)}")
     
+    @observe_s3
     def get_history_from_s3(self, s3_key: str) -> str:
         """
         S3에서 히스토리 파일을 읽어옵니다.
+        평문/압축 포맷 모두 기존 평문 형식의 문자열로 반환합니다.
         
         Args:
             s3_key: S3 키
@@ -79,14 +135,40 @@ class S3Service:
         Returns:
             str: 파일 내용
         """
+        return decode_history_text(self.get_object_bytes(s3_key))
+    
+    @observe_s3
+    def get_history_record(self, s3_key: str) -> dict:
+        """
+        S3에서 히스토리 파일을 읽어 레코드로 파싱합니다.
+        
+        Args:
+            s3_key: S3 키
+            
+        Returns:
+            dict: {"record_date", "user_id", "tags", "content"}
+        """
+        return decode_history(self.get_object_bytes(s3_key))
+    
+    @observe_s3
+    def get_object_bytes(self, s3_key: str) -> bytes:
+        """
+        S3 객체의 원본 바이트를 읽어옵니다.
+        
+        Args:
+            s3_key: S3 키
+            
+        Returns:
+            bytes: 객체 내용
+        """
         try:
             response = self.s3_client.get_object(Bucket=self.bucket_name, Key=s3_key)
-            content = response['Body'].read().decode('utf-8')
-            return content
+            return response['Body'].read()
         except ClientError as e:
             logger.error(f"S3 읽기 실패: {e}")
             raise Exception(f"S3에서 파일을 읽는 중 오류가 발생했습니다: {str(e)}")
     
+    @observe_s3
     def delete_history_from_s3(self, s3_key: str) -> bool:
         """
         S3에서 히스토리 파일을 삭제합니다.
@@ -100,11 +182,17 @@ class S3Service:
         try:
             self.s3_client.delete_object(Bucket=self.bucket_name, Key=s3_key)
             logger.info(f"S3에서 히스토리 삭제 완료: {s3_key}")
+            
+            # 일별 히스토리 객체인 경우 해당 월 팩도 무효화
+            parts = s3_key.split("/")
+            if len(parts) == 6 and parts[1] == "history" and s3_key.endswith(".txt"):
+                self.invalidate_pack(parts[0], int(parts[2]), int(parts[3]))
             return True
         except ClientError as e:
             logger.error(f"S3 삭제 실패: {e}")
             return False
     
+    @observe_s3
     def check_file_exists(self, s3_key: str) -> bool:
         """
         S3에 파일이 존재하는지 확인합니다.
@@ -145,6 +233,170 @@ class S3Service:
         except Exception as e:
             logger.error(f"S3 URL 파싱 실패: {e}")
             return ""
+    
+    @observe_s3
+    def list_user_prefixes(self) -> list:
+        """
+        버킷 최상위의 사용자 ID 목록을 반환합니다.
+        
+        Returns:
+            list: 사용자 ID 리스트
+        """
+        user_ids = []
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket_name, Delimiter='/'):
+            for prefix in page.get('CommonPrefixes', []):
+                user_ids.append(prefix['Prefix'].rstrip('/'))
+        return user_ids
+    
+    @observe_s3
+    def list_month_history_keys(self, user_id: str, year: int, month: int) -> list:
+        """
+        특정 월의 일별 히스토리 객체 키 목록을 반환합니다.
+        
+        Args:
+            user_id: 사용자 ID
+            year: 연도
+            month: 월
+            
+        Returns:
+            list: S3 키 리스트 (날짜순)
+        """
+        prefix = f"{user_id}/history/{year:04d}/{month:02d}/"
+        keys = []
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix):
+            for obj in page.get('Contents', []):
+                if obj['Key'].endswith('.txt'):
+                    keys.append(obj['Key'])
+        return sorted(keys)
+    
+    @observe_s3
+    def save_pack(self, user_id: str, year: int, month: int, body: bytes) -> str:
+        """
+        월별 팩 객체를 저장합니다.
+        
+        Returns:
+            str: 팩 S3 키
+        """
+        pack_key = self.generate_pack_key(user_id, year, month)
+        try:
+            self.s3_client.put_object(
+                Bucket=self.bucket_name,
+                Key=pack_key,
+                Body=body,
+                ContentType='application/octet-stream'
+            )
+            logger.info(f"S3에 월별 팩 저장 완료: {pack_key} ({len(body)} bytes)")
+            return pack_key
+        except ClientError as e:
+            logger.error(f"S3 팩 저장 실패: {e}")
+            raise Exception(f"S3 팩 저장 중 오류가 발생했습니다: {str(e)}")
+    
+    @observe_s3
+    def save_message_archive(self, user_id: str, day: date, body: bytes) -> str:
+        """
+        하루치 보관 메시지(gzip NDJSON)를 저장합니다. 같은 날을 다시 보관하면 덮어쓰므로
+        호출자가 load_message_archive로 읽은 기존 메시지를 합쳐서 넘깁니다.
+        
+        Returns:
+            str: 보관 객체 S3 키
+        """
+        archive_key = self.generate_message_archive_key(user_id, day)
+        try:
+            self.s3_client.put_object(
+                Bucket=self.bucket_name,
+                Key=archive_key,
+                Body=body,
+                ContentType='application/x-ndjson',
+                ContentEncoding='gzip'
+            )
+            logger.info(f"S3에 메시지 보관 완료: {archive_key} ({len(body)} bytes)")
+            return archive_key
+        except ClientError as e:
+            logger.error(f"S3 메시지 보관 실패: {e}")
+            raise Exception(f"S3 메시지 보관 중 오류가 발생했습니다: {str(e)}")
+    
+    @observe_s3
+    def load_message_archive(self, user_id: str, day: date) -> Optional[bytes]:
+        """
+        하루치 보관 메시지(gzip NDJSON)를 읽습니다.
+        
+        Returns:
+            bytes | None: 보관 객체 내용 (보관된 적이 없으면 None)
+        """
+        archive_key = self.generate_message_archive_key(user_id, day)
+        try:
+            response = self.s3_client.get_object(Bucket=self.bucket_name, Key=archive_key)
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('NoSuchKey', '404'):
+                return None
+            logger.error(f"S3 메시지 보관 읽기 실패: {e}")
+            raise Exception(f"S3 메시지 보관을 읽는 중 오류가 발생했습니다: {str(e)}")
+        return response['Body'].read()
+    
+    @observe_s3
+    def read_pack_index(self, pack_key: str) -> Optional[dict]:
+        """
+        팩 객체의 인덱스를 읽습니다. 꼬리 Range GET 한 번으로 푸터와 인덱스를 가져옵니다.
+        
+        Returns:
+            dict | None: 인덱스 (팩이 없으면 None)
+        """
+        try:
+            response = self.s3_client.get_object(
+                Bucket=self.bucket_name,
+                Key=pack_key,
+                Range=f"bytes=-{TAIL_READ_SIZE}"
+            )
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('NoSuchKey', '404'):
+                return None
+            logger.error(f"S3 팩 인덱스 읽기 실패: {e}")
+            raise Exception(f"S3 팩을 읽는 중 오류가 발생했습니다: {str(e)}")
+        
+        tail = response['Body'].read()
+        # Content-Range: bytes {start}-{end}/{size}
+        object_size = int(response['ContentRange'].rsplit('/', 1)[1]) if response.get('ContentRange') else len(tail)
+        index = parse_tail(tail, object_size)
+        
+        if index['entries'] is None:
+            # 인덱스가 꼬리 읽기 범위보다 큰 경우 인덱스 구간만 다시 읽기
+            start = index['index_offset']
+            end = start + index['index_length'] - 1
+            raw = b"".join(self.iter_object_range(pack_key, start, end))
+            index = parse_tail(raw + tail[-FOOTER_SIZE:], start + len(raw) + FOOTER_SIZE)
+        return index
+    
+    @observe_s3
+    def iter_object_range(self, s3_key: str, start: int, end: int, chunk_size: int = 65536):
+        """
+        객체의 바이트 범위를 청크 단위로 스트리밍합니다.
+        
+        Args:
+            s3_key: S3 키
+            start: 시작 오프셋
+            end: 끝 오프셋 (포함)
+        """
+        try:
+            response = self.s3_client.get_object(
+                Bucket=self.bucket_name,
+                Key=s3_key,
+                Range=f"bytes={start}-{end}"
+            )
+        except ClientError as e:
+            logger.error(f"S3 범위 읽기 실패: {e}")
+            raise Exception(f"S3에서 파일을 읽는 중 오류가 발생했습니다: {str(e)}")
+        yield from response['Body'].iter_chunks(chunk_size)
+    
+    @observe_s3
+    def invalidate_pack(self, user_id: str, year: int, month: int) -> None:
+        """월별 팩 객체를 삭제합니다 (없으면 무시). 실패해도 쓰기 경로는 계속 진행합니다."""
+        pack_key = self.generate_pack_key(user_id, year, month)
+        try:
+            self.s3_client.delete_object(Bucket=self.bucket_name, Key=pack_key)
+        except ClientError as e:
+            logger.warning(f"S3 팩 무효화 실패 (계속 진행): {pack_key} - {e}")
 
 # 싱글톤 인스턴스
-s3_service = S3Service()
\ No newline at end of file
+s3_service = S3Service()
@@ -0,0 +1,176 @@
+import json
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config import (
+    AWS_REGION,
+    SECRETS_PROVIDER,
+    SECRETS_FILE,
+    SECRETS_CACHE_TTL_SECONDS,
+    SECRETS_REFRESH_INTERVAL_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AwsSecretsProvider:
+    """AWS Secrets Manager 시크릿 조회 (JSON SecretString)"""
+
+    def __init__(self, region_name: str = "ap-northeast-2"):
+        self.region_name = region_name
+        self._client = None
+
+    def fetch(self, name: str) -> Optional[dict]:
+        # boto3 클라이언트는 첫 조회 시점에 생성 (import 시점 지연 없음)
+        import boto3
+        from botocore.exceptions import ClientError
+
+        try:
+            if self._client is None:
+                self._client = boto3.session.Session().client(
+                    service_name="secretsmanager",
+                    region_name=self.region_name
+                )
+            secret = self._client.get_secret_value(SecretId=name)["SecretString"]
+            logger.info(f"Successfully retrieved secret: {name}")
+            return json.loads(secret)
+        except ClientError as e:
+            logger.error(f"Error retrieving secret {name}: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Unexpected error retrieving secret {name}: {e}")
+            return None
+
+
+class FileSecretsProvider:
+    """
+    로컬 JSON 파일 시크릿 조회 (테스트/로컬용 Secrets Manager 대체)
+
+    파일 형식: {"시크릿 이름": {"host": ..., "username": ..., "password": ...}}
+    조회할 때마다 파일을 다시 읽으므로 파일을 고쳐 비밀번호 교체(rotation)를 재현할 수 있습니다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def fetch(self, name: str) -> Optional[dict]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f).get(name)
+        except (OSError, ValueError) as e:
+            logger.error(f"Error reading secrets file {self.path}: {e}")
+            return None
+
+
+class EnvSecretsProvider:
+    """시크릿을 쓰지 않음 (로컬 개발 - 호출하는 쪽이 환경변수 사용)"""
+
+    def fetch(self, name: str) -> Optional[dict]:
+        return None
+
+
+class SecretsCache:
+    """
+    TTL 메모리 캐시를 둔 시크릿 조회
+
+    - get: TTL 안에서는 캐시 값을 반환하고, 만료되면 제공자에서 다시 조회합니다.
+      조회에 실패하면 이전 값을 계속 사용합니다 (Secrets Manager 장애로 DB 연결이 끊기지 않도록).
+    - 백그라운드 갱신: TTL보다 짧은 주기로 한 번 이상 조회한 시크릿을 미리 다시 읽어
+      요청 경로에서 Secrets Manager 지연을 겪지 않게 합니다.
+    - 값이 바뀌면 on_change로 등록한 콜백을 호출합니다 (DB 커넥션 풀 교체 등).
+    """
+
+    def __init__(self, provider, ttl_seconds: int = 300, refresh_interval_seconds: int = 240):
+        self.provider = provider
+        self.ttl_seconds = ttl_seconds
+        self.refresh_interval_seconds = refresh_interval_seconds
+        self._entries: Dict[str, Tuple[Optional[dict], float]] = {}
+        self._listeners: List[Callable[[str, Optional[dict], Optional[dict]], None]] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def get(self, name: str, force_refresh: bool = False) -> Optional[dict]:
+        """
+        시크릿 조회
+
+        Args:
+            name: 시크릿 이름
+            force_refresh: True면 TTL과 관계없이 제공자에서 다시 조회 (인증 실패 시)
+        """
+        with self._lock:
+            # 잠금 안에서 조회해 동시 요청이 같은 시크릿을 한 번만 읽도록 함
+            entry = self._entries.get(name)
+            if entry is not None and not force_refresh and time.monotonic() - entry[1] < self.ttl_seconds:
+                return entry[0]
+
+            value = self.provider.fetch(name)
+            previous = entry[0] if entry is not None else None
+            if value is None and previous is not None:
+                logger.warning(f"시크릿 조회 실패 - 이전 값을 계속 사용합니다: {name}")
+                value = previous
+            self._entries[name] = (value, time.monotonic())
+
+        if entry is not None and value != previous:
+            logger.info(f"시크릿 변경 감지: {name}")
+            for listener in list(self._listeners):
+                try:
+                    listener(name, previous, value)
+                except Exception as e:
+                    logger.error(f"시크릿 변경 콜백 실패: {name} - {e}")
+        return value
+
+    def on_change(self, listener: Callable[[str, Optional[dict], Optional[dict]], None]):
+        """값이 바뀌었을 때 호출할 콜백 등록 - listener(이름, 이전 값, 새 값)"""
+        self._listeners.append(listener)
+
+    def refresh_all(self):
+        """한 번이라도 조회한 시크릿을 모두 다시 읽습니다."""
+        for name in list(self._entries):
+            self.get(name, force_refresh=True)
+
+    def start_background_refresh(self):
+        """백그라운드 갱신 스레드 시작 (워커 프로세스마다 한 번, 이미 실행 중이면 무시)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._refresh_loop, name="secrets-refresh", daemon=True)
+        self._thread.start()
+
+    def stop_background_refresh(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _refresh_loop(self):
+        while not self._stop.wait(self.refresh_interval_seconds):
+            try:
+                self.refresh_all()
+            except Exception as e:
+                logger.error(f"시크릿 백그라운드 갱신 실패: {e}")
+
+
+def create_provider(kind: str = SECRETS_PROVIDER):
+    """SECRETS_PROVIDER 설정에 맞는 제공자 생성: aws | file | env"""
+    if kind == "aws":
+        return AwsSecretsProvider(AWS_REGION)
+    if kind == "file":
+        return FileSecretsProvider(SECRETS_FILE)
+    return EnvSecretsProvider()
+
+
+logger.info(f"Secrets provider: {SECRETS_PROVIDER}")
+
+# 싱글톤 인스턴스
+secrets_cache = SecretsCache(
+    create_provider(),
+    ttl_seconds=SECRETS_CACHE_TTL_SECONDS,
+    refresh_interval_seconds=SECRETS_REFRESH_INTERVAL_SECONDS
+)
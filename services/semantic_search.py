@@ -0,0 +1,187 @@
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import delete, event, func, inspect, or_, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from config import EMBEDDING_BATCH_SIZE
+from database import engine
+from models.history import History
+from models.history_embedding import HistoryEmbedding
+from services.embeddings import embedder, from_blobs, to_blob
+from services.vector_index import vector_index_cache
+
+logger = logging.getLogger(__name__)
+
+
+def compute_embeddings(items: List[Tuple[int, str, Optional[str]]]) -> Tuple[List[dict], List[int]]:
+    """
+    기록 임베딩을 계산합니다. Agent API 호출일 수 있으므로 DB 연결을 잡지 않은 상태에서 부릅니다.
+
+    Args:
+        items: (history_id, user_id, content) 목록 - content가 None이거나 비어 있으면(삭제된 기록) 임베딩 삭제
+
+    Returns:
+        (저장할 행 목록, 임베딩을 삭제할 history_id 목록)
+    """
+    if embedder is None or not items:
+        return [], []
+    live = [(history_id, user_id, content) for history_id, user_id, content in items if content]
+    removed = [history_id for history_id, _, content in items if not content]
+
+    rows = []
+    for offset in range(0, len(live), EMBEDDING_BATCH_SIZE):
+        batch = live[offset:offset + EMBEDDING_BATCH_SIZE]
+        vectors = embedder.embed([content for _, _, content in batch])
+        rows.extend(
+            {"history_id": history_id, "user_id": user_id, "model": embedder.name, "vector": to_blob(vector)}
+            for (history_id, user_id, _), vector in zip(batch, vectors)
+        )
+    return rows, removed
+
+
+def write_embeddings(conn, rows: List[dict], removed: List[int]) -> None:
+    """compute_embeddings 결과를 저장합니다 (커밋은 호출자)."""
+    if removed:
+        conn.execute(delete(HistoryEmbedding).where(HistoryEmbedding.history_id.in_(removed)))
+    if rows:
+        stmt = insert(HistoryEmbedding)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[HistoryEmbedding.history_id],
+            set_={
+                "user_id": stmt.excluded.user_id,
+                "model": stmt.excluded.model,
+                "vector": stmt.excluded.vector,
+                "updated_at": func.now(),
+            },
+        )
+        conn.execute(stmt, rows)
+
+
+def backfill_embeddings(user_ids: Optional[Iterable[str]] = None, batch_size: int = 1000) -> int:
+    """
+    임베딩이 없거나 오래된(기록이 더 나중에 바뀜, 임베딩 방식이 바뀜) 기록의 임베딩을 계산합니다.
+    Core 문으로 쓰는 경로(bulk import, 벤치마크 데이터)와 scripts.backfill_embeddings에서 호출합니다.
+
+    Returns:
+        int: 계산한 임베딩 수
+    """
+    if embedder is None:
+        return 0
+    stale = or_(
+        HistoryEmbedding.history_id.is_(None),
+        HistoryEmbedding.model != embedder.name,
+        HistoryEmbedding.updated_at < History.updated_at,
+    )
+    query = (
+        select(History.id, History.user_id, History.content)
+        .outerjoin(HistoryEmbedding, HistoryEmbedding.history_id == History.id)
+        .where(History.deleted_at.is_(None), stale)
+        .order_by(History.id)
+        .limit(batch_size)
+    )
+    if user_ids is not None:
+        user_ids = list(user_ids)
+        query = query.where(History.user_id.in_(user_ids))
+
+    total = 0
+    last_id = 0
+    while True:
+        with engine.connect() as conn:
+            rows = conn.execute(query.where(History.id > last_id)).all()
+        if not rows:
+            break
+        # 계산하는 동안에는 연결을 반납해 둠
+        embeddings, removed = compute_embeddings([(row.id, row.user_id, row.content) for row in rows])
+        with engine.begin() as conn:
+            write_embeddings(conn, embeddings, removed)
+        total += len(rows)
+        last_id = rows[-1].id
+    if total:
+        if user_ids is None:
+            vector_index_cache.clear()
+        else:
+            vector_index_cache.invalidate(user_ids)
+    return total
+
+
+def _load_user_vectors(db: Session, user_id: str) -> Tuple[np.ndarray, np.ndarray]:
+    rows = db.execute(
+        select(HistoryEmbedding.history_id, HistoryEmbedding.vector)
+        .where(HistoryEmbedding.user_id == user_id, HistoryEmbedding.model == embedder.name)
+    ).all()
+    ids = np.array([row.history_id for row in rows], dtype=np.int64)
+    return ids, from_blobs([row.vector for row in rows], embedder.dim)
+
+
+def semantic_search(db: Session, user_id: str, query: str, k: int) -> List[Tuple[int, float]]:
+    """사용자 기록 중 query와 의미가 가까운 순서로 (history_id, 유사도) 최대 k개 (유사도 0 이하 - 겹치는 특징 없음 - 는 제외)"""
+    index = vector_index_cache.get(user_id, lambda: _load_user_vectors(db, user_id))
+    if not len(index):
+        return []
+    return [(history_id, score) for history_id, score in index.search(embedder.embed([query])[0], k) if score > 0]
+
+
+# 쓰기 경로: flush된 History 중 content가 바뀌었거나 삭제된 기록을 모아 두었다가 커밋 후 임베딩 갱신
+# 커밋 시점(after_commit)에는 세션이 아직 연결을 잡고 있으므로, 트랜잭션이 끝나 연결을 풀에 돌려준 뒤
+# (after_transaction_end) 연결 없이 임베딩을 계산하고 나서 별도 트랜잭션으로 저장
+_PENDING_KEY = "history_embedding_pending"
+# user_id가 바뀐 기록의 이전 사용자 (그 사용자 인덱스도 무효화)
+_PENDING_USERS_KEY = "history_embedding_pending_users"
+# 커밋되어 트랜잭션 종료 후 저장할 변경
+_COMMITTED_KEY = "history_embedding_committed"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_content_changes(session, flush_context):
+    if embedder is None:
+        return
+    pending: Dict[int, Tuple[str, Optional[str]]] = session.info.setdefault(_PENDING_KEY, {})
+    previous_users = session.info.setdefault(_PENDING_USERS_KEY, set())
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, History):
+            continue
+        state = inspect(obj)
+        changed = obj in session.new or any(
+            state.attrs[name].history.has_changes() for name in ("content", "deleted_at", "user_id")
+        )
+        if changed:
+            pending[obj.id] = (obj.user_id, None if obj.deleted_at is not None else obj.content)
+            previous_users.update(state.attrs["user_id"].history.deleted or ())
+    for obj in session.deleted:
+        if isinstance(obj, History):
+            pending[obj.id] = (obj.user_id, None)
+
+
+@event.listens_for(Session, "after_commit")
+def _mark_committed(session):
+    pending = session.info.pop(_PENDING_KEY, None)
+    previous_users = session.info.pop(_PENDING_USERS_KEY, set())
+    if pending:
+        session.info[_COMMITTED_KEY] = (pending, previous_users)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _store_committed(session, transaction):
+    # 최상위 트랜잭션이 끝나면 세션의 연결은 이미 풀에 반납된 상태
+    if transaction.parent is not None or _COMMITTED_KEY not in session.info:
+        return
+    pending, previous_users = session.info.pop(_COMMITTED_KEY)
+    try:
+        rows, removed = compute_embeddings(
+            [(history_id, user_id, content) for history_id, (user_id, content) in pending.items()]
+        )
+        with engine.begin() as conn:
+            write_embeddings(conn, rows, removed)
+    except Exception as e:
+        # 기록은 이미 저장됨 - 빠진 임베딩은 python -m scripts.backfill_embeddings로 채움
+        logger.error(f"임베딩 저장 실패 ({len(pending)}건): {e}")
+    vector_index_cache.invalidate({user_id for user_id, _ in pending.values()} | previous_users)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending(session, previous_transaction):
+    session.info.pop(_PENDING_KEY, None)
+    session.info.pop(_PENDING_USERS_KEY, None)
@@ -0,0 +1,80 @@
+import asyncio
+import logging
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+
+class Warmup:
+    """
+    앱 시작 후 백그라운드에서 실행하는 초기화(warm-up) 단계 관리
+
+    서버는 바로 요청을 받기 시작하고 (liveness), 모든 단계가 끝난 뒤에 ready가 됩니다 (readiness).
+    실패한 단계는 백오프 후 다시 시도하며, 이미 끝난 단계는 다시 실행하지 않습니다.
+    """
+
+    def __init__(self):
+        self.steps: List[Tuple[str, Callable[[], None]]] = []
+        self.timings: Dict[str, float] = {}
+        self.ready = False
+        self.error: Optional[str] = None
+        self.attempts = 0
+        self.started_at = time.monotonic()
+        self.ready_after_ms: Optional[float] = None
+
+    def add_step(self, name: str, fn: Callable[[], None]):
+        """warm-up 단계 등록 (등록 순서대로 실행)"""
+        self.steps.append((name, fn))
+
+    def run(self) -> bool:
+        """
+        남은 단계를 순서대로 실행합니다 (동기 - 스레드풀에서 호출).
+
+        Returns:
+            bool: 모든 단계가 끝났으면 True
+        """
+        self.attempts += 1
+        for name, fn in self.steps:
+            if name in self.timings:
+                continue
+            start = time.perf_counter()
+            try:
+                fn()
+            except Exception as e:
+                # readiness 응답에 노출되므로 첫 줄만 보관
+                message = str(e).splitlines()[0] if str(e) else type(e).__name__
+                self.error = f"{name}: {message}"
+                logger.error(f"warm-up 단계 실패 ({self.attempts}회차): {self.error}")
+                return False
+            self.timings[name] = round((time.perf_counter() - start) * 1000, 1)
+            logger.info(f"warm-up 단계 완료: {name} ({self.timings[name]}ms)")
+
+        self.error = None
+        self.ready = True
+        self.ready_after_ms = round((time.monotonic() - self.started_at) * 1000, 1)
+        logger.info(f"warm-up 완료: {self.ready_after_ms}ms {self.timings}")
+        return True
+
+    async def run_until_ready(self, max_backoff_seconds: float = 30.0):
+        """ready가 될 때까지 백오프하며 반복 실행 (lifespan에서 태스크로 실행)"""
+        delay = 1.0
+        while not await run_in_threadpool(self.run):
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, max_backoff_seconds)
+
+    def status(self) -> dict:
+        return {
+            "status": "ready" if self.ready else "starting",
+            "attempts": self.attempts,
+            "ready_after_ms": self.ready_after_ms,
+            "steps_ms": self.timings,
+            "pending": [name for name, _ in self.steps if name not in self.timings],
+            "error": self.error,
+        }
+
+
+# 싱글톤 인스턴스
+warmup = Warmup()
@@ -0,0 +1,56 @@
+"""
+테스트 공통 설정
+
+DB가 필요한 테스트는 PostgreSQL과 S3(MinIO 등)에 연결할 수 있을 때만 실행하고, 아니면 건너뜁니다.
+연결 정보는 앱과 같은 환경변수(DB_HOST, DB_NAME, S3_ENDPOINT_URL, S3_BUCKET_NAME 등)로 지정합니다.
+
+    DB_NAME=journal_test S3_ENDPOINT_URL=http://localhost:9000 S3_BUCKET_NAME=journal-test \\
+        AWS_ACCESS_KEY_ID=minioadmin AWS_SECRET_ACCESS_KEY=minioadmin python -m pytest -q
+"""
+import os
+import uuid
+
+import pytest
+
+# 앱 import 전에 설정 - 쿼리 수가 환경에 따라 달라지지 않도록 고정
+os.environ.setdefault("SECRETS_PROVIDER", "env")
+os.environ.setdefault("TRACING_ENABLED", "false")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+os.environ.setdefault("LOAD_SHED_ENABLED", "false")
+# 캐시 적중 시 쿼리 수를 확인하려면 캐시가 켜져 있어야 함 (테스트는 단일 프로세스)
+os.environ.setdefault("HISTORY_CACHE_BACKEND", "memory")
+# 임베딩 저장은 기록 쓰기마다 SQL 1개를 더함 (API_DOCUMENTATION.md 7.15) - 기록 API 자체의 쿼리 수만 확인
+os.environ.setdefault("EMBEDDING_PROVIDER", "none")
+
+
+@pytest.fixture(scope="session")
+def app():
+    try:
+        from main import app
+        from database import engine
+        with engine.connect():
+            pass
+    except Exception as e:
+        pytest.skip(f"DB/S3 환경이 없어 건너뜀: {e}")
+    return app
+
+
+@pytest.fixture(scope="session")
+def client(app):
+    from fastapi.testclient import TestClient
+    return TestClient(app)
+
+
+@pytest.fixture
+def user_id():
+    """테스트마다 새 사용자 - 끝나면 그 사용자의 행을 지움"""
+    user_id = f"test-{uuid.uuid4()}"
+    yield user_id
+
+    from sqlalchemy import delete
+    from database import engine
+    from models.history import History
+    from models.message import Message
+    with engine.begin() as conn:
+        conn.execute(delete(History).where(History.user_id == user_id))
+        conn.execute(delete(Message).where(Message.user_id == user_id))
@@ -0,0 +1,63 @@
+"""
+엔드포인트별 SQL 수 회귀 테스트 (API_DOCUMENTATION.md 7.12)
+
+쿼리 수가 늘면 실행된 SQL 목록과 함께 실패합니다. PostgreSQL/S3가 없으면 건너뜁니다 (conftest.py).
+"""
+from services.query_stats import assert_max_queries
+
+
+def _create_history(client, user_id: str, content: str = "처음 쓴 일기") -> int:
+    response = client.post("/journal/history", json={
+        "user_id": user_id,
+        "content": content,
+        "record_date": "2026-01-05",
+        "tags": ["테스트"],
+    })
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+def test_put_history(client, user_id):
+    history_id = _create_history(client, user_id)
+    # 조회 1 + UPDATE ... RETURNING 1 (커밋 후 refresh SELECT 없음)
+    with assert_max_queries(2):
+        response = client.put(f"/journal/history/{history_id}", json={
+            "user_id": user_id,
+            "content": "고쳐 쓴 일기",
+            "record_date": "2026-01-05",
+            "tags": ["테스트", "수정"],
+        })
+    assert response.status_code == 200, response.text
+    assert response.json()["content"] == "고쳐 쓴 일기"
+
+
+def test_post_message(client, user_id):
+    # INSERT ... RETURNING 1
+    with assert_max_queries(1):
+        response = client.post("/journal/messages", json={"user_id": user_id, "content": "점심 먹고 산책"})
+    assert response.status_code == 200, response.text
+
+
+def test_get_history_cache_hit(client, user_id):
+    history_id = _create_history(client, user_id)
+    assert client.get(f"/journal/history/{history_id}").status_code == 200
+    # 두 번째 조회는 캐시에서 응답
+    with assert_max_queries(0):
+        response = client.get(f"/journal/history/{history_id}")
+    assert response.status_code == 200
+    assert response.json()["id"] == history_id
+
+
+def test_get_history_after_update_is_fresh(client, user_id):
+    history_id = _create_history(client, user_id)
+    client.get(f"/journal/history/{history_id}")
+    client.put(f"/journal/history/{history_id}", json={
+        "user_id": user_id,
+        "content": "바뀐 내용",
+        "record_date": "2026-01-05",
+        "tags": ["테스트"],
+    })
+    # 커밋 이벤트로 무효화되어 다시 읽음
+    with assert_max_queries(1):
+        response = client.get(f"/journal/history/{history_id}")
+    assert response.json()["content"] == "바뀐 내용"
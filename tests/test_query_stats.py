@@ -0,0 +1,72 @@
+import pytest
+from sqlalchemy import create_engine, text
+
+from services.query_stats import assert_max_queries, count_queries, parameter_shape
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    yield engine
+    engine.dispose()
+
+
+def test_count_queries_records_statements(engine):
+    with engine.connect() as conn:
+        with count_queries(engine) as statements:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT   2\n"))
+    assert statements == ["SELECT 1", "SELECT 2"]
+
+
+def test_count_queries_stops_listening_after_block(engine):
+    with engine.connect() as conn:
+        with count_queries(engine) as statements:
+            conn.execute(text("SELECT 1"))
+        conn.execute(text("SELECT 2"))
+    assert len(statements) == 1
+
+
+def test_assert_max_queries_passes_at_limit(engine):
+    with engine.connect() as conn:
+        with assert_max_queries(2, engine):
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+
+
+def test_assert_max_queries_fails_over_limit_with_listing(engine):
+    with engine.connect() as conn:
+        with pytest.raises(AssertionError) as excinfo:
+            with assert_max_queries(1, engine):
+                conn.execute(text("SELECT 1"))
+                conn.execute(text("SELECT 2"))
+    message = str(excinfo.value)
+    assert "SQL 2개 실행 (최대 1개)" in message
+    assert "1. SELECT 1" in message
+    assert "2. SELECT 2" in message
+
+
+def test_assert_max_queries_zero(engine):
+    with assert_max_queries(0, engine) as statements:
+        pass
+    assert statements == []
+
+
+def test_parameter_shape_dict_hides_values():
+    shape = parameter_shape({"user_id_1": "secret-user", "param_1": 10, "tags": ["a", "b"]})
+    assert shape == "{user_id_1: str, param_1: int, tags: list[2]}"
+    assert "secret-user" not in shape
+
+
+def test_parameter_shape_positional():
+    assert parameter_shape(("a", 1, None)) == "(str, int, NoneType)"
+
+
+def test_parameter_shape_executemany():
+    rows = [{"id": i, "content": "x"} for i in range(500)]
+    assert parameter_shape(rows) == "500 x {id: int, content: str}"
+    assert parameter_shape([("a", 1), ("b", 2)]) == "2 x (str, int)"
+
+
+def test_parameter_shape_other():
+    assert parameter_shape(None) == "NoneType"
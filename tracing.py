@@ -1,43 +1,240 @@
 # tracing.py
 import os
 import logging
+import queue
+import threading
+import time
+from collections import OrderedDict
+
 from opentelemetry import trace
-from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import BatchSpanProcessor
-from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+from opentelemetry.sdk.trace import SpanProcessor, TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult
+from opentelemetry.sdk.trace.sampling import (
+    ALWAYS_ON,
+    Decision,
+    ParentBased,
+    Sampler,
+    SamplingResult,
+    TraceIdRatioBased,
+)
 from opentelemetry.sdk.resources import Resource, SERVICE_NAME
+from opentelemetry.trace import StatusCode
+
+from config import (
+    OTEL_BSP_EXPORT_TIMEOUT,
+    OTEL_BSP_MAX_EXPORT_BATCH_SIZE,
+    OTEL_BSP_MAX_QUEUE_SIZE,
+    OTEL_BSP_SCHEDULE_DELAY,
+    OTEL_EXPORTER_OTLP_INSECURE,
+    TRACE_EXPORTER,
+    TRACE_KEEP_ERRORS_AND_SLOW,
+    TRACE_RATE_LIMIT_PER_SECOND,
+    TRACE_SAMPLE_RATIO,
+    TRACE_SAMPLER,
+    TRACE_SLOW_THRESHOLD_MS,
+    TRACING_ENABLED,
+)
 
 logger = logging.getLogger(__name__)
 
+
+class RateLimitedSampler(Sampler):
+    """초당 최대 N개 트레이스만 샘플링 (토큰 버킷, 트래픽이 늘어도 내보내는 양이 일정)"""
+
+    def __init__(self, per_second: float):
+        self.per_second = per_second
+        self._tokens = per_second
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def should_sample(self, parent_context, trace_id, name, kind=None, attributes=None, links=None, trace_state=None):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.per_second, self._tokens + (now - self._last) * self.per_second)
+            self._last = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return SamplingResult(Decision.RECORD_AND_SAMPLE, attributes, trace_state)
+        return SamplingResult(Decision.DROP, None, trace_state)
+
+    def get_description(self) -> str:
+        return f"RateLimitedSampler{{{self.per_second}/s}}"
+
+
+class RecordUnsampledSampler(Sampler):
+    """
+    샘플링되지 않은 트레이스도 RECORD_ONLY로 기록만 해 둠 (내보내기는 ErrorAndSlowSpanProcessor가 결정)
+    DROP보다 스팬 생성 비용이 들지만 오류/느린 요청을 놓치지 않습니다.
+    """
+
+    def __init__(self, delegate: Sampler):
+        self.delegate = delegate
+
+    def should_sample(self, parent_context, trace_id, name, kind=None, attributes=None, links=None, trace_state=None):
+        result = self.delegate.should_sample(parent_context, trace_id, name, kind, attributes, links, trace_state)
+        if result.decision == Decision.DROP:
+            return SamplingResult(Decision.RECORD_ONLY, attributes, result.trace_state)
+        return result
+
+    def get_description(self) -> str:
+        return f"RecordUnsampled{{{self.delegate.get_description()}}}"
+
+
+class _RecordOnlySampler(Sampler):
+    """RECORD_ONLY 부모의 자식 스팬도 기록 (오류/느린 트레이스를 통째로 내보내기 위해)"""
+
+    def should_sample(self, parent_context, trace_id, name, kind=None, attributes=None, links=None, trace_state=None):
+        return SamplingResult(Decision.RECORD_ONLY, attributes, trace_state)
+
+    def get_description(self) -> str:
+        return "RecordOnly"
+
+
+class ErrorAndSlowSpanProcessor(SpanProcessor):
+    """
+    샘플링되지 않은(RECORD_ONLY) 트레이스 중 오류가 있거나 느린 트레이스만 내보내는 프로세서
+
+    로컬 루트 스팬(서버 요청 스팬)이 끝날 때 모아 둔 스팬을 보고 결정하며,
+    내보내기는 별도 스레드에서 하므로 요청 경로에서 네트워크를 기다리지 않습니다.
+    """
+
+    def __init__(self, exporter: SpanExporter, slow_threshold_ms: float, max_pending_traces: int = 2048, max_queue_size: int = 256):
+        self.exporter = exporter
+        self.slow_threshold_ns = slow_threshold_ms * 1_000_000
+        self.max_pending_traces = max_pending_traces
+        self._pending: "OrderedDict[int, list]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue_size)
+        self._thread = threading.Thread(target=self._export_loop, name="trace-error-export", daemon=True)
+        self._thread.start()
+
+    def on_end(self, span) -> None:
+        if span.context.trace_flags.sampled:
+            return  # 샘플링된 스팬은 BatchSpanProcessor가 처리
+        trace_id = span.context.trace_id
+        is_local_root = span.parent is None or span.parent.is_remote
+        with self._lock:
+            spans = self._pending.pop(trace_id, [])
+            spans.append(span)
+            if not is_local_root:
+                self._pending[trace_id] = spans
+                while len(self._pending) > self.max_pending_traces:
+                    self._pending.popitem(last=False)
+                return
+
+        slow = span.end_time - span.start_time >= self.slow_threshold_ns
+        if slow or any(s.status.status_code == StatusCode.ERROR for s in spans):
+            try:
+                self._queue.put_nowait(spans)
+            except queue.Full:
+                logger.warning("오류/느린 트레이스 내보내기 대기열이 가득 차 버립니다")
+
+    def _export_loop(self):
+        while True:
+            spans = self._queue.get()
+            if spans is None:
+                return
+            try:
+                if self.exporter.export(spans) != SpanExportResult.SUCCESS:
+                    logger.warning("오류/느린 트레이스 내보내기 실패")
+            except Exception as e:
+                logger.warning(f"오류/느린 트레이스 내보내기 실패: {e}")
+
+    def shutdown(self) -> None:
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return True
+
+
+class _DiscardingExporter(SpanExporter):
+    """스팬을 버리는 exporter (TRACE_EXPORTER=none - 로컬/벤치마크용)"""
+
+    def export(self, spans) -> SpanExportResult:
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        pass
+
+
+def build_sampler(kind: str = TRACE_SAMPLER, keep_errors_and_slow: bool = TRACE_KEEP_ERRORS_AND_SLOW) -> Sampler:
+    """
+    TRACE_SAMPLER에 맞는 샘플러 (모두 부모 결정을 따르는 parent-based)
+
+    - always_on: 모든 트레이스 (기존 동작)
+    - ratio: trace id 기준 TRACE_SAMPLE_RATIO 비율
+    - rate_limited: 초당 최대 TRACE_RATE_LIMIT_PER_SECOND개
+    """
+    if kind == "ratio":
+        root = TraceIdRatioBased(TRACE_SAMPLE_RATIO)
+    elif kind == "rate_limited":
+        root = RateLimitedSampler(TRACE_RATE_LIMIT_PER_SECOND)
+    else:
+        root = ALWAYS_ON
+
+    if keep_errors_and_slow and kind != "always_on":
+        return ParentBased(root=RecordUnsampledSampler(root), local_parent_not_sampled=_RecordOnlySampler())
+    return ParentBased(root=root)
+
+
+def build_exporter(kind: str = TRACE_EXPORTER) -> SpanExporter:
+    if kind == "none":
+        return _DiscardingExporter()
+    # Jaeger로 트레이스 전송 (OTLP 프로토콜)
+    # gRPC exporter는 import 비용이 커서 설정 시점(앱 warm-up)에 import
+    from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+    otlp_endpoint = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "http://localhost:4317")
+    return OTLPSpanExporter(
+        endpoint=otlp_endpoint,
+        insecure=OTEL_EXPORTER_OTLP_INSECURE  # 클러스터 내부 Jaeger는 TLS 없이 연결
+    )
+
+
 def setup_tracing(service_name: str = None):
-    """OpenTelemetry 트레이싱 설정"""
-    
+    """
+    OpenTelemetry 트레이싱 설정
+
+    TRACING_ENABLED=false면 아무것도 설치하지 않습니다 (전역 no-op tracer, 계측 비용 없음).
+    """
+    if not TRACING_ENABLED:
+        logger.info("OpenTelemetry tracing disabled (TRACING_ENABLED=false)")
+        return trace.get_tracer(__name__)
+
     # 서비스 이름 설정 (환경변수 또는 파라미터)
     service = service_name or os.getenv("OTEL_SERVICE_NAME", "journal-api")
-    
+
     # 리소스 정보 (서비스 메타데이터)
     resource = Resource.create({
         SERVICE_NAME: service,
         "service.version": os.getenv("APP_VERSION", "1.0.0"),
         "deployment.environment": os.getenv("ENV", "development"),
     })
-    
+
     # TracerProvider 설정
-    provider = TracerProvider(resource=resource)
-    
-    # Jaeger로 트레이스 전송 (OTLP 프로토콜)
-    otlp_endpoint = os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT", "http://localhost:4317")
-    otlp_exporter = OTLPSpanExporter(
-        endpoint=otlp_endpoint,
-        insecure=True  # TLS 없이 연결 (개발용)
-    )
-    
+    sampler = build_sampler()
+    provider = TracerProvider(resource=resource, sampler=sampler)
+
+    exporter = build_exporter()
+
     # BatchSpanProcessor: 트레이스를 모아서 일괄 전송 (성능 최적화)
-    provider.add_span_processor(BatchSpanProcessor(otlp_exporter))
-    
+    provider.add_span_processor(BatchSpanProcessor(
+        exporter,
+        max_queue_size=OTEL_BSP_MAX_QUEUE_SIZE,
+        schedule_delay_millis=OTEL_BSP_SCHEDULE_DELAY,
+        max_export_batch_size=OTEL_BSP_MAX_EXPORT_BATCH_SIZE,
+        export_timeout_millis=OTEL_BSP_EXPORT_TIMEOUT,
+    ))
+    # 샘플링되지 않은 트레이스 중 오류/느린 요청은 항상 내보냄
+    if TRACE_KEEP_ERRORS_AND_SLOW and TRACE_SAMPLER != "always_on":
+        provider.add_span_processor(ErrorAndSlowSpanProcessor(exporter, TRACE_SLOW_THRESHOLD_MS))
+
     # 전역 TracerProvider 설정
     trace.set_tracer_provider(provider)
-    
-    logger.info(f"OpenTelemetry tracing initialized - service: {service}, endpoint: {otlp_endpoint}")
-    
+
+    logger.info(
+        f"OpenTelemetry tracing initialized - service: {service}, exporter: {TRACE_EXPORTER}, "
+        f"sampler: {sampler.get_description()}"
+    )
+
     return trace.get_tracer(__name__)